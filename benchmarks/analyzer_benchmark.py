@@ -0,0 +1,114 @@
+"""검색 분석기 비교 벤치마크 (관련성 + 지연 시간)
+
+실행: python -m benchmarks.analyzer_benchmark [--data data/all_reports_analyzed]
+
+정답 기준: 쿼리 문자열이 문서 텍스트에 (어절 내부 포함) 나타나면 관련 문서로 본다.
+기본 분석기는 "경제성장률은"과 같은 어절을 하나의 토큰으로 다루므로 이런 문서를 놓친다.
+"""
+import argparse
+import contextlib
+import io
+import time
+import numpy as np
+import pandas as pd
+from src.search.search_engine import SearchEngine
+
+# test_search.py와 같은 형태의 쿼리
+QUERIES = ["경제성장", "물가", "부동산", "금리", "통화정책", "주택가격", "고용", "수출"]
+
+# 데이터 파일이 없을 때 사용하는 예시 문서 (조사/어미가 붙은 어절 포함)
+SAMPLE_TEXTS = [
+    "올해 경제성장률은 2%대 초반에 머물 것으로 전망된다. 수출 부진이 경제성장을 제약하고 있다.",
+    "소비자물가 상승률이 둔화되었으나 물가안정을 위해 통화정책의 긴축 기조가 유지될 필요가 있다.",
+    "부동산시장 안정화를 위한 정책 효과를 분석하였다. 주택가격은 금리 변화에 민감하게 반응한다.",
+    "기준금리 인상이 가계부채와 부동산 가격에 미치는 영향을 실증적으로 검토한다.",
+    "고용시장의 회복세가 이어지고 있으며 청년고용률은 개선되는 모습을 보였다.",
+    "반도체 수출이 증가하면서 경상수지 흑자 폭이 확대되었다.",
+    "통화정책 파급경로에서 금리 경로와 신용 경로의 상대적 중요성을 비교한다.",
+    "주택가격 전망과 부동산 세제 개편이 시장에 주는 시사점을 정리하였다.",
+]
+
+
+def load_corpus(data_path):
+    """벤치마크용 문서 로드"""
+    if data_path:
+        from src.storage.artifact_store import load_artifact
+        return load_artifact(data_path, columns=['title', 'link', 'text'])
+    return pd.DataFrame({
+        'title': [f"sample_{i}" for i in range(len(SAMPLE_TEXTS))],
+        'link': [f"sample://{i}" for i in range(len(SAMPLE_TEXTS))],
+        'text': SAMPLE_TEXTS,
+    })
+
+
+def evaluate(analyzer, corpus, queries, top_n=10, repeats=20):
+    """분석기 하나의 인덱싱 시간, 관련성, 쿼리 지연 측정"""
+    # 결과 캐시를 끄고 매번 점수를 계산한 지연을 측정 (cold/warm 차이는 쿼리 분석 캐시 적중 여부)
+    engine = SearchEngine(analyzer=analyzer, cache_size=0)
+    texts = corpus['text'].fillna('').astype(str)
+
+    start = time.perf_counter()
+    engine.index_documents(corpus, text_column='text')
+    index_time = time.perf_counter() - start
+
+    recalls = []
+    reciprocal_ranks = []
+    for query in queries:
+        relevant = set(corpus['link'][texts.str.contains(query, regex=False)])
+        if not relevant:
+            continue
+        results = [r for r in engine.search(query, top_n) if r['score'] > 0]
+        found = [r['link'] for r in results]
+        recalls.append(len(relevant & set(found)) / min(len(relevant), top_n))
+        rank = next((i + 1 for i, link in enumerate(found) if link in relevant), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    # 첫 검색(쿼리 분석 캐시 미적용)과 반복 검색(캐시 적용) 지연 분리 측정
+    engine.index.query_analyzer.cache_clear()
+    cold = []
+    for query in queries:
+        start = time.perf_counter()
+        engine.search(query, top_n)
+        cold.append(time.perf_counter() - start)
+    warm = []
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            engine.search(query, top_n)
+            warm.append(time.perf_counter() - start)
+
+    return {
+        'analyzer': analyzer,
+        'vocabulary': len(engine.index.vocabulary),
+        'index_sec': round(index_time, 4),
+        f'recall@{top_n}': round(float(np.mean(recalls)), 3) if recalls else None,
+        'mrr': round(float(np.mean(reciprocal_ranks)), 3) if reciprocal_ranks else None,
+        'cold_query_ms': round(float(np.mean(cold)) * 1000, 3),
+        'warm_query_ms': round(float(np.mean(warm)) * 1000, 3),
+        'warm_p95_ms': round(float(np.percentile(warm, 95)) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 분석기 비교 벤치마크")
+    parser.add_argument('--data', type=str, default=None, help='분석 결과 산출물 경로 (없으면 예시 문서 사용)')
+    parser.add_argument('--analyzers', nargs='+', default=['word', 'char_ngram', 'noun'])
+    parser.add_argument('--top_n', type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.data)
+    rows = []
+    for analyzer in args.analyzers:
+        try:
+            # 검색 엔진의 디버그 출력은 측정 결과에서 제외
+            with contextlib.redirect_stdout(io.StringIO()):
+                rows.append(evaluate(analyzer, corpus, QUERIES, top_n=args.top_n))
+        except Exception as e:
+            # 형태소 분석기는 Java가 없으면 사용할 수 없음
+            print(f"{analyzer} 분석기 측정 실패: {e}")
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
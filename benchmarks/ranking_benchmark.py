@@ -0,0 +1,118 @@
+"""TF-IDF 코사인 vs BM25 랭킹 벤치마크 (인덱싱 시간, 쿼리 지연, 메모리)
+
+실행: python -m benchmarks.ranking_benchmark [--docs 2000] [--output bench.json]
+
+비교 대상
+- sklearn: 기존 방식 (TfidfVectorizer.fit_transform + cosine_similarity)
+- tfidf: 세그먼트 인덱스의 TF-IDF 코사인 경로
+- bm25: 같은 단어 빈도 세그먼트에서 만든 BM25 가중치 행렬을 사용하는 BM25 경로
+"""
+import argparse
+import json
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.search.incremental_index import IncrementalTfidfIndex
+
+SYLLABLES = list("가나다라마바사아자차카타파하경제성장물가금리정책부동산주택고용수출통화재정")
+
+
+def make_corpus(num_docs, vocab_size=20000, mean_length=1500, seed=42):
+    """Zipf 분포 어휘와 로그정규 길이를 가진 합성 문서 생성"""
+    rng = np.random.default_rng(seed)
+    vocab = [''.join(rng.choice(SYLLABLES, size=rng.integers(2, 5))) for _ in range(vocab_size)]
+    ranks = np.arange(1, vocab_size + 1)
+    probs = 1.0 / ranks ** 1.1
+    probs /= probs.sum()
+    lengths = rng.lognormal(np.log(mean_length), 0.6, size=num_docs).astype(int) + 10
+    docs = [' '.join(np.asarray(vocab)[rng.choice(vocab_size, size=length, p=probs)]) for length in lengths]
+    return docs, vocab
+
+
+def sparse_nbytes(matrix):
+    """희소 행렬이 차지하는 바이트 수"""
+    if matrix is None:
+        return 0
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def latency_stats(fn, queries):
+    """쿼리별 실행 시간 (ms) 분위수"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'mean_ms': round(float(np.mean(timings)), 3),
+    }
+
+
+def run(num_docs, num_queries=200, seed=42):
+    docs, vocab = make_corpus(num_docs, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    queries = [' '.join(rng.choice(vocab[:2000], size=rng.integers(1, 4))) for _ in range(num_queries)]
+    report = {'num_docs': num_docs, 'num_queries': num_queries}
+
+    # 기존 방식
+    start = time.perf_counter()
+    vectorizer = TfidfVectorizer(max_features=10000)
+    matrix = vectorizer.fit_transform(docs)
+    report['sklearn'] = {'index_sec': round(time.perf_counter() - start, 3), 'bytes': sparse_nbytes(matrix)}
+    report['sklearn'].update(latency_stats(
+        lambda q: cosine_similarity(vectorizer.transform([q]), matrix).ravel().argsort()[-10:], queries))
+
+    # 세그먼트 인덱스 공통 부분 (토큰화 + 단어 빈도)
+    start = time.perf_counter()
+    index = IncrementalTfidfIndex(max_features=10000)
+    index.add(docs)
+    index.merge()
+    count_sec = time.perf_counter() - start
+    counts_bytes = sum(sparse_nbytes(segment.counts) for segment in index.segments)
+
+    start = time.perf_counter()
+    index.segment_matrices()
+    report['tfidf'] = {
+        'index_sec': round(count_sec + time.perf_counter() - start, 3),
+        'bytes': counts_bytes + sum(sparse_nbytes(segment.weighted) for segment in index.segments),
+    }
+    report['tfidf'].update(latency_stats(
+        lambda q: index.scores(index.transform([q]))[0].argsort()[-10:], queries))
+
+    start = time.perf_counter()
+    index.bm25_scores([queries[0]])
+    report['bm25'] = {
+        'index_sec': round(count_sec + time.perf_counter() - start, 3),
+        'bytes': counts_bytes + sum(sparse_nbytes(segment.bm25_weights) + segment.lengths.nbytes
+                                    for segment in index.segments),
+    }
+    report['bm25'].update(latency_stats(lambda q: index.bm25_scores([q])[0].argsort()[-10:], queries))
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF vs BM25 랭킹 벤치마크")
+    parser.add_argument('--docs', type=int, nargs='+', default=[2000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    reports = [run(num_docs, num_queries=args.queries) for num_docs in args.docs]
+    for report in reports:
+        print(f"\n=== 문서 {report['num_docs']}개, 쿼리 {report['num_queries']}개 ===")
+        for name in ['sklearn', 'tfidf', 'bm25']:
+            stats = report[name]
+            print(f"{name:8s} index {stats['index_sec']:8.3f}s  p50 {stats['p50_ms']:8.3f}ms  "
+                  f"p95 {stats['p95_ms']:8.3f}ms  memory {stats['bytes'] / 1024 / 1024:8.1f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""main.py 서브커맨드별 시작 시간 벤치마크
+
+실행: python -m benchmarks.startup_benchmark [--repeats 5] [--output bench_startup.json]
+
+서브커맨드마다 새 인터프리터를 띄워 빈 작업 디렉토리에서 main.py를 실행하고
+(입력 산출물이 없으므로 단계는 의존성 로드 후 바로 종료) 전체 실행 시간과 로드된 무거운 모듈을 기록한다.
+크롤링은 실행 시 브라우저를 띄우고 외부 사이트에 접속하므로 측정하지 않는다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUBCOMMANDS = {
+    'help': ['--help'],
+    'process': ['--process_all'],
+    'analyze': ['--analyze'],
+    'build_index': ['--build_index'],
+    'generate_reports': ['--generate_reports'],
+}
+
+# 단계와 무관하게 로드되면 시작 시간을 크게 늘리는 모듈
+HEAVY_MODULES = ['selenium', 'konlpy', 'jpype', 'gensim', 'sklearn', 'matplotlib', 'seaborn', 'wordcloud',
+                 'tika', 'sqlalchemy']
+
+# main.py를 __main__으로 실행한 뒤 로드된 무거운 모듈 목록을 마지막 줄에 출력
+RUNNER = """
+import json, runpy, sys
+sys.argv = ['main.py'] + json.loads(sys.argv[1])
+try:
+    runpy.run_path({main!r}, run_name='__main__')
+except SystemExit:
+    pass
+print(json.dumps(sorted(name for name in {heavy!r} if name in sys.modules)))
+"""
+
+
+def measure(flags, repeats=5):
+    """서브커맨드 하나의 실행 시간 (새 프로세스, 빈 작업 디렉토리)"""
+    code = RUNNER.format(main=os.path.join(REPO_DIR, 'main.py'), heavy=HEAVY_MODULES)
+    env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    timings = []
+    loaded = []
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as work_dir:
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-c', code, json.dumps(flags)], cwd=work_dir, env=env,
+                                    capture_output=True, text=True)
+            timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"main.py {' '.join(flags)} failed:\n{result.stderr}")
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        'flags': flags,
+        'median_sec': float(np.median(timings)),
+        'min_sec': float(np.min(timings)),
+        'heavy_modules': loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py 시작 시간 벤치마크")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--subcommands', nargs='+', choices=list(SUBCOMMANDS), default=list(SUBCOMMANDS))
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    report = {name: measure(SUBCOMMANDS[name], repeats=args.repeats) for name in args.subcommands}
+    for name, stats in report.items():
+        print(f"{name:18s} median {stats['median_sec']:7.3f}s  min {stats['min_sec']:7.3f}s  "
+              f"heavy: {', '.join(stats['heavy_modules']) or '-'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""합성 말뭉치 기반 벤치마크 모음 (오프라인 실행, 결과 JSON으로 커밋 간 비교)
+
+실행: python -m benchmarks.suite [--sizes 1000 10000 100000] [--output bench/suite.json]
+비교: python -m benchmarks.suite --sizes 1000 --compare bench/baseline.json [--threshold 0.1] [--fail_on_regression]
+
+말뭉치 크기별 측정 항목
+- index: 검색 인덱스 구축 시간, 문서/초, 인덱스 바이트 수, RSS 증가량
+- query: 단일 쿼리 지연 (p50/p99, 캐시 미사용)과 일괄 검색 처리량
+- keywords: TextAnalyzer.extract_keywords_tfidf 처리량 (--keyword_docs개까지)
+- lda: StreamingTopicModel 학습과 문서 × 토픽 추론 처리량 (--lda_docs개까지)
+그리고 말뭉치 크기와 무관하게
+- pdf: 로컬에서 생성한 PDF의 PyPDF2 추출 처리량 (페이지/초, MB/초)
+
+konlpy가 없으면 SyntheticNouns로 명사를 추출하며, 사용한 토크나이저는 결과에 기록된다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import logging
+import numpy as np
+from benchmarks.ranking_benchmark import sparse_nbytes
+from benchmarks.synthetic import SyntheticNouns, make_queries, make_reports, write_pdf
+from src.search.search_engine import SearchEngine
+
+# 값이 작을수록 좋은 지표 접미사 (나머지 *_per_second는 클수록 좋음)
+LOWER_IS_BETTER = ('_sec', '_ms', '_bytes', '_mb')
+
+
+def rss_mb():
+    """현재 프로세스의 상주 메모리 (MB, /proc이 없으면 최대 상주 메모리)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 / 1024 if sys.platform == 'darwin' else usage / 1024
+
+
+def percentiles(timings):
+    timings = np.asarray(timings) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p99_ms': round(float(np.percentile(timings, 99)), 3),
+        'mean_ms': round(float(np.mean(timings)), 3),
+    }
+
+
+def make_tokenizer(name):
+    """명사 추출기 (okt: konlpy Okt, synthetic: 합성 말뭉치용, auto: konlpy가 있으면 okt)"""
+    if name in ('okt', 'auto'):
+        try:
+            from konlpy.tag import Okt
+            return 'okt', Okt()
+        except ImportError:
+            if name == 'okt':
+                raise
+    return 'synthetic', SyntheticNouns()
+
+
+def bench_index(reports, queries):
+    """검색 인덱스 구축 및 쿼리 지연"""
+    engine = SearchEngine()
+    before = rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.index_documents(reports, text_column='text', title_column='title')
+    index_sec = time.perf_counter() - start
+    result = {'index': {
+        'index_sec': round(index_sec, 3),
+        'docs_per_second': round(len(reports) / index_sec, 1),
+        'rss_delta_mb': round(rss_mb() - before, 1),
+    }}
+
+    # 결과 캐시를 거치지 않는 경로로 쿼리 하나씩 측정
+    engine.search_batch(queries[:1])
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        engine.search_batch([query], top_n=10)
+        timings.append(time.perf_counter() - start)
+    result['query'] = percentiles(timings)
+
+    start = time.perf_counter()
+    engine.search_batch(queries, top_n=10)
+    batch_sec = time.perf_counter() - start
+    result['query']['batch_queries_per_second'] = round(len(queries) / batch_sec, 1)
+    # TF-IDF/BM25 가중치 행렬은 첫 검색 때 만들어지므로 검색 후에 크기 계산
+    result['index']['index_bytes'] = int(sum(
+        sparse_nbytes(segment.counts) + sparse_nbytes(segment.weighted) + sparse_nbytes(segment.bm25_weights)
+        for segment in engine.index.segments))
+    # 문서 저장소의 메모리 크기 (본문 등 blob 파일로 내보낸 텍스트 제외)
+    result['index']['store_bytes'] = engine.documents.nbytes
+    return result
+
+
+def bench_keywords(texts, okt):
+    """TF-IDF 키워드 추출 처리량"""
+    from src.analyzer.text_analyzer import TextAnalyzer
+    analyzer = TextAnalyzer()
+    analyzer._okt = okt
+    start = time.perf_counter()
+    analyzer.extract_keywords_tfidf(texts, top_n=20)
+    elapsed = time.perf_counter() - start
+    return {'docs': len(texts), 'extract_sec': round(elapsed, 3), 'docs_per_second': round(len(texts) / elapsed, 1)}
+
+
+def bench_lda(texts, okt, num_topics=10, passes=1, workers=None):
+    """LDA 학습(디스크 코퍼스 + 멀티코어)과 일괄 추론 처리량"""
+    from src.analyzer.topic_model import StreamingTopicModel, document_topic_matrix
+    with tempfile.TemporaryDirectory() as model_dir:
+        topic_model = StreamingTopicModel(okt.nouns, model_dir=model_dir, num_topics=num_topics, workers=workers,
+                                          passes=passes, random_state=42)
+        start = time.perf_counter()
+        topic_model.fit(texts)
+        train_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        document_topic_matrix(topic_model.model, topic_model.corpus)
+        infer_sec = time.perf_counter() - start
+    return {
+        'docs': len(texts), 'num_topics': num_topics, 'passes': passes,
+        'train_sec': round(train_sec, 3), 'train_docs_per_second': round(len(texts) / train_sec, 1),
+        'infer_sec': round(infer_sec, 3), 'infer_docs_per_second': round(len(texts) / infer_sec, 1),
+    }
+
+
+def bench_pdf(num_pdfs=20, mean_pages=15, seed=42):
+    """로컬 생성 PDF의 텍스트 추출 처리량"""
+    from src.processor.pdf_processor import PDFProcessor
+    rng = np.random.default_rng(seed)
+    pages = np.maximum(rng.lognormal(np.log(mean_pages), 0.5, size=num_pdfs).astype(int), 1)
+    with tempfile.TemporaryDirectory() as pdf_dir:
+        paths = [write_pdf(os.path.join(pdf_dir, f"report_{i}.pdf"), int(count), seed=i)
+                 for i, count in enumerate(pages)]
+        total_mb = sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+        processor = PDFProcessor(pdf_dir=pdf_dir)
+        start = time.perf_counter()
+        extracted = sum(len(processor.extract_text_pypdf2(path)) for path in paths)
+        elapsed = time.perf_counter() - start
+    return {
+        'pdfs': num_pdfs, 'pages': int(pages.sum()), 'extract_sec': round(elapsed, 3),
+        'pages_per_second': round(pages.sum() / elapsed, 1), 'mb_per_second': round(total_mb / elapsed, 2),
+        'chars': int(extracted),
+    }
+
+
+def run(num_docs, args, okt):
+    start = time.perf_counter()
+    reports = make_reports(num_docs, mean_tokens=args.mean_tokens, seed=args.seed)
+    queries = make_queries(args.queries, seed=args.seed + 1)
+    result = {'num_docs': num_docs, 'generate_sec': round(time.perf_counter() - start, 3),
+              'mean_chars': round(float(reports['text'].str.len().mean()), 1)}
+    result.update(bench_index(reports, queries))
+
+    texts = reports['text'].tolist()
+    if 'keywords' not in args.skip:
+        result['keywords'] = bench_keywords(texts[:args.keyword_docs], okt)
+    if 'lda' not in args.skip:
+        result['lda'] = bench_lda(texts[:args.lda_docs], okt, workers=args.lda_workers)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def flatten(report, prefix=''):
+    """{'1000': {'index': {'index_sec': ..}}} → {'1000.index.index_sec': ..} (숫자 지표만)"""
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold=0.1):
+    """같은 지표끼리 비교하여 (지표, 기준값, 현재값, 변화율, 악화 여부) 목록 반환"""
+    rows = []
+    old = flatten(baseline['results'])
+    for name, value in flatten(current['results']).items():
+        if not name.endswith(LOWER_IS_BETTER + ('_per_second',)) or not old.get(name):
+            continue
+        change = value / old[name] - 1
+        worse = change > threshold if name.endswith(LOWER_IS_BETTER) else change < -threshold
+        rows.append((name, old[name], value, change, worse))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 말뭉치 벤치마크 모음")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000], help='말뭉치 문서 수 (예: 1000 10000 100000)')
+    parser.add_argument('--mean_tokens', type=int, default=2000, help='문서 본문 어절 수 (로그정규 중앙값)')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--keyword_docs', type=int, default=5000, help='키워드 추출에 사용할 최대 문서 수')
+    parser.add_argument('--lda_docs', type=int, default=10000, help='LDA에 사용할 최대 문서 수')
+    parser.add_argument('--lda_workers', type=int, default=None)
+    parser.add_argument('--pdfs', type=int, default=20, help='생성할 PDF 수')
+    parser.add_argument('--tokenizer', choices=['auto', 'okt', 'synthetic'], default='auto')
+    parser.add_argument('--skip', nargs='*', choices=['keywords', 'lda', 'pdf'], default=[])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', type=str, default=None, help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=0.1, help='악화로 볼 변화율 (0.1 = 10%%)')
+    parser.add_argument('--fail_on_regression', action='store_true', help='악화된 지표가 있으면 종료 코드 1')
+    args = parser.parse_args()
+
+    # PDFProcessor가 작업 디렉토리에 로그 파일을 만들지 않도록 먼저 설정
+    logging.basicConfig(level=logging.WARNING)
+    tokenizer_name, okt = make_tokenizer(args.tokenizer)
+
+    report = {
+        'commit': git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('output', 'compare', 'fail_on_regression')},
+        'tokenizer': tokenizer_name,
+        'results': {},
+    }
+    for num_docs in args.sizes:
+        result = run(num_docs, args, okt)
+        report['results'][str(num_docs)] = result
+        print(f"\n=== 문서 {num_docs}개 (생성 {result['generate_sec']:.1f}s) ===")
+        print(f"index    {result['index']['index_sec']:8.3f}s  {result['index']['docs_per_second']:10.1f} docs/s  "
+              f"{result['index']['index_bytes'] / 1024 / 1024:8.1f}MB  store {result['index']['store_bytes'] / 1024 / 1024:.1f}MB  "
+              f"RSS +{result['index']['rss_delta_mb']}MB")
+        print(f"query    p50 {result['query']['p50_ms']:8.3f}ms  p99 {result['query']['p99_ms']:8.3f}ms  "
+              f"batch {result['query']['batch_queries_per_second']:10.1f} q/s")
+        if 'keywords' in result:
+            print(f"keywords {result['keywords']['extract_sec']:8.3f}s  "
+                  f"{result['keywords']['docs_per_second']:10.1f} docs/s ({result['keywords']['docs']} docs)")
+        if 'lda' in result:
+            print(f"lda      train {result['lda']['train_sec']:8.3f}s  "
+                  f"infer {result['lda']['infer_docs_per_second']:10.1f} docs/s ({result['lda']['docs']} docs)")
+
+    if 'pdf' not in args.skip:
+        report['results']['pdf'] = bench_pdf(args.pdfs, seed=args.seed)
+        pdf = report['results']['pdf']
+        print(f"\npdf      {pdf['pages_per_second']:10.1f} pages/s  {pdf['mb_per_second']:8.2f} MB/s "
+              f"({pdf['pdfs']} PDFs, {pdf['pages']} pages)")
+
+    if args.output:
+        dir_path = os.path.dirname(args.output)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print(f"\n=== {baseline.get('commit')} 대비 ===")
+        for name, old, new, change, worse in rows:
+            print(f"{'!' if worse else ' '} {name:45s} {old:>12} → {new:>12} ({change:+.1%})")
+        if args.fail_on_regression and any(worse for *_, worse in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
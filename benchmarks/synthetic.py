@@ -0,0 +1,171 @@
+"""벤치마크용 합성 정책 보고서 말뭉치와 PDF 생성기 (네트워크/외부 데이터 없이 재현 가능)
+
+- make_reports: 실제 분석 산출물(all_reports_analyzed)과 같은 칼럼의 보고서 데이터프레임
+  (정책 용어 + 합성 복합명사 어휘의 Zipf 분포, 조사가 붙은 어절, 로그정규 문서 길이)
+- make_queries: 어휘 상위권에서 뽑은 1~3단어 검색어
+- SyntheticNouns: konlpy 없이 합성 말뭉치에서 명사(조사를 뗀 어절)를 뽑는 Okt 대체 토크나이저
+- write_pdf: 표준 Helvetica 글꼴만 쓰는 여러 페이지 PDF 파일 (PDF 추출 처리량 측정용)
+"""
+import re
+import numpy as np
+import pandas as pd
+
+POLICY_NOUNS = [
+    "경제성장", "경제성장률", "물가", "소비자물가", "물가상승", "인플레이션", "금리", "기준금리", "통화정책", "재정정책",
+    "재정적자", "국가채무", "부동산", "주택가격", "전세가격", "주택공급", "가계부채", "기업부채", "신용", "대출",
+    "고용", "실업률", "청년고용", "노동시장", "임금", "최저임금", "생산성", "투자", "설비투자", "건설투자",
+    "수출", "수입", "경상수지", "무역수지", "환율", "원화", "달러", "반도체", "자동차", "조선",
+    "제조업", "서비스업", "중소기업", "대기업", "창업", "혁신", "연구개발", "디지털", "플랫폼", "인공지능",
+    "탄소중립", "에너지", "기후변화", "인구구조", "저출산", "고령화", "연금", "복지", "소득분배", "불평등",
+    "지역균형", "수도권", "지방재정", "세제", "법인세", "소득세", "규제", "구조개혁", "공공기관", "금융시장",
+    "자본시장", "은행", "금융안정", "거시건전성", "유동성", "외환", "국제금융", "공급망", "세계경제", "미국",
+    "중국", "유럽", "일본", "전망", "분석", "정책", "효과", "영향", "대응", "과제",
+    "보고서", "연구", "추정", "모형", "시나리오", "위험", "회복", "둔화", "확대", "개선",
+]
+PARTICLES = ["", "", "", "은", "는", "이", "가", "을", "를", "의", "에", "에서", "으로", "로", "과", "와", "도", "에 대한"]
+PREDICATES = ["증가하였다.", "감소하였다.", "전망된다.", "필요하다.", "나타났다.", "분석하였다.", "확대되었다.",
+              "둔화되었다.", "중요하다.", "예상된다.", "개선되었다.", "검토하였다."]
+SYLLABLES = list("가나다라마바사아자차카타파하경제성장물가금리정책부동산주택고용수출통화재정산업기술혁신")
+SOURCES = ["KDI", "BOK"]
+AUTHORS = ["KDI 경제전망실", "KDI 거시정책연구부", "KDI 산업연구부", "한국은행 조사국", "한국은행 경제연구원",
+           "한국은행 금융안정국"]
+
+
+def make_vocabulary(vocab_size=20000, seed=42):
+    """정책 용어를 앞쪽(고빈도)에 두고 합성 복합명사로 채운 어휘"""
+    rng = np.random.default_rng(seed)
+    vocab = list(POLICY_NOUNS)
+    seen = set(vocab)
+    while len(vocab) < vocab_size:
+        # 2~4음절 조합을 한꺼번에 뽑고 중복은 버림
+        syllables = rng.integers(0, len(SYLLABLES), size=(vocab_size, 4))
+        lengths = rng.integers(2, 5, size=vocab_size)
+        for row, length in zip(syllables.tolist(), lengths.tolist()):
+            word = ''.join(SYLLABLES[i] for i in row[:length])
+            if word not in seen:
+                seen.add(word)
+                vocab.append(word)
+    return vocab[:vocab_size]
+
+
+def _zipf_probs(size, exponent=1.1):
+    probs = 1.0 / np.arange(1, size + 1) ** exponent
+    return probs / probs.sum()
+
+
+class _TokenTable:
+    """어절(명사 + 조사)과 문장 끝 어절(명사 + 서술어)을 미리 만들어 두고 번호로 뽑는 표"""
+
+    def __init__(self, vocab, exponent=1.1):
+        self.num_words = len(vocab)
+        self.cdf = np.cumsum(_zipf_probs(len(vocab), exponent))
+        tokens = [word + particle for word in vocab for particle in PARTICLES]
+        tokens += [word + ' ' + predicate for word in vocab for predicate in PREDICATES]
+        self.tokens = np.asarray(tokens, dtype=object)
+
+    def text(self, rng, num_tokens, sentence_length=14):
+        num_tokens = max(int(num_tokens), 1)
+        words = np.minimum(np.searchsorted(self.cdf, rng.random(num_tokens)), self.num_words - 1)
+        ids = words * len(PARTICLES) + rng.integers(0, len(PARTICLES), size=num_tokens)
+        ends = rng.random(num_tokens) < 1.0 / sentence_length
+        ends[-1] = True
+        ids[ends] = (self.num_words * len(PARTICLES) + words[ends] * len(PREDICATES)
+                     + rng.integers(0, len(PREDICATES), size=int(ends.sum())))
+        return ' '.join(self.tokens[ids].tolist())
+
+
+def make_reports(num_docs, mean_tokens=2000, vocab_size=20000, seed=42):
+    """합성 보고서 데이터프레임 (title, author, date, link, abstract, keywords, pdf_link, source, main_topic, text)
+
+    본문 길이(어절 수)는 중앙값 mean_tokens의 로그정규 분포를 따른다.
+    """
+    rng = np.random.default_rng(seed)
+    table = _TokenTable(make_vocabulary(vocab_size, seed))
+    head = len(POLICY_NOUNS)
+    lengths = rng.lognormal(np.log(mean_tokens), 0.7, size=num_docs).astype(int) + 20
+    days = rng.integers(0, 365 * 25, size=num_docs)
+
+    rows = []
+    for i in range(num_docs):
+        abstract = table.text(rng, rng.integers(40, 120))
+        keywords = rng.choice(head, size=rng.integers(3, 6), replace=False)
+        source = SOURCES[i % len(SOURCES)]
+        rows.append({
+            'title': ' '.join(POLICY_NOUNS[k] for k in keywords[:3]) + ' 분석',
+            'author': AUTHORS[rng.integers(0, len(AUTHORS))],
+            'date': (pd.Timestamp('2000-01-01') + pd.Timedelta(days=int(days[i]))).strftime('%Y-%m-%d'),
+            'link': f"https://example.org/{source.lower()}/report/{i}",
+            'abstract': abstract,
+            'keywords': '#'.join(POLICY_NOUNS[k] for k in keywords),
+            'pdf_link': f"https://example.org/{source.lower()}/pdf/{i}.pdf",
+            'source': source,
+            'main_topic': int(rng.integers(0, 5)),
+            'text': abstract + ' ' + table.text(rng, lengths[i]),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_queries(num_queries, vocab_size=20000, head=2000, seed=43):
+    """어휘 상위 head개에서 Zipf 분포로 뽑은 1~3단어 검색어"""
+    rng = np.random.default_rng(seed)
+    vocab = make_vocabulary(vocab_size, seed - 1)[:head]
+    probs = _zipf_probs(len(vocab), exponent=0.8)
+    return [' '.join(rng.choice(vocab, size=rng.integers(1, 4), p=probs)) for _ in range(num_queries)]
+
+
+class SyntheticNouns:
+    """합성 말뭉치용 명사 추출기 (Okt.nouns와 같은 인터페이스, 어절에서 조사를 떼고 서술어는 제외)"""
+
+    PARTICLE_SUFFIX = re.compile('(?:' + '|'.join(sorted({p for p in PARTICLES if p and ' ' not in p},
+                                                       key=len, reverse=True)) + ')$')
+    HANGUL_WORD = re.compile(r'[가-힣]+')
+
+    def nouns(self, text):
+        words = []
+        for word in self.HANGUL_WORD.findall(text):
+            if word.endswith('다'):
+                continue
+            word = self.PARTICLE_SUFFIX.sub('', word) if len(word) > 2 else word
+            words.append(word)
+        return words
+
+
+LATIN_SYLLABLES = ["ka", "ne", "do", "ri", "mo", "bu", "sa", "eo", "ji", "cha", "kyeong", "je", "seong", "jang",
+                   "mul", "geum", "jeong", "chaek", "bu", "dong", "san", "ju", "taek", "go", "yong"]
+
+
+def write_pdf(path, num_pages, lines_per_page=45, seed=0):
+    """표준 Helvetica 글꼴만 사용하는 여러 페이지 PDF 생성 (한글 글꼴 없이 로마자 합성 텍스트)"""
+    rng = np.random.default_rng(seed)
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for page in range(num_pages):
+        lines = []
+        for _ in range(lines_per_page):
+            words = [''.join(rng.choice(LATIN_SYLLABLES, size=rng.integers(1, 4))) for _ in range(12)]
+            lines.append(' '.join(words))
+        content = "BT /F1 9 Tf 40 800 Td 12 TL " + ' '.join(f"({line}) '" for line in lines) + " ET"
+        content = content.encode('latin-1')
+        page_id, content_id = 4 + 2 * page, 5 + 2 * page
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b' '.join(b"%d 0 R" % kid for kid in kids), num_pages)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n"
+    xref = len(output)
+    size = max(objects) + 1
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for object_id in range(1, size):
+        output += b"%010d 00000 n \n" % offsets[object_id]
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    with open(path, 'wb') as f:
+        f.write(output)
+    return path
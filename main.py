@@ -5,13 +5,16 @@ import logging
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
-# 커스텀 모듈 임포트
-from src.crawler.kdi_crawler import KDICrawler
-from src.crawler.bok_crawler import BOKCrawler
-from src.processor.pdf_processor import PDFProcessor
-from src.analyzer.text_analyzer import TextAnalyzer
-from src.search.search_engine import SearchEngine
-from src.analyzer.policy_analyzer import PolicyAnalyzer
+# 커스텀 모듈 임포트 (Selenium, konlpy, gensim, sklearn, matplotlib 등 무거운 의존성을 쓰는 모듈은
+# 해당 단계 함수 안에서 임포트하여 실행하지 않는 단계의 로딩 비용을 내지 않음)
+from src.analyzer.analytics_cube import AnalyticsCube
+from src.analyzer.keyword_frequency import NounTokenizer
+from src.storage.report_sink import open_sink
+from src.storage.artifact_store import (
+    ARTIFACT_FORMATS, METADATA_COLUMNS, artifact_path, find_artifact, load_artifact, save_artifact
+)
+from src.pipeline.stage_runner import Stage, StageRunner
+from src.pipeline.instrumentation import METRICS, PROFILE_MODES
 
 # 로깅 설정
 logging.basicConfig(
@@ -20,6 +23,9 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# 분석 단계가 갱신하고 보고서 단계가 읽는 연도 × 출처 × 토픽 × 키워드 집계
+ANALYTICS_CUBE_PATH = 'data/analytics_cube'
+
 def setup_folders():
     """필요한 폴더 생성"""
     folders = ['data', 'downloads', 'reports', 'index']
@@ -28,43 +34,61 @@ def setup_folders():
             os.makedirs(folder)
             logging.info(f"Created folder: {folder}")
 
+def persist_to_database(args, dataframe, table_name):
+    """--db_url이 지정된 경우 단계 결과를 데이터베이스에 upsert"""
+    if not args.db_url:
+        return
+    from src.storage.database import ReportDatabase
+    try:
+        ReportDatabase(args.db_url).upsert_dataframe(dataframe, table_name)
+    except Exception as e:
+        logging.error(f"Database persistence failed for {table_name}: {e}")
+
 def crawl_data(args):
     """데이터 크롤링 처리"""
     logging.info("Starting data crawling")
+    from src.crawler.kdi_crawler import KDICrawler
+    from src.crawler.bok_crawler import BOKCrawler
     
     # KDI 데이터 크롤링
     if args.crawl_kdi or args.crawl_all:
         kdi_crawler = KDICrawler()
-        kdi_reports = kdi_crawler.crawl_reports(
-            start_page=args.start_page, 
-            end_page=args.end_page
-        )
-        kdi_crawler.save_to_csv(kdi_reports, 'data/kdi_reports.csv')
+        # 페이지 단위로 저장하여 중단 시에도 결과 보존
+        with open_sink(artifact_path('kdi_reports', args.storage_format), resume=args.resume_crawl) as sink:
+            kdi_count = kdi_crawler.crawl_reports(
+                start_page=args.start_page, 
+                end_page=args.end_page,
+                sink=sink
+            )
         kdi_crawler.close()
-        logging.info(f"Crawled {len(kdi_reports)} KDI reports")
+        logging.info(f"Crawled {kdi_count} KDI reports")
     
     # BOK 데이터 크롤링
     if args.crawl_bok or args.crawl_all:
         bok_crawler = BOKCrawler()
-        bok_reports = bok_crawler.crawl_reports(
-            start_page=args.start_page, 
-            end_page=args.end_page
-        )
-        bok_crawler.save_to_csv(bok_reports, 'data/bok_reports.csv')
+        with open_sink(artifact_path('bok_reports', args.storage_format), resume=args.resume_crawl) as sink:
+            bok_count = bok_crawler.crawl_reports(
+                start_page=args.start_page, 
+                end_page=args.end_page,
+                sink=sink
+            )
         bok_crawler.close()
-        logging.info(f"Crawled {len(bok_reports)} BOK reports")
+        logging.info(f"Crawled {bok_count} BOK reports")
     
     logging.info("Finished data crawling")
 
 def process_pdfs(args):
     """PDF 다운로드 및 처리"""
     logging.info("Starting PDF processing")
+    from src.processor.pdf_processor import PDFProcessor
+    from src.processor.near_duplicates import mark_near_duplicates
     processor = PDFProcessor(pdf_dir='downloads')
     
     # KDI PDF 처리
     if args.process_kdi or args.process_all:
-        if os.path.exists('data/kdi_reports.csv'):
-            kdi_data = pd.read_csv('data/kdi_reports.csv')
+        kdi_path = find_artifact('kdi_reports')
+        if kdi_path:
+            kdi_data = load_artifact(kdi_path)
             pdf_links = kdi_data['pdf_link'].dropna().tolist()
             filenames = [f"kdi_{i}.pdf" for i in range(len(pdf_links))]
             
@@ -79,12 +103,16 @@ def process_pdfs(args):
             
             # 결과 저장
             kdi_data['pdf_text'] = pd.Series(kdi_results)
-            kdi_data.to_csv('data/kdi_reports_with_text.csv', index=False)
+            if args.dedup_threshold > 0:
+                kdi_data = mark_near_duplicates(kdi_data, threshold=args.dedup_threshold)
+            save_artifact(kdi_data, artifact_path('kdi_reports_with_text', args.storage_format))
+            persist_to_database(args, kdi_data, 'kdi_reports')
     
     # BOK PDF 처리
     if args.process_bok or args.process_all:
-        if os.path.exists('data/bok_reports.csv'):
-            bok_data = pd.read_csv('data/bok_reports.csv')
+        bok_path = find_artifact('bok_reports')
+        if bok_path:
+            bok_data = load_artifact(bok_path)
             pdf_links = bok_data['pdf_link'].dropna().tolist()
             filenames = [f"bok_{i}.pdf" for i in range(len(pdf_links))]
             
@@ -99,31 +127,45 @@ def process_pdfs(args):
             
             # 결과 저장
             bok_data['pdf_text'] = pd.Series(bok_results)
-            bok_data.to_csv('data/bok_reports_with_text.csv', index=False)
+            if args.dedup_threshold > 0:
+                bok_data = mark_near_duplicates(bok_data, threshold=args.dedup_threshold)
+            save_artifact(bok_data, artifact_path('bok_reports_with_text', args.storage_format))
+            persist_to_database(args, bok_data, 'bok_reports')
     
     logging.info("Finished PDF processing")
 
 def analyze_text(args):
     """텍스트 분석 처리"""
     logging.info("Starting text analysis")
+    from src.analyzer.text_analyzer import TextAnalyzer
     analyzer = TextAnalyzer()
     
     # 데이터 통합
     all_reports = pd.DataFrame()
     
-    if os.path.exists('data/kdi_reports_with_text.csv'):
-        kdi_data = pd.read_csv('data/kdi_reports_with_text.csv')
+    kdi_path = find_artifact('kdi_reports_with_text')
+    if kdi_path:
+        kdi_data = load_artifact(kdi_path)
         kdi_data['source'] = 'KDI'
         all_reports = pd.concat([all_reports, kdi_data])
     
-    if os.path.exists('data/bok_reports_with_text.csv'):
-        bok_data = pd.read_csv('data/bok_reports_with_text.csv')
+    bok_path = find_artifact('bok_reports_with_text')
+    if bok_path:
+        bok_data = load_artifact(bok_path)
         bok_data['source'] = 'BOK'
         all_reports = pd.concat([all_reports, bok_data])
     
     if len(all_reports) == 0:
         logging.warning("No data found for analysis")
         return
+    # 기관별 데이터의 인덱스가 겹치므로 행 위치 = 문서 순서가 되도록 다시 매김
+    all_reports = all_reports.reset_index(drop=True)
+    
+    # 처리 단계에서 찾은 중복 게시본은 정본만 남기고 토큰화/토픽 모델링/색인에서 제외
+    if 'duplicate_of' in all_reports.columns:
+        duplicates = all_reports['duplicate_of'].notna()
+        logging.info(f"Skipping {int(duplicates.sum())} near-duplicate reports")
+        all_reports = all_reports[~duplicates].reset_index(drop=True)
     
     # 텍스트 칼럼 통합
     all_reports['text'] = all_reports['abstract'].fillna('') + ' ' + all_reports['pdf_text'].fillna('')
@@ -131,30 +173,41 @@ def analyze_text(args):
     # 키워드 추출
     logging.info("Extracting keywords")
     documents = all_reports['text'].fillna('').tolist()
-    keywords = analyzer.extract_keywords_tfidf(documents, top_n=args.top_keywords)
+    # 전처리는 한 번만 하고 키워드 추출과 (메모리 방식) 토픽 모델링에서 함께 사용
+    processed_docs = analyzer.preprocess_texts(documents)
+    keywords = analyzer.extract_keywords_tfidf(processed_docs, top_n=args.top_keywords, preprocessed=True)
     
-    # 키워드 저장
-    for i, kw_list in enumerate(keywords):
-        all_reports.loc[i, 'keywords'] = ', '.join(kw_list)
+    # 키워드 저장 (keywords는 documents 순서 = all_reports 행 위치)
+    all_reports['keywords'] = [', '.join(kw_list) for kw_list in keywords]
     
     # 토픽 모델링
     logging.info("Running topic modeling")
-    topics, lda_model, corpus, dictionary = analyzer.topic_modeling_lda(
-        documents, 
-        num_topics=args.num_topics
-    )
-    
-    # 문서 분류
-    tokenized_docs = [analyzer.extract_nouns(doc) for doc in documents]
-    doc_topics = analyzer.classify_documents(lda_model, corpus, dictionary, tokenized_docs)
+    if args.topic_mode == 'streaming':
+        # 디스크 코퍼스 + 멀티코어 학습, 모델은 models/lda에 저장되어 다음 실행에서 재사용
+        topics, lda_model, corpus, dictionary = analyzer.topic_modeling_lda_streaming(
+            documents,
+            num_topics=args.num_topics,
+            workers=args.topic_workers,
+            update=args.topic_update
+        )
+        doc_topics = analyzer.classify_documents(lda_model, corpus)
+    else:
+        topics, lda_model, corpus, dictionary = analyzer.topic_modeling_lda(
+            processed_docs, 
+            num_topics=args.num_topics,
+            preprocessed=True
+        )
+        
+        # 문서 분류 (코퍼스로 일괄 추론하므로 다시 토큰화하지 않음)
+        doc_topics = analyzer.classify_documents(lda_model, corpus)
     
-    # 토픽 정보 저장
-    for doc in doc_topics:
-        all_reports.loc[doc['doc_index'], 'main_topic'] = doc['main_topic']
-        all_reports.loc[doc['doc_index'], 'topic_prob'] = doc['topic_prob']
+    # 토픽 정보 저장 (doc_index는 documents 순서 = all_reports 행 위치)
+    all_reports['main_topic'] = [doc['main_topic'] for doc in doc_topics]
+    all_reports['topic_prob'] = [doc['topic_prob'] for doc in doc_topics]
     
     # 결과 저장
-    all_reports.to_csv('data/all_reports_analyzed.csv', index=False)
+    save_artifact(all_reports, artifact_path('all_reports_analyzed', args.storage_format))
+    persist_to_database(args, all_reports, 'reports_analyzed')
     logging.info("Saved analysis results")
     
     # 토픽 정보 저장
@@ -165,56 +218,124 @@ def analyze_text(args):
             'terms': ', '.join([term for term, prob in topic_terms])
         })
     
-    pd.DataFrame(topic_info).to_csv('data/topics.csv', index=False)
+    save_artifact(pd.DataFrame(topic_info), artifact_path('topics', args.storage_format))
     logging.info("Saved topic information")
     
+    # 보고서용 집계 갱신 (새로 들어오거나 내용이 바뀐 문서만 토큰화)
+    cube = AnalyticsCube.load(ANALYTICS_CUBE_PATH) if AnalyticsCube.exists(ANALYTICS_CUBE_PATH) \
+        else AnalyticsCube(ANALYTICS_CUBE_PATH)
+    cube.update(all_reports, NounTokenizer(min_length=2, okt=analyzer.okt), text_column='text')
+    cube.save()
+    
     logging.info("Finished text analysis")
 
 def build_search_index(args):
     """검색 인덱스 구축"""
     logging.info("Building search index")
+    from src.search.search_engine import SearchEngine
     
-    if not os.path.exists('data/all_reports_analyzed.csv'):
+    analyzed_path = find_artifact('all_reports_analyzed')
+    if not analyzed_path:
         logging.warning("No analyzed data found for indexing")
         return
     
-    all_reports = pd.read_csv('data/all_reports_analyzed.csv')
+    # 인덱싱에 필요한 칼럼만 로드 (pdf_text 등 대용량 칼럼 제외)
+    all_reports = load_artifact(analyzed_path, columns=METADATA_COLUMNS + ['main_topic', 'text'])
     
     # 검색 엔진 초기화 및 인덱싱
-    search_engine = SearchEngine()
-    search_engine.index_documents(all_reports, text_column='text', title_column='title')
+    index_path = 'index/search_index.pkl'
+    if args.incremental_index and os.path.exists(index_path):
+        # 기존 인덱스에 추가/변경/삭제된 보고서만 반영
+        search_engine = SearchEngine(index_path)
+        search_engine.sync_documents(all_reports, text_column='text')
+    else:
+        search_engine = SearchEngine(analyzer=args.search_analyzer, passages=args.passage_index,
+                                     passage_size=args.passage_size)
+        search_engine.index_documents(all_reports, text_column='text', title_column='title')
+    
+    # 관련 보고서 이웃 표는 인덱스가 바뀔 때마다 다시 계산
+    search_engine.build_related(n_components=args.related_components, top_k=args.related_top_k)
     
     # 인덱스 저장
-    search_engine.save_index('index/search_index.pkl')
+    search_engine.save_index(index_path)
     logging.info("Search index built and saved")
 
 def generate_reports(args):
     """정책 분석 보고서 생성"""
     logging.info("Generating policy reports")
+    from src.analyzer.policy_analyzer import PolicyAnalyzer
     
-    if not os.path.exists('data/all_reports_analyzed.csv'):
+    analyzed_path = find_artifact('all_reports_analyzed')
+    if not analyzed_path:
         logging.warning("No analyzed data found for report generation")
         return
     
-    # 분석기 초기화
-    analyzer = PolicyAnalyzer('data/all_reports_analyzed.csv')
+    # 분석기 초기화 (분석 단계의 집계가 있으면 원문은 읽지 않음)
+    if AnalyticsCube.exists(ANALYTICS_CUBE_PATH):
+        analyzer = PolicyAnalyzer(cube=AnalyticsCube.load(ANALYTICS_CUBE_PATH, tables=['cube', 'doc_counts']))
+    else:
+        analyzer = PolicyAnalyzer(analyzed_path, columns=['date', 'text'])
     
-    # 키워드 요약 생성
-    keywords_df = analyzer.generate_keyword_summary('text', top_n=args.top_keywords)
+    # 키워드 요약, 차트(워커 프로세스에서 동시에 렌더링), HTML 보고서 생성
+    keywords_df, _ = analyzer.build_reports('text', output_dir='reports', top_n=args.top_keywords,
+                                            workers=args.analysis_workers)
     keywords_df.to_csv('reports/keywords_summary.csv', index=False)
     
-    # 워드클라우드 생성
-    analyzer.generate_wordcloud('text', output_path='reports/wordcloud.png')
-    
-    # 키워드 트렌드 분석
-    top_keywords = keywords_df['keyword'].head(5).tolist()
-    analyzer.compare_keywords_trend('text', top_keywords, date_column='date')
-    
-    # 최종 보고서 생성
-    analyzer.generate_policy_report(output_path='reports/policy_report.html')
-    
     logging.info("Policy reports generated")
 
+def artifact_paths(*names):
+    """산출물 이름별 모든 저장 형식의 경로 (단계 입출력 지문 계산용)"""
+    return [artifact_path(name, fmt) for name in names for fmt in ARTIFACT_FORMATS]
+
+def build_pipeline(args):
+    """단계별 입출력과 의존 관계를 등록한 실행기 생성"""
+    runner = StageRunner(state_path='data/pipeline_state.json', max_workers=args.max_workers,
+                         profile_mode=args.profile, profile_dir='profiles')
+    
+    # 외부 사이트 상태는 지문으로 알 수 없으므로 크롤링은 선택되면 항상 실행
+    # (--run_all에서는 수집한 자료가 이미 있는 기관을 선택하지 않음)
+    runner.add_stage(Stage(
+        'crawl', crawl_data,
+        outputs=artifact_paths('kdi_reports', 'bok_reports'),
+        always_run=True
+    ))
+    runner.add_stage(Stage(
+        'process', process_pdfs,
+        inputs=artifact_paths('kdi_reports', 'bok_reports'),
+        outputs=artifact_paths('kdi_reports_with_text', 'bok_reports_with_text'),
+        depends_on=['crawl'],
+        params={'kdi': args.process_kdi or args.process_all, 'bok': args.process_bok or args.process_all,
+                'dedup_threshold': args.dedup_threshold}
+    ))
+    runner.add_stage(Stage(
+        'analyze', analyze_text,
+        inputs=artifact_paths('kdi_reports_with_text', 'bok_reports_with_text'),
+        outputs=artifact_paths('all_reports_analyzed', 'topics') + [ANALYTICS_CUBE_PATH],
+        depends_on=['process'],
+        params={'top_keywords': args.top_keywords, 'num_topics': args.num_topics,
+                'storage_format': args.storage_format, 'topic_mode': args.topic_mode,
+                'topic_update': args.topic_update}
+    ))
+    # 인덱스 구축과 보고서 생성은 서로 독립적이므로 병렬 실행
+    runner.add_stage(Stage(
+        'build_index', build_search_index,
+        inputs=artifact_paths('all_reports_analyzed'),
+        outputs=['index/search_index.pkl', 'index/search_index.blob'],
+        depends_on=['analyze'],
+        params={'incremental': args.incremental_index, 'analyzer': args.search_analyzer,
+                'passages': args.passage_index, 'passage_size': args.passage_size,
+                'related': [args.related_components, args.related_top_k]}
+    ))
+    runner.add_stage(Stage(
+        'generate_reports', generate_reports,
+        inputs=artifact_paths('all_reports_analyzed') + [ANALYTICS_CUBE_PATH],
+        outputs=['reports/keywords_summary.csv', 'reports/wordcloud.png', 'reports/keywords_comparison.png',
+                 'reports/policy_report.html'],
+        depends_on=['analyze'],
+        params={'top_keywords': args.top_keywords}
+    ))
+    return runner
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="정책 자료 크롤링 및 분석 도구")
@@ -225,25 +346,58 @@ def main():
     parser.add_argument('--crawl_all', action='store_true', help='모든 기관 자료 크롤링')
     parser.add_argument('--start_page', type=int, default=1, help='크롤링 시작 페이지')
     parser.add_argument('--end_page', type=int, default=5, help='크롤링 종료 페이지')
+    parser.add_argument('--resume_crawl', action='store_true', help='체크포인트에서 완료하지 못한 페이지만 다시 크롤링')
     
     # PDF 처리 관련 인자
     parser.add_argument('--process_kdi', action='store_true', help='KDI PDF 처리')
     parser.add_argument('--process_bok', action='store_true', help='BOK PDF 처리')
     parser.add_argument('--process_all', action='store_true', help='모든 PDF 처리')
+    parser.add_argument('--dedup_threshold', type=float, default=0.8,
+                        help='추출 텍스트의 추정 Jaccard 유사도가 이 값 이상이면 중복 게시본으로 표시 (0이면 검사 안 함)')
     
     # 분석 관련 인자
     parser.add_argument('--analyze', action='store_true', help='텍스트 분석 수행')
     parser.add_argument('--top_keywords', type=int, default=20, help='추출할 상위 키워드 수')
     parser.add_argument('--num_topics', type=int, default=5, help='토픽 모델링에서 추출할 토픽 수')
+    parser.add_argument('--topic_mode', choices=['memory', 'streaming'], default='memory',
+                        help='토픽 모델링 방식 (streaming: 디스크 코퍼스 + 멀티코어 학습, 모델 저장/재사용)')
+    parser.add_argument('--topic_workers', type=int, default=None, help='streaming 모드 학습 프로세스 수')
+    parser.add_argument('--topic_update', action='store_true',
+                        help='streaming 모드에서 저장된 모델에 새 문서만 추가 학습')
     
     # 검색 인덱스 관련 인자
     parser.add_argument('--build_index', action='store_true', help='검색 인덱스 구축')
+    parser.add_argument('--incremental_index', action='store_true',
+                        help='기존 인덱스에 변경된 보고서만 반영 (전체 재구축 생략)')
+    parser.add_argument('--search_analyzer', choices=['word', 'char_ngram', 'noun'], default='word',
+                        help='검색 인덱스 토큰 분석기 (char_ngram/noun은 조사가 붙은 한국어 어절도 검색)')
+    parser.add_argument('--passage_index', action='store_true',
+                        help='긴 본문을 구간 단위로 색인하여 구간 점수로 순위를 매기고 스니펫 표시')
+    parser.add_argument('--passage_size', type=int, default=200, help='구간 길이 (단어 수)')
+    parser.add_argument('--related_top_k', type=int, default=10, help='보고서별로 미리 계산할 관련 보고서 수')
+    parser.add_argument('--related_components', type=int, default=100, help='관련 보고서 임베딩(SVD) 차원 수')
     
     # 보고서 생성 관련 인자
     parser.add_argument('--generate_reports', action='store_true', help='정책 분석 보고서 생성')
+    parser.add_argument('--analysis_workers', type=int, default=1,
+                        help='보고서용 명사 빈도 계산 프로세스 수 (1이면 현재 프로세스에서 계산)')
+    
+    # 저장소 관련 인자
+    parser.add_argument('--storage_format', choices=ARTIFACT_FORMATS, default='parquet',
+                        help='단계별 산출물 저장 형식')
+    parser.add_argument('--db_url', type=str, default=None,
+                        help='단계별 결과를 저장할 데이터베이스 URL (예: sqlite:///research_data.db)')
     
     # 전체 파이프라인 실행 관련 인자
     parser.add_argument('--run_all', action='store_true', help='전체 파이프라인 실행')
+    parser.add_argument('--force', action='store_true', help='입력이 바뀌지 않은 단계도 다시 실행')
+    parser.add_argument('--max_workers', type=int, default=2, help='독립 단계를 동시에 실행할 최대 수')
+    
+    # 계측 관련 인자
+    parser.add_argument('--metrics_path', type=str, default='data/metrics.json',
+                        help='단계/구간별 소요 시간, 처리 건수, 처리량을 기록할 JSON 파일')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help='실행하는 단계를 프로파일링하여 profiles/에 저장 (cprofile: 함수별 시간, tracemalloc: 메모리)')
     
     args = parser.parse_args()
     
@@ -252,27 +406,38 @@ def main():
     
     # 전체 파이프라인 실행 플래그 설정
     if args.run_all:
-        args.crawl_all = True
+        # 크롤링은 --crawl_*로 지정한 기관, --force면 모든 기관, 그 외에는 아직 수집한 자료가 없는 기관만 실행
+        if args.force:
+            args.crawl_all = True
+        elif not (args.crawl_kdi or args.crawl_bok or args.crawl_all):
+            args.crawl_kdi = find_artifact('kdi_reports') is None
+            args.crawl_bok = find_artifact('bok_reports') is None
         args.process_all = True
         args.analyze = True
         args.build_index = True
         args.generate_reports = True
     
-    # 단계별 실행
+    # 선택된 단계 목록
+    selected = []
     if args.crawl_kdi or args.crawl_bok or args.crawl_all:
-        crawl_data(args)
-    
+        selected.append('crawl')
     if args.process_kdi or args.process_bok or args.process_all:
-        process_pdfs(args)
-    
+        selected.append('process')
     if args.analyze:
-        analyze_text(args)
-    
+        selected.append('analyze')
     if args.build_index:
-        build_search_index(args)
-    
+        selected.append('build_index')
     if args.generate_reports:
-        generate_reports(args)
+        selected.append('generate_reports')
+    
+    # 단계별 실행 (입력이 바뀌지 않은 단계는 건너뜀)
+    runner = build_pipeline(args)
+    results = runner.run(selected, args, force=args.force)
+    for name, status in results.items():
+        logging.info(f"Stage {name}: {status}")
+    if args.metrics_path:
+        METRICS.write_json(args.metrics_path)
+        logging.info(f"Saved metrics to {args.metrics_path}")
     
     logging.info("All tasks completed")
 
@@ -0,0 +1,170 @@
+import os
+import hashlib
+import logging
+from collections import Counter
+import pandas as pd
+from src.storage.artifact_store import load_artifact, save_artifact
+
+DIMENSIONS = ['year', 'source', 'main_topic']
+
+
+def _text_hash(text):
+    return hashlib.sha1(str(text).encode('utf-8')).hexdigest()
+
+
+class AnalyticsCube:
+    """연도 × 출처 × 토픽 × 키워드 집계 저장소
+
+    - terms: 문서별 명사 빈도 (문서 키, 키워드, 빈도) - 새로 들어오거나 내용이 바뀐 문서만 토큰화한다
+    - documents: 문서별 차원 값 (연도, 출처, 토픽)과 텍스트 해시 - 토픽이 다시 배정되어도 토큰화는 다시 하지 않는다
+    - cube: (연도, 출처, 토픽, 키워드)별 빈도 합과 포함 문서 수
+    - doc_counts: (연도, 출처, 토픽)별 문서 수 (비율 계산용)
+    보고서는 원문 대신 cube/doc_counts만 읽는다.
+    """
+
+    TABLES = ['documents', 'terms', 'cube', 'doc_counts']
+
+    def __init__(self, path='data/analytics_cube'):
+        self.path = path
+        self.documents = pd.DataFrame(columns=['key', 'text_hash'] + DIMENSIONS)
+        self.terms = pd.DataFrame(columns=['key', 'keyword', 'count'])
+        self.cube = pd.DataFrame(columns=DIMENSIONS + ['keyword', 'frequency', 'documents'])
+        self.doc_counts = pd.DataFrame(columns=DIMENSIONS + ['documents'])
+
+    def _table_path(self, name):
+        return os.path.join(self.path, f"{name}.parquet")
+
+    @classmethod
+    def exists(cls, path='data/analytics_cube'):
+        return all(os.path.exists(os.path.join(path, f"{name}.parquet")) for name in cls.TABLES)
+
+    @classmethod
+    def load(cls, path='data/analytics_cube', tables=None):
+        """저장된 집계 불러오기 (보고서만 만들 때는 tables=['cube', 'doc_counts'])"""
+        cube = cls(path)
+        for name in tables or cls.TABLES:
+            setattr(cube, name, load_artifact(cube._table_path(name)))
+        return cube
+
+    def save(self):
+        for name in self.TABLES:
+            save_artifact(getattr(self, name), self._table_path(name))
+
+    def _dimensions(self, dataframe, date_column):
+        """문서별 차원 값 (알 수 없는 연도/토픽은 -1, 출처는 빈 문자열)"""
+        index = dataframe.index
+        if date_column in dataframe.columns:
+            years = pd.to_datetime(dataframe[date_column], errors='coerce').dt.year
+        else:
+            years = pd.Series(float('nan'), index=index)
+        topics = dataframe['main_topic'] if 'main_topic' in dataframe.columns else pd.Series(float('nan'), index=index)
+        sources = dataframe['source'] if 'source' in dataframe.columns else pd.Series('', index=index)
+        return pd.DataFrame({
+            'year': years.fillna(-1).astype(int).to_numpy(),
+            'source': sources.fillna('').astype(str).to_numpy(),
+            'main_topic': pd.to_numeric(topics, errors='coerce').fillna(-1).astype(int).to_numpy(),
+        })
+
+    def update(self, dataframe, tokenize, text_column='text', date_column='date'):
+        """현재 문서 전체로 집계 갱신 (추가/변경된 문서만 토큰화, 빠진 문서는 집계에서 제외)
+
+        반환값: {'added': 새 문서 수, 'changed': 내용이 바뀐 문서 수, 'removed': 빠진 문서 수}
+        """
+        dataframe = dataframe.reset_index(drop=True)
+        texts = dataframe[text_column].fillna('').astype(str)
+        hashes = texts.map(_text_hash)
+        if 'link' in dataframe.columns:
+            keys = [link if isinstance(link, str) and link else f"sha1:{text_hash}"
+                    for link, text_hash in zip(dataframe['link'], hashes)]
+        else:
+            keys = [f"sha1:{text_hash}" for text_hash in hashes]
+
+        # 같은 키가 여러 번 나오면 마지막 행 사용
+        current = pd.DataFrame({'key': keys, 'text_hash': hashes})
+        current = pd.concat([current, self._dimensions(dataframe, date_column)], axis=1)
+        keep_rows = ~current['key'].duplicated(keep='last')
+        current = current[keep_rows].reset_index(drop=True)
+        texts = texts[keep_rows.to_numpy()].reset_index(drop=True)
+
+        previous = dict(zip(self.documents['key'], self.documents['text_hash']))
+        is_new = current['key'].map(lambda key: key not in previous)
+        is_changed = ~is_new & (current['key'].map(previous) != current['text_hash'])
+        removed = set(previous) - set(current['key'])
+
+        # 빠지거나 바뀐 문서의 기존 빈도 제거 후 새로 토큰화한 문서 빈도 추가
+        stale = removed | set(current.loc[is_changed, 'key'])
+        terms = self.terms[~self.terms['key'].isin(stale)] if stale else self.terms
+        rows = []
+        for key, text in zip(current.loc[is_new | is_changed, 'key'], texts[(is_new | is_changed).to_numpy()]):
+            for keyword, count in Counter(tokenize(text)).items():
+                rows.append((key, keyword, count))
+        if rows:
+            terms = pd.concat([terms, pd.DataFrame(rows, columns=['key', 'keyword', 'count'])], ignore_index=True)
+
+        self.terms = terms.reset_index(drop=True)
+        self.documents = current
+        self._aggregate()
+
+        stats = {'added': int(is_new.sum()), 'changed': int(is_changed.sum()), 'removed': len(removed)}
+        logging.info(f"Analytics cube updated: {stats}")
+        return stats
+
+    def _aggregate(self):
+        """문서별 빈도와 차원 값으로 집계 테이블 재계산 (토큰화 없이 groupby만 수행)"""
+        merged = self.terms.merge(self.documents[['key'] + DIMENSIONS], on='key', how='inner')
+        merged['count'] = merged['count'].astype(int)
+        self.cube = (merged.groupby(DIMENSIONS + ['keyword'], sort=False)
+                     .agg(frequency=('count', 'sum'), documents=('key', 'size'))
+                     .reset_index())
+        self.doc_counts = self.documents.groupby(DIMENSIONS, sort=False).size().rename('documents').reset_index()
+
+    def _filter(self, table, source=None, main_topic=None, start_year=None, end_year=None):
+        mask = pd.Series(True, index=table.index)
+        if source is not None:
+            mask &= table['source'] == source
+        if main_topic is not None:
+            mask &= table['main_topic'] == int(main_topic)
+        if start_year is not None:
+            mask &= table['year'] >= int(start_year)
+        if end_year is not None:
+            mask &= table['year'] <= int(end_year)
+        return table[mask]
+
+    @property
+    def total_documents(self):
+        return int(self.doc_counts['documents'].sum()) if len(self.doc_counts) else 0
+
+    def year_range(self):
+        """알려진 연도의 (최소, 최대) - 없으면 None"""
+        years = self.doc_counts.loc[self.doc_counts['year'] >= 0, 'year']
+        return (int(years.min()), int(years.max())) if len(years) else None
+
+    def keyword_summary(self, top_n=50, **filters):
+        """키워드 빈도 상위 top_n개 (keyword, frequency)"""
+        cube = self._filter(self.cube, **filters)
+        totals = cube.groupby('keyword')['frequency'].sum()
+        top = totals.nlargest(top_n, keep='first')
+        return pd.DataFrame({'keyword': top.index, 'frequency': top.to_numpy().astype(int)})
+
+    def frequencies(self, top_n=200, **filters):
+        """워드클라우드용 {키워드: 빈도}"""
+        summary = self.keyword_summary(top_n, **filters)
+        return dict(zip(summary['keyword'], summary['frequency'].astype(int)))
+
+    def keyword_trends(self, keywords, **filters):
+        """연도별 문서 수와 연도 × 키워드 포함 문서 수 (연도를 알 수 없는 문서 제외)
+
+        포함 여부는 문서에서 추출된 명사 집합에 키워드가 그대로 있는지로 판정한다
+        (원문 부분 문자열 검색인 KeywordTrend와 달리 '물가안정'은 '물가'를 포함하지 않음).
+        """
+        keywords = list(dict.fromkeys(keywords))
+        doc_counts = self._filter(self.doc_counts, **filters)
+        totals = doc_counts[doc_counts['year'] >= 0].groupby('year')['documents'].sum().rename('count')
+        cube = self._filter(self.cube, **filters)
+        cube = cube[(cube['year'] >= 0) & cube['keyword'].isin(keywords)]
+        counts = (cube.groupby(['year', 'keyword'])['documents'].sum()
+                  .unstack(fill_value=0)
+                  .reindex(index=totals.index, columns=keywords, fill_value=0)
+                  .astype(int))
+        counts.columns.name = None
+        return totals, counts
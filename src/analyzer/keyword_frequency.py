@@ -0,0 +1,100 @@
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+
+class NounTokenizer:
+    """Okt 명사 추출기 (프로세스마다 처음 호출될 때 생성, 피클에는 포함하지 않음)"""
+
+    def __init__(self, min_length=2, okt=None):
+        self.min_length = min_length
+        self._okt = okt
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_okt'] = None
+        return state
+
+    def __call__(self, text):
+        if self._okt is None:
+            from konlpy.tag import Okt
+            self._okt = Okt()
+        return [noun for noun in self._okt.nouns(text) if len(noun) >= self.min_length]
+
+
+def _count_chunk(tokenize, texts):
+    """워커 프로세스: 문서 묶음의 단어 빈도"""
+    counter = Counter()
+    for text in texts:
+        counter.update(tokenize(text))
+    return counter
+
+
+class KeywordCounter:
+    """문서를 하나씩 토큰화하여 단어 빈도를 누적하는 카운터
+
+    말뭉치 전체를 하나의 문자열이나 단어 목록으로 만들지 않으므로, 메모리는 문서 수가 아니라
+    서로 다른 단어 수에 비례한다. workers > 1이면 문서 묶음을 워커 프로세스에서 세고 결과 Counter를 합친다.
+    """
+
+    def __init__(self, tokenize, workers=1, chunksize=32):
+        self.tokenize = tokenize
+        self.workers = workers
+        self.chunksize = chunksize
+        self.counter = Counter()
+        self.num_documents = 0
+
+    def update(self, text):
+        """문서 하나 반영"""
+        self.counter.update(self.tokenize(str(text)))
+        self.num_documents += 1
+        return self
+
+    def merge(self, other):
+        """다른 카운터(또는 Counter) 합치기"""
+        if isinstance(other, KeywordCounter):
+            self.num_documents += other.num_documents
+            other = other.counter
+        self.counter.update(other)
+        return self
+
+    def _chunks(self, texts):
+        iterator = iter(str(text) for text in texts)
+        while True:
+            chunk = list(islice(iterator, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def update_many(self, texts):
+        """여러 문서 반영 (texts는 생성기여도 됨)"""
+        if self.workers <= 1:
+            for text in texts:
+                self.update(text)
+            return self
+
+        # JVM을 쓰는 형태소 분석기는 fork 후 사용할 수 없으므로 spawn으로 워커 생성
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            pending = {}
+            chunks = self._chunks(texts)
+            # 처리 중인 묶음 수를 제한하여 입력을 한꺼번에 메모리에 올리지 않음
+            for chunk in islice(chunks, self.workers * 2):
+                pending[executor.submit(_count_chunk, self.tokenize, chunk)] = len(chunk)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.num_documents += pending.pop(future)
+                    self.counter.update(future.result())
+                    chunk = next(chunks, None)
+                    if chunk:
+                        pending[executor.submit(_count_chunk, self.tokenize, chunk)] = len(chunk)
+        return self
+
+    def most_common(self, n=None):
+        return self.counter.most_common(n)
+
+    def frequencies(self, top_n=200):
+        """워드클라우드용 {단어: 빈도} (상위 top_n개)"""
+        return dict(self.counter.most_common(top_n))
@@ -0,0 +1,131 @@
+import re
+import numpy as np
+import pandas as pd
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def trie_pattern(keywords):
+    """키워드 목록을 공통 접두사로 묶은 정규식 패턴 생성
+
+    "물가|물가상승|물류"를 "물(?:가(?:상승)?|류)"처럼 트라이 형태로 만들어
+    키워드 수가 많아도 위치마다 모든 대안을 하나씩 시도하지 않게 한다.
+    같은 위치에서는 가장 긴 키워드가 일치한다.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            # 여기서 끝나는 키워드도 있으면 나머지는 선택 사항 (탐욕적으로 긴 키워드 우선)
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """여러 키워드의 문서 포함 여부를 한 번의 스캔으로 확인하는 매처
+
+    - 문서를 어절로 나눈 뒤 서로 다른 어절만 트라이 정규식으로 검사하고, 어절별 결과는 캐시한다
+      (같은 어절은 말뭉치 전체에서 한 번만 검사)
+    - 모든 위치에서 가장 긴 키워드를 찾는 전방 탐색(lookahead) 정규식을 쓰므로 겹치는 일치도 놓치지 않으며,
+      일치한 키워드에 포함된 다른 키워드(예: "소비자물가" 안의 "물가")도 함께 포함된 것으로 본다
+    - 공백이 들어간 키워드("통화 정책")는 문서 전체 텍스트에서 따로 찾는다
+    """
+
+    def __init__(self, keywords, cache_size=500000):
+        self.keywords = list(dict.fromkeys(str(keyword).strip() for keyword in keywords if str(keyword).strip()))
+        self.keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+        # 키워드별로 그 안에 들어있는 키워드 번호 (자기 자신 포함)
+        self.contained = {
+            keyword: tuple(self.keyword_ids[other] for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+        words = [keyword for keyword in self.keywords if not WHITESPACE.search(keyword)]
+        phrases = [keyword for keyword in self.keywords if WHITESPACE.search(keyword)]
+        self.word_regex = self._compile(words)
+        self.phrase_regex = self._compile(phrases)
+        self.cache_size = cache_size
+        self._word_cache = {}
+
+    def _compile(self, keywords):
+        return re.compile('(?=(' + trie_pattern(keywords) + '))') if keywords else None
+
+    def _scan(self, regex, text):
+        found = set()
+        for matched in set(regex.findall(text)):
+            found.update(self.contained[matched])
+        return found
+
+    def _word_ids(self, word):
+        ids = self._word_cache.get(word)
+        if ids is None:
+            ids = tuple(self._scan(self.word_regex, word))
+            if len(self._word_cache) >= self.cache_size:
+                self._word_cache.clear()
+            self._word_cache[word] = ids
+        return ids
+
+    def match(self, text):
+        """문서에 포함된 키워드 번호 집합"""
+        found = set()
+        if not text:
+            return found
+        if self.word_regex is not None:
+            for word in set(text.split()):
+                found.update(self._word_ids(word))
+        if self.phrase_regex is not None:
+            found.update(self._scan(self.phrase_regex, WHITESPACE.sub(' ', text)))
+        return found
+
+
+class KeywordTrend:
+    """연도 × 키워드 문서 수 행렬 계산기 (문서마다 한 번만 스캔, 원본 데이터프레임은 수정하지 않음)"""
+
+    def __init__(self, keywords):
+        self.matcher = KeywordMatcher(keywords)
+
+    @property
+    def keywords(self):
+        return self.matcher.keywords
+
+    def count(self, texts, years):
+        """연도별 전체 문서 수와 연도 × 키워드 포함 문서 수
+
+        반환값: (연도별 문서 수 Series, 연도 × 키워드 문서 수 DataFrame) - 연도를 알 수 없는 문서는 제외
+        """
+        years = pd.Series(years).reset_index(drop=True)
+        valid = years.notna().to_numpy()
+        year_values, year_rows = np.unique(years[valid].astype(int).to_numpy(), return_inverse=True)
+        doc_rows = np.full(len(years), -1, dtype=np.int64)
+        doc_rows[valid] = year_rows
+
+        counts = np.zeros((len(year_values), len(self.keywords)), dtype=np.int64)
+        hit_rows = []
+        hit_cols = []
+        for row, text in zip(doc_rows, texts):
+            if row < 0:
+                continue
+            found = self.matcher.match(text if isinstance(text, str) else '')
+            hit_rows.extend([row] * len(found))
+            hit_cols.extend(found)
+        np.add.at(counts, (np.asarray(hit_rows, dtype=np.int64), np.asarray(hit_cols, dtype=np.int64)), 1)
+
+        index = pd.Index(year_values, name='year')
+        totals = pd.Series(np.bincount(year_rows, minlength=len(year_values)), index=index, name='count')
+        return totals, pd.DataFrame(counts, index=index, columns=self.keywords)
+
+    def ratios(self, texts, years):
+        """연도 × 키워드 포함 비율 (%)"""
+        totals, counts = self.count(texts, years)
+        return counts.div(totals, axis=0) * 100
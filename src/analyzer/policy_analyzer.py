@@ -1,83 +1,101 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import seaborn as sns
-from konlpy.tag import Okt
-from collections import Counter
 import os
+import html
+from src.storage.artifact_store import load_artifact
+from src.analyzer.keyword_trend import KeywordTrend
+from src.analyzer.keyword_frequency import KeywordCounter, NounTokenizer
+from src.analyzer.report_builder import ReportBuilder, render_keyword_trends, render_wordcloud, agg_pyplot
 
 class PolicyAnalyzer:
-    def __init__(self, data_path=None):
+    def __init__(self, data_path=None, columns=None, cube=None):
         self.data = None
-        self.okt = Okt()
+        # 분석 단계에서 미리 집계한 AnalyticsCube가 있으면 보고서는 원문 대신 집계를 읽음
+        self.cube = cube
+        self._okt = None
+        self._years = {}
+        self._keyword_counters = {}
         
         if data_path:
-            self.load_data(data_path)
+            self.load_data(data_path, columns=columns)
     
-    def load_data(self, data_path):
-        """데이터 로드"""
-        if data_path.endswith('.csv'):
-            self.data = pd.read_csv(data_path)
-        elif data_path.endswith('.xlsx'):
-            self.data = pd.read_excel(data_path)
-        else:
-            raise ValueError("Unsupported file format")
+    @property
+    def okt(self):
+        """한국어 형태소 분석기 (JVM을 띄우므로 원문을 토큰화할 때만 생성)"""
+        if self._okt is None:
+            from konlpy.tag import Okt
+            self._okt = Okt()
+        return self._okt
+    
+    def load_data(self, data_path, columns=None):
+        """데이터 로드 (csv/parquet/xlsx, columns로 필요한 칼럼만 선택)"""
+        self.data = load_artifact(data_path, columns=columns)
+        self._years = {}
+        self._keyword_counters = {}
+    
+    def years(self, date_column='date'):
+        """문서별 연도 (날짜 변환은 칼럼별로 한 번만 수행, 변환할 수 없으면 NaN)"""
+        if date_column not in self._years:
+            self._years[date_column] = pd.to_datetime(self.data[date_column], errors='coerce').dt.year
+        return self._years[date_column]
+    
+    def keyword_trends(self, text_column, keywords, date_column='date'):
+        """여러 키워드의 연도별 포함 문서 수를 한 번의 스캔으로 계산
+
+        반환값: (연도별 문서 수 Series, 연도 × 키워드 포함 문서 수 DataFrame)
+        집계가 있으면 키워드(명사)가 추출된 문서 수를 집계에서 바로 읽는다. 이때는 추출된 명사와 정확히
+        같은 경우만 세므로, 원문에 부분 문자열로 나타나면 세는 원문 스캔보다 값이 작을 수 있다 (trend_basis 참고).
+        """
+        if self.cube is not None:
+            return self.cube.keyword_trends(keywords)
+        trend = KeywordTrend(keywords)
+        return trend.count(self.data[text_column], self.years(date_column))
     
-    def generate_keyword_summary(self, text_column, top_n=50):
+    def trend_basis(self):
+        """키워드 트렌드 집계 기준 설명 (집계 사용 여부에 따라 포함 판정 방식이 다름)"""
+        if self.cube is not None:
+            return '키워드를 명사로 추출한 문서의 비율 (형태소 분석 결과와 정확히 일치하는 경우만 포함)'
+        return '본문에 키워드 문자열이 나타나는 문서의 비율 (다른 단어의 일부로 나타나는 경우도 포함)'
+    
+    def keyword_counter(self, text_column, workers=1):
+        """문서별 명사 빈도를 누적한 카운터 (칼럼별로 한 번만 계산하여 요약과 워드클라우드가 공유)"""
+        if text_column not in self._keyword_counters:
+            tokenizer = NounTokenizer(min_length=2, okt=self.okt if workers <= 1 else None)
+            counter = KeywordCounter(tokenizer, workers=workers)
+            counter.update_many(self.data[text_column].fillna(''))
+            self._keyword_counters[text_column] = counter
+        return self._keyword_counters[text_column]
+    
+    def generate_keyword_summary(self, text_column, top_n=50, workers=1):
         """키워드 빈도 요약"""
-        all_nouns = []
-        
-        for text in self.data[text_column].fillna(''):
-            nouns = self.okt.nouns(str(text))
-            all_nouns.extend([noun for noun in nouns if len(noun) > 1])
+        if self.cube is not None:
+            return self.cube.keyword_summary(top_n)
         
-        # 키워드 빈도 계산
-        keyword_freq = Counter(all_nouns).most_common(top_n)
+        # 키워드 빈도 계산 (문서 단위 스트리밍 누적)
+        keyword_freq = self.keyword_counter(text_column, workers=workers).most_common(top_n)
         
         # 데이터프레임으로 변환
         keywords_df = pd.DataFrame(keyword_freq, columns=['keyword', 'frequency'])
         
         return keywords_df
     
-    def generate_wordcloud(self, text_column, output_path='wordcloud.png'):
-        """워드클라우드 생성"""
-        combined_text = ' '.join(self.data[text_column].fillna('').astype(str))
-        
-        # 명사 추출
-        nouns = self.okt.nouns(combined_text)
-        noun_text = ' '.join([noun for noun in nouns if len(noun) > 1])
-        
-        # 워드클라우드 생성
-        wordcloud = WordCloud(
-            font_path='NanumGothic.ttf',  # 한글 폰트 경로
-            width=800,
-            height=600,
-            background_color='white'
-        ).generate(noun_text)
-        
-        # 저장
-        plt.figure(figsize=(10, 8))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
+    def generate_wordcloud(self, text_column, output_path='wordcloud.png', max_words=200, workers=1):
+        """워드클라우드 생성 (전체 텍스트를 합치지 않고 누적된 명사 빈도로 생성)"""
+        if self.cube is not None:
+            frequencies = self.cube.frequencies(max_words)
+        else:
+            frequencies = self.keyword_counter(text_column, workers=workers).frequencies(max_words)
         
-        return output_path
+        return render_wordcloud(frequencies, output_path, max_words=max_words)
     
     def analyze_trend_by_year(self, text_column, keyword, date_column='date'):
         """연도별 키워드 트렌드 분석"""
-        # 날짜 형식 변환
-        self.data['year'] = pd.to_datetime(self.data[date_column]).dt.year
-        
-        # 키워드 포함 여부 확인
-        self.data['contains_keyword'] = self.data[text_column].fillna('').astype(str).str.contains(keyword)
-        
-        # 연도별 그룹화 및 비율 계산
-        yearly_counts = self.data.groupby('year')['contains_keyword'].agg(['count', 'sum'])
-        yearly_counts['ratio'] = yearly_counts['sum'] / yearly_counts['count'] * 100
+        # 연도별 포함 문서 수 및 비율 계산
+        yearly_counts = self.compare_keywords_trend(text_column, [keyword], date_column=date_column,
+                                                    output_path=None)[str(keyword).strip()]
         
         # 시각화
+        import seaborn as sns
+        plt = agg_pyplot()
         plt.figure(figsize=(12, 6))
         sns.lineplot(x=yearly_counts.index, y=yearly_counts['ratio'])
         plt.title(f'Yearly Trend for Keyword: {keyword}')
@@ -89,46 +107,85 @@ class PolicyAnalyzer:
         
         return yearly_counts
     
-    def compare_keywords_trend(self, text_column, keywords, date_column='date'):
-        """여러 키워드 트렌드 비교 분석"""
-        # 날짜 형식 변환
-        self.data['year'] = pd.to_datetime(self.data[date_column]).dt.year
+    def compare_keywords_trend(self, text_column, keywords, date_column='date',
+                               output_path='keywords_comparison.png'):
+        """여러 키워드 트렌드 비교 분석 (모든 키워드를 한 번의 스캔으로 계산, self.data는 수정하지 않음)"""
+        totals, counts = self.keyword_trends(text_column, keywords, date_column=date_column)
         
         results = {}
-        plt.figure(figsize=(14, 8))
-        
-        for keyword in keywords:
-            # 키워드 포함 여부 확인
-            self.data[f'contains_{keyword}'] = self.data[text_column].fillna('').astype(str).str.contains(keyword)
-            
-            # 연도별 그룹화 및 비율 계산
-            yearly_counts = self.data.groupby('year')[f'contains_{keyword}'].agg(['count', 'sum'])
+        for keyword in counts.columns:
+            yearly_counts = pd.DataFrame({'count': totals, 'sum': counts[keyword]})
             yearly_counts['ratio'] = yearly_counts['sum'] / yearly_counts['count'] * 100
-            
-            # 결과 저장
             results[keyword] = yearly_counts
-            
-            # 시각화에 추가
-            sns.lineplot(x=yearly_counts.index, y=yearly_counts['ratio'], label=keyword)
         
-        plt.title('Yearly Trend Comparison for Keywords')
-        plt.xlabel('Year')
-        plt.ylabel('Occurrence Ratio (%)')
-        plt.legend()
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.savefig('keywords_comparison.png')
-        plt.close()
+        if output_path:
+            render_keyword_trends(self.trend_ratios(results), output_path)
         
         return results
     
-    def generate_policy_report(self, output_path='policy_report.html'):
-        """정책 분석 보고서 생성"""
-        if self.data is None:
+    def trend_ratios(self, results):
+        """compare_keywords_trend 결과를 차트 입력용 {키워드: {연도: 비율}}로 변환"""
+        return {keyword: {int(year): round(float(ratio), 6) for year, ratio in yearly_counts['ratio'].items()}
+                for keyword, yearly_counts in results.items()}
+    
+    def build_reports(self, text_column='text', output_dir='reports', top_n=50, trend_keywords=5, max_words=200,
+                      workers=1, render_workers=None):
+        """키워드 요약, 워드클라우드, 트렌드 차트, HTML 보고서를 한 번에 생성
+        
+        집계는 현재 프로세스에서 계산하고, 차트는 ReportBuilder가 워커 프로세스에서 동시에 그린다
+        (입력 집계가 이전 실행과 같은 차트는 다시 그리지 않음).
+        반환값: (키워드 요약 DataFrame, 보고서 경로)
+        """
+        keywords_df = self.generate_keyword_summary(text_column, top_n=top_n, workers=workers)
+        if self.cube is not None:
+            frequencies = self.cube.frequencies(max_words)
+        else:
+            frequencies = self.keyword_counter(text_column, workers=workers).frequencies(max_words)
+        trends = self.compare_keywords_trend(text_column, keywords_df['keyword'].head(trend_keywords).tolist(),
+                                             output_path=None)
+        
+        builder = ReportBuilder(output_dir, workers=render_workers)
+        builder.add_chart('wordcloud', render_wordcloud, {str(k): int(v) for k, v in frequencies.items()},
+                          'wordcloud.png', max_words=max_words)
+        builder.add_chart('keywords_comparison', render_keyword_trends, self.trend_ratios(trends),
+                          'keywords_comparison.png')
+        charts = builder.render()
+        
+        report_path = self.generate_policy_report(os.path.join(output_dir, 'policy_report.html'),
+                                                  keywords_df=keywords_df, charts=charts)
+        return keywords_df, report_path
+    
+    def generate_policy_report(self, output_path='policy_report.html', keywords_df=None, charts=None):
+        """정책 분석 보고서 생성 (keywords_df가 있으면 키워드 빈도 표를 채움, charts는 {차트 이름: 이미지 경로})"""
+        if self.data is None and self.cube is None:
             raise ValueError("No data loaded")
         
         # 기본 통계 수집
-        total_documents = len(self.data)
-        year_range = (self.data['year'].min(), self.data['year'].max()) if 'year' in self.data.columns else ('Unknown', 'Unknown')
+        if self.cube is not None:
+            total_documents = self.cube.total_documents
+            year_range = self.cube.year_range() or ('Unknown', 'Unknown')
+        else:
+            total_documents = len(self.data)
+            if 'date' in self.data.columns and self.years('date').notna().any():
+                year_range = (int(self.years('date').min()), int(self.years('date').max()))
+            elif 'year' in self.data.columns:
+                year_range = (self.data['year'].min(), self.data['year'].max())
+            else:
+                year_range = ('Unknown', 'Unknown')
+        
+        # 키워드 빈도 표
+        keyword_rows = ''
+        if keywords_df is not None:
+            keyword_rows = ''.join(
+                f"<tr><td>{rank}</td><td>{html.escape(str(keyword))}</td><td>{int(frequency)}</td></tr>"
+                for rank, (keyword, frequency) in enumerate(zip(keywords_df['keyword'], keywords_df['frequency']), 1)
+            )
+        
+        # 이미지 경로는 보고서 파일 기준 상대 경로
+        charts = charts or {'wordcloud': 'wordcloud.png', 'keywords_comparison': 'keywords_comparison.png'}
+        report_dir = os.path.dirname(os.path.abspath(output_path))
+        chart_src = {name: html.escape(os.path.relpath(os.path.abspath(path), report_dir).replace(os.sep, '/'))
+                     for name, path in charts.items()}
         
         # HTML 보고서 생성
         html_content = f"""
@@ -159,18 +216,22 @@ class PolicyAnalyzer:
                 
                 <h2>주요 키워드 분석</h2>
                 <div id="keyword-table">
-                    <!-- 키워드 빈도 테이블 추가 -->
+                    <table>
+                        <tr><th>순위</th><th>키워드</th><th>빈도</th></tr>
+                        {keyword_rows}
+                    </table>
                 </div>
                 
                 <h2>시각화</h2>
                 <div class="chart">
                     <h3>워드클라우드</h3>
-                    <img src="wordcloud.png" alt="Word Cloud" style="max-width: 100%;">
+                    <img src="{chart_src['wordcloud']}" alt="Word Cloud" style="max-width: 100%;">
                 </div>
                 
                 <div class="chart">
                     <h3>주요 키워드 트렌드</h3>
-                    <img src="keywords_comparison.png" alt="Keyword Trends" style="max-width: 100%;">
+                    <p>집계 기준: {html.escape(self.trend_basis())}</p>
+                    <img src="{chart_src['keywords_comparison']}" alt="Keyword Trends" style="max-width: 100%;">
                 </div>
                 
                 <div class="footer">
@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def agg_pyplot():
+    """화면 없이 파일로만 그리는 Agg 백엔드의 pyplot (워커 프로세스에서도 호출)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_wordcloud(frequencies, output_path, max_words=200, font_path='NanumGothic.ttf'):
+    """{단어: 빈도}로 워드클라우드 이미지 저장"""
+    from wordcloud import WordCloud
+    plt = agg_pyplot()
+    wordcloud = WordCloud(
+        font_path=font_path,  # 한글 폰트 경로
+        width=800,
+        height=600,
+        background_color='white',
+        max_words=max_words
+    ).generate_from_frequencies(frequencies)
+
+    plt.figure(figsize=(10, 8))
+    plt.imshow(wordcloud, interpolation='bilinear')
+    plt.axis('off')
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+    return output_path
+
+
+def render_keyword_trends(ratios, output_path, title='Yearly Trend Comparison for Keywords'):
+    """{키워드: {연도: 비율(%)}}로 연도별 트렌드 선 그래프 저장"""
+    import seaborn as sns
+    plt = agg_pyplot()
+    plt.figure(figsize=(14, 8))
+    for keyword, yearly in ratios.items():
+        years = [int(year) for year in yearly]
+        sns.lineplot(x=years, y=list(yearly.values()), label=keyword)
+    plt.title(title)
+    plt.xlabel('Year')
+    plt.ylabel('Occurrence Ratio (%)')
+    if ratios:
+        plt.legend()
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.savefig(output_path)
+    plt.close()
+    return output_path
+
+
+class ReportBuilder:
+    """보고서 차트를 워커 프로세스에서 동시에 그리고, 입력 집계가 같은 차트는 다시 그리지 않는 빌더
+
+    차트마다 (그리기 함수, 입력 집계, 옵션)의 해시를 output_dir/chart_cache.json에 기록해 두고,
+    해시가 같고 이미지 파일이 남아 있으면 건너뛴다. 입력은 JSON으로 표현 가능한 값(dict/list/숫자/문자열)이어야 한다.
+    """
+
+    CACHE_FILE = 'chart_cache.json'
+
+    def __init__(self, output_dir='reports', workers=None):
+        self.output_dir = output_dir
+        # None이면 차트마다 프로세스 하나 (CPU 수 이내), 1이면 현재 프로세스에서 순서대로 그림
+        self.workers = workers
+        self.charts = {}
+
+    def add_chart(self, name, render, data, filename, **options):
+        """차트 등록 (render(data, output_path, **options) 형태의 모듈 수준 함수)"""
+        self.charts[name] = (render, data, os.path.join(self.output_dir, filename), options)
+        return self
+
+    def _digest(self, render, data, options):
+        payload = {'render': f"{render.__module__}.{render.__name__}", 'data': data, 'options': options}
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def _load_cache(self):
+        try:
+            with open(os.path.join(self.output_dir, self.CACHE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        path = os.path.join(self.output_dir, self.CACHE_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def render(self):
+        """등록된 차트 그리기, {차트 이름: 이미지 경로} 반환"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        cache = self._load_cache()
+        digests = {}
+        pending = []
+        for name, (render, data, output_path, options) in self.charts.items():
+            digests[output_path] = self._digest(render, data, options)
+            if cache.get(output_path) == digests[output_path] and os.path.exists(output_path):
+                logging.info(f"Chart '{name}' is up to date, skipping")
+            else:
+                pending.append((render, data, output_path, options))
+
+        workers = self.workers or min(len(pending), os.cpu_count() or 1)
+        if workers <= 1 or len(pending) <= 1:
+            for render, data, output_path, options in pending:
+                render(data, output_path, **options)
+        else:
+            # 메인 프로세스의 matplotlib/JVM 상태를 물려받지 않도록 spawn으로 워커 생성
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [executor.submit(render, data, output_path, **options)
+                           for render, data, output_path, options in pending]
+                for future in futures:
+                    future.result()
+        logging.info(f"Rendered {len(pending)} of {len(self.charts)} charts")
+
+        cache.update(digests)
+        self._save_cache(cache)
+        return {name: output_path for name, (_, _, output_path, _) in self.charts.items()}
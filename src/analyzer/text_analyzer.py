@@ -1,46 +1,57 @@
 import pandas as pd
 import numpy as np
 import re
-from konlpy.tag import Okt
 from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
-import nltk
 from gensim import corpora, models
+from src.analyzer.topic_model import StreamingTopicModel, document_topic_matrix
+from src.pipeline.instrumentation import span
+
+# 특수문자, 숫자, 공백이 이어진 구간 (공백 하나로 바꾸면 특수문자 제거 → 숫자 제거 → 공백 정리와 같은 결과)
+NON_WORD = re.compile(r'[\W\d]+')
 
 class TextAnalyzer:
     def __init__(self):
-        self.okt = Okt()  # 한국어 형태소 분석기
-        nltk.download('punkt')
-        nltk.download('stopwords')
+        # 한국어 형태소 분석기 (JVM을 띄우므로 처음 사용할 때 생성)
+        self._okt = None
+    
+    @property
+    def okt(self):
+        if self._okt is None:
+            from konlpy.tag import Okt
+            self._okt = Okt()
+        return self._okt
     
     def preprocess_text(self, text):
-        """텍스트 전처리"""
-        # 특수문자 제거
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # 숫자 제거
-        text = re.sub(r'\d+', ' ', text)
-        
-        # 여러 공백을 하나로 변경
-        text = re.sub(r'\s+', ' ', text).strip()
+        """텍스트 전처리 (특수문자와 숫자를 지우고 여러 공백을 하나로 변경, 정규식 한 번으로 처리)"""
+        return NON_WORD.sub(' ', text).strip()
+    
+    def preprocess_texts(self, documents):
+        """문서 목록 일괄 전처리
         
-        return text
+        한 실행 안에서 결과를 키워드 추출과 토픽 모델링에 preprocessed=True로 함께 넘겨 같은 문서를 다시 전처리하지 않는다.
+        """
+        with span('analyze.preprocess', count=len(documents)):
+            sub = NON_WORD.sub
+            return [sub(' ', doc).strip() for doc in documents]
     
     def extract_nouns(self, text):
         """한국어 명사 추출"""
         return self.okt.nouns(text)
     
-    def extract_keywords_tfidf(self, documents, top_n=20):
-        """TF-IDF 기반 키워드 추출"""
+    def extract_keywords_tfidf(self, documents, top_n=20, preprocessed=False):
+        """TF-IDF 기반 키워드 추출 (preprocessed=True이면 documents는 preprocess_texts 결과)"""
         # 텍스트 전처리
-        processed_docs = [self.preprocess_text(doc) for doc in documents]
+        processed_docs = documents if preprocessed else self.preprocess_texts(documents)
         
         # 명사 추출
-        tokenized_docs = [' '.join(self.extract_nouns(doc)) for doc in processed_docs]
+        with span('analyze.tokenize', count=len(processed_docs)):
+            tokenized_docs = [' '.join(self.extract_nouns(doc)) for doc in processed_docs]
         
         # TF-IDF 계산
         vectorizer = TfidfVectorizer(max_features=1000, min_df=2)
-        tfidf_matrix = vectorizer.fit_transform(tokenized_docs)
+        with span('analyze.tfidf_fit', count=len(tokenized_docs)):
+            tfidf_matrix = vectorizer.fit_transform(tokenized_docs)
         
         # 주요 키워드 추출
         feature_names = vectorizer.get_feature_names_out()
@@ -60,25 +71,27 @@ class TextAnalyzer:
         
         return keywords
     
-    def topic_modeling_lda(self, documents, num_topics=5):
-        """LDA 토픽 모델링"""
+    def topic_modeling_lda(self, documents, num_topics=5, preprocessed=False):
+        """LDA 토픽 모델링 (preprocessed=True이면 documents는 preprocess_texts 결과)"""
         # 텍스트 전처리 및 토큰화
-        processed_docs = [self.preprocess_text(doc) for doc in documents]
-        tokenized_docs = [self.extract_nouns(doc) for doc in processed_docs]
+        processed_docs = documents if preprocessed else self.preprocess_texts(documents)
+        with span('analyze.tokenize', count=len(processed_docs)):
+            tokenized_docs = [self.extract_nouns(doc) for doc in processed_docs]
         
         # 사전 및 코퍼스 생성
         dictionary = corpora.Dictionary(tokenized_docs)
         corpus = [dictionary.doc2bow(doc) for doc in tokenized_docs]
         
         # LDA 모델 훈련
-        lda_model = models.LdaModel(
-            corpus=corpus,
-            id2word=dictionary,
-            num_topics=num_topics,
-            passes=10,
-            alpha='auto',
-            per_word_topics=True
-        )
+        with span('analyze.lda', count=len(corpus)):
+            lda_model = models.LdaModel(
+                corpus=corpus,
+                id2word=dictionary,
+                num_topics=num_topics,
+                passes=10,
+                alpha='auto',
+                per_word_topics=True
+            )
         
         # 토픽 추출
         topics = []
@@ -90,22 +103,42 @@ class TextAnalyzer:
         
         return topics, lda_model, corpus, dictionary
     
-    def classify_documents(self, lda_model, corpus, dictionary, tokenized_docs):
-        """문서 분류"""
-        document_topics = []
+    def topic_modeling_lda_streaming(self, documents, num_topics=5, model_dir='models/lda', workers=None,
+                                     passes=10, update=False):
+        """대용량 LDA 토픽 모델링 (MmCorpus 디스크 코퍼스 + LdaMulticore, 모델/사전 저장 및 재사용)
+
+        저장된 모델은 원문 해시로 학습한 문서를 구분하므로 documents는 전처리 전 원문을 받는다.
+        """
+        with span('analyze.lda', count=len(documents)):
+            topic_model = StreamingTopicModel(
+                tokenize=lambda doc: self.extract_nouns(self.preprocess_text(doc)),
+                model_dir=model_dir,
+                num_topics=num_topics,
+                workers=workers,
+                passes=passes
+            ).fit(documents, update=update)
         
-        for i, doc_bow in enumerate(corpus):
-            # 문서의 토픽 분포 계산
-            topic_dist = lda_model.get_document_topics(doc_bow)
-            # 주요 토픽 선택
-            main_topic = max(topic_dist, key=lambda x: x[1])
-            
-            document_topics.append({
-                'doc_index': i,
-                'tokens': tokenized_docs[i],
-                'main_topic': main_topic[0],
-                'topic_prob': main_topic[1],
-                'topic_dist': topic_dist
-            })
+        return topic_model.topics(10), topic_model.model, topic_model.corpus, topic_model.dictionary
+    
+    def classify_documents(self, lda_model, corpus):
+        """문서 분류 (문서 × 토픽 행렬을 일괄 추론한 뒤 argmax로 주요 토픽 선택)"""
+        with span('analyze.topic_inference', count=len(corpus)):
+            doc_topic = document_topic_matrix(lda_model, corpus)
+        main_topics = doc_topic.argmax(axis=1)
+        topic_probs = doc_topic[np.arange(len(doc_topic)), main_topics]
         
-        return document_topics
\ No newline at end of file
+        return [
+            {'doc_index': i, 'main_topic': int(topic), 'topic_prob': float(prob)}
+            for i, (topic, prob) in enumerate(zip(main_topics, topic_probs))
+        ]
+    
+    def classify_new_documents(self, documents, model_dir='models/lda'):
+        """저장된 토픽 모델로 새 문서 분류 (재학습 없음)
+
+        반환값: (주요 토픽 배열, 주요 토픽 확률 배열, 문서 × 토픽 행렬)
+        """
+        topic_model = StreamingTopicModel.load(
+            lambda doc: self.extract_nouns(self.preprocess_text(doc)), model_dir=model_dir)
+        doc_topic = topic_model.transform(documents)
+        main_topics = doc_topic.argmax(axis=1)
+        return main_topics, doc_topic[np.arange(len(doc_topic)), main_topics], doc_topic
@@ -0,0 +1,183 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import scipy.sparse as sp
+from gensim import corpora, models
+from gensim.matutils import corpus2csc, dirichlet_expectation
+from gensim.utils import grouper
+
+
+def document_topic_matrix(lda_model, corpus, chunksize=2000):
+    """문서 × 토픽 확률 행렬 (각 행의 합은 1)
+
+    gensim LdaModel.inference와 같은 변분 추론을 청크 단위 희소 행렬 연산으로 수행한다.
+    문서마다 파이썬 루프를 돌지 않으며, 수렴한 문서가 많아지면 작업 집합에서 뺀다.
+    gamma 초기값은 난수 대신 1로 고정하여 같은 입력이면 항상 같은 결과를 낸다.
+    """
+    dtype = getattr(lda_model, 'dtype', np.float32)
+    exp_elog_beta_t = np.ascontiguousarray(np.asarray(lda_model.expElogbeta, dtype=dtype).T)   # 단어 × 토픽
+    num_terms, num_topics = exp_elog_beta_t.shape
+    alpha = np.asarray(lda_model.alpha, dtype=dtype)
+
+    blocks = []
+    for chunk in grouper(corpus, chunksize):
+        counts = corpus2csc(chunk, num_terms=num_terms, num_docs=len(chunk), dtype=dtype).T.tocsr()
+        gamma = np.ones((counts.shape[0], num_topics), dtype=dtype)
+
+        active = np.arange(counts.shape[0])
+        work = counts
+        rows = np.repeat(np.arange(work.shape[0]), np.diff(work.indptr))
+        beta_columns = exp_elog_beta_t[work.indices]                       # 단어 출현(nnz) × 토픽
+        for _ in range(lda_model.iterations):
+            exp_elog_theta = np.exp(dirichlet_expectation(gamma[active])).astype(dtype)
+            phinorm = np.einsum('ij,ij->i', exp_elog_theta[rows], beta_columns) + 1e-30
+            weights = sp.csr_matrix((work.data / phinorm, work.indices, work.indptr), shape=work.shape)
+            new_gamma = alpha + exp_elog_theta * (weights @ exp_elog_beta_t)
+            change = np.abs(new_gamma - gamma[active]).mean(axis=1)
+            gamma[active] = new_gamma
+            keep = change >= lda_model.gamma_threshold
+            if not keep.any():
+                break
+            # 수렴한 문서가 1/4을 넘으면 남은 문서만으로 작업 집합을 다시 구성
+            if keep.sum() < 0.75 * len(keep):
+                active = active[keep]
+                work = work[keep]
+                rows = np.repeat(np.arange(work.shape[0]), np.diff(work.indptr))
+                beta_columns = exp_elog_beta_t[work.indices]
+        blocks.append(gamma / gamma.sum(axis=1, keepdims=True))
+
+    if not blocks:
+        return np.zeros((0, lda_model.num_topics))
+    return np.vstack(blocks)
+
+
+class StreamingTopicModel:
+    """디스크 기반 코퍼스와 멀티코어 학습을 사용하는 LDA 토픽 모델
+
+    - 문서를 하나씩 토큰화하여 bag-of-words를 바로 MmCorpus 파일로 기록한다 (토큰 목록을 메모리에 두지 않음)
+    - LdaMulticore로 학습하고 모델/사전/코퍼스를 model_dir에 저장한다
+    - 다시 실행할 때 문서와 설정이 같으면 저장된 모델을 그대로 쓰고,
+      update=True이면 기존 모델에 새 문서만 추가 학습한다 (사전은 고정)
+    """
+
+    MODEL_FILE = 'lda.model'
+    DICTIONARY_FILE = 'dictionary.dict'
+    CORPUS_FILE = 'corpus.mm'
+    META_FILE = 'meta.json'
+
+    def __init__(self, tokenize, model_dir='models/lda', num_topics=5, workers=None, passes=10,
+                 chunksize=2000, random_state=None):
+        self.tokenize = tokenize
+        self.model_dir = model_dir
+        self.num_topics = num_topics
+        # gensim 권장값: 물리 코어 수 - 1
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.passes = passes
+        self.chunksize = chunksize
+        self.random_state = random_state
+        self.model = None
+        self.dictionary = None
+        self.corpus = None
+
+    def _path(self, name):
+        return os.path.join(self.model_dir, name)
+
+    def _doc_hashes(self, documents):
+        return [hashlib.sha1(str(doc).encode('utf-8')).hexdigest() for doc in documents]
+
+    def _settings(self):
+        """결과에 영향을 주는 설정 (바뀌면 다시 학습)"""
+        return {'num_topics': self.num_topics, 'passes': self.passes, 'chunksize': self.chunksize,
+                'random_state': self.random_state}
+
+    def _load_meta(self):
+        try:
+            with open(self._path(self.META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _has_saved_model(self):
+        return all(os.path.exists(self._path(name))
+                   for name in [self.MODEL_FILE, self.DICTIONARY_FILE, self.CORPUS_FILE, self.META_FILE])
+
+    def _bow_stream(self, documents, dictionary, grow):
+        """문서별 bag-of-words 생성기 (grow=True이면 사전에 새 단어 추가)"""
+        for doc in documents:
+            yield dictionary.doc2bow(self.tokenize(doc), allow_update=grow)
+
+    def _serialize_corpus(self, documents, dictionary, grow):
+        """토큰화 결과를 바로 MmCorpus 파일에 기록 (문서 순서 = 코퍼스 행 순서)"""
+        path = self._path(self.CORPUS_FILE)
+        corpora.MmCorpus.serialize(path, self._bow_stream(documents, dictionary, grow), id2word=dictionary)
+        return corpora.MmCorpus(path)
+
+    def fit(self, documents, update=False):
+        """토픽 모델 학습 (또는 저장된 모델 재사용/추가 학습)"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        doc_hashes = self._doc_hashes(documents)
+        fingerprint = hashlib.sha1(''.join(doc_hashes).encode('utf-8')).hexdigest()
+        meta = self._load_meta() if self._has_saved_model() else None
+
+        if meta and meta.get('settings') == self._settings() and meta.get('fingerprint') == fingerprint:
+            logging.info("Reusing saved LDA model from %s", self.model_dir)
+            self.model = models.LdaMulticore.load(self._path(self.MODEL_FILE))
+            self.dictionary = corpora.Dictionary.load(self._path(self.DICTIONARY_FILE))
+            self.corpus = corpora.MmCorpus(self._path(self.CORPUS_FILE))
+            return self
+
+        if update and meta and meta.get('settings', {}).get('num_topics') == self.num_topics:
+            # 기존 사전으로 전체 코퍼스를 다시 기록하고, 처음 보는 문서만 추가 학습
+            self.model = models.LdaMulticore.load(self._path(self.MODEL_FILE))
+            self.dictionary = corpora.Dictionary.load(self._path(self.DICTIONARY_FILE))
+            self.corpus = self._serialize_corpus(documents, self.dictionary, grow=False)
+            seen = set(meta.get('doc_hashes', []))
+            new_rows = [i for i, doc_hash in enumerate(doc_hashes) if doc_hash not in seen]
+            if new_rows:
+                logging.info("Updating LDA model with %d new documents", len(new_rows))
+                self.model.update([self.corpus[i] for i in new_rows])
+            seen_hashes = sorted(seen | set(doc_hashes))
+        else:
+            self.dictionary = corpora.Dictionary()
+            self.corpus = self._serialize_corpus(documents, self.dictionary, grow=True)
+            logging.info("Training LDA model (%d documents, %d terms, %d workers)",
+                         self.corpus.num_docs, len(self.dictionary), self.workers)
+            # LdaMulticore는 alpha='auto'를 지원하지 않으므로 대칭 prior 사용
+            self.model = models.LdaMulticore(
+                corpus=self.corpus,
+                id2word=self.dictionary,
+                num_topics=self.num_topics,
+                workers=self.workers,
+                passes=self.passes,
+                chunksize=self.chunksize,
+                random_state=self.random_state
+            )
+            seen_hashes = sorted(set(doc_hashes))
+
+        self.model.save(self._path(self.MODEL_FILE))
+        self.dictionary.save(self._path(self.DICTIONARY_FILE))
+        with open(self._path(self.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'settings': self._settings(), 'fingerprint': fingerprint,
+                       'num_docs': len(doc_hashes), 'doc_hashes': seen_hashes}, f)
+        return self
+
+    @classmethod
+    def load(cls, tokenize, model_dir='models/lda'):
+        """저장된 모델/사전 불러오기 (재학습 없이 새 문서 분류용)"""
+        topic_model = cls(tokenize, model_dir=model_dir)
+        topic_model.model = models.LdaMulticore.load(topic_model._path(cls.MODEL_FILE))
+        topic_model.dictionary = corpora.Dictionary.load(topic_model._path(cls.DICTIONARY_FILE))
+        topic_model.num_topics = topic_model.model.num_topics
+        return topic_model
+
+    def transform(self, documents):
+        """새 문서의 문서 × 토픽 확률 행렬 (사전에 없는 단어는 무시)"""
+        return document_topic_matrix(self.model, self._bow_stream(documents, self.dictionary, grow=False),
+                                     self.chunksize)
+
+    def topics(self, topn=10):
+        """토픽별 상위 단어와 확률"""
+        return [[(self.dictionary[term_id], prob) for term_id, prob in self.model.get_topic_terms(i, topn)]
+                for i in range(self.num_topics)]
@@ -1,4 +1,5 @@
 from src.crawler.research_institute_crawler import ResearchInstituteCrawler
+from src.pipeline.instrumentation import span
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
@@ -17,12 +18,20 @@ class BOKCrawler(ResearchInstituteCrawler):
         self.debug_dir = "debug/bok"
         os.makedirs(self.debug_dir, exist_ok=True)
     
-    def crawl_reports(self, start_page=1, end_page=10, category='research'):
-        """한국은행 연구보고서 크롤링"""
+    def crawl_reports(self, start_page=1, end_page=10, category='research', sink=None):
+        """한국은행 연구보고서 크롤링
+        
+        sink(ReportSink)가 주어지면 보고서를 메모리에 모으지 않고 한 건씩 sink에 기록하며,
+        체크포인트에서 완료하지 못한 페이지만 크롤링하고 저장된 보고서 수를 반환한다.
+        """
         reports = []
         
+        pages = range(start_page, end_page + 1)
+        if sink is not None:
+            pages = sink.pending_pages(start_page, end_page)
+        
         try:
-            for page in range(start_page, end_page + 1):
+            for page in pages:
                 # 연구보고서 페이지 URL (필요시 URL 업데이트)
                 url = f"{self.base_url}/portal/bbs/B0000217/list.do?menuNo=200761&pageIndex={page}"
                 
@@ -34,7 +43,8 @@ class BOKCrawler(ResearchInstituteCrawler):
                         logging.error("Selenium 웹드라이버가 초기화되지 않았습니다")
                         break
                     
-                    self.driver.get(url)
+                    with span('crawler.fetch.bok'):
+                        self.driver.get(url)
                     
                     # 페이지 로딩 대기 시간 증가
                     try:
@@ -130,7 +140,10 @@ class BOKCrawler(ResearchInstituteCrawler):
                                 'author': detail.get('author', '')
                             }
                             
-                            reports.append(report_data)
+                            if sink is not None:
+                                sink.write(report_data)
+                            else:
+                                reports.append(report_data)
                             logging.info(f"보고서 크롤링 성공: {title}")
                             
                             # 서버 부담 방지를 위한 지연
@@ -139,6 +152,8 @@ class BOKCrawler(ResearchInstituteCrawler):
                         except Exception as e:
                             logging.error(f"보고서 항목 처리 중 오류: {e}")
                     
+                    if sink is not None:
+                        sink.mark_page_done(page)
                     logging.info(f"BOK 페이지 {page} 완료")
                     time.sleep(3)  # 페이지 간 지연
                     
@@ -150,6 +165,11 @@ class BOKCrawler(ResearchInstituteCrawler):
         except Exception as e:
             logging.error(f"BOK 크롤링 중 오류: {e}")
             
+        if sink is not None:
+            sink.flush()
+            logging.info(f"BOK 크롤링 완료: {sink.written}개 보고서")
+            return sink.written
+        
         logging.info(f"BOK 크롤링 완료: {len(reports)}개 보고서")
         return pd.DataFrame(reports) if reports else pd.DataFrame()
     
@@ -163,7 +183,8 @@ class BOKCrawler(ResearchInstituteCrawler):
                 return detail
             
             logging.info(f"상세 정보 요청 중: {url}")
-            self.driver.get(url)
+            with span('crawler.fetch.bok'):
+                self.driver.get(url)
             
             # 페이지 로딩 대기
             time.sleep(5)
@@ -1,17 +1,38 @@
+from src.crawler.research_institute_crawler import ResearchInstituteCrawler
+from src.pipeline.instrumentation import span
+from bs4 import BeautifulSoup
+import pandas as pd
+import time
+import logging
+import os
+
 class KDICrawler(ResearchInstituteCrawler):
     def __init__(self):
         super().__init__()
-        # ... 기존 코드 ...
+        self.base_url = "https://www.kdi.re.kr"
+        self.config = {}
+        
+        # 디버깅을 위한 디렉토리 생성
+        self.debug_dir = "debug/kdi"
+        os.makedirs(self.debug_dir, exist_ok=True)
+
+    def crawl_reports(self, start_page=1, end_page=10, category='정책연구', sink=None):
+        """KDI 연구보고서 크롤링 (최신 selector 및 실시간성 강화)
 
-    def crawl_reports(self, start_page=1, end_page=10, category='정책연구'):
-        """KDI 연구보고서 크롤링 (최신 selector 및 실시간성 강화)"""
+        sink(ReportSink)가 주어지면 보고서를 메모리에 모으지 않고 한 건씩 sink에 기록하며,
+        체크포인트에서 완료하지 못한 페이지만 크롤링하고 저장된 보고서 수를 반환한다.
+        """
         reports = []
+        pages = range(start_page, end_page + 1)
+        if sink is not None:
+            pages = sink.pending_pages(start_page, end_page)
         try:
-            for page in range(start_page, end_page + 1):
+            for page in pages:
                 url = f"{self.base_url}/research/reportList?page={page}&category={category}"
                 logging.info(f"KDI 페이지 접근 중: {url}")
                 try:
-                    response = self.session.get(url, headers=self.headers, timeout=30)
+                    with span('crawler.fetch.kdi'):
+                        response = self.session.get(url, headers=self.headers, timeout=30)
                     if response.status_code != 200:
                         logging.error(f"HTTP 오류: {response.status_code}")
                         continue
@@ -68,17 +89,26 @@ class KDICrawler(ResearchInstituteCrawler):
                                 'keywords': detail.get('keywords', []),
                                 'pdf_link': detail.get('pdf_link', '')
                             }
-                            reports.append(report_data)
+                            if sink is not None:
+                                sink.write(report_data)
+                            else:
+                                reports.append(report_data)
                             logging.info(f"보고서 크롤링 성공: {title}")
                             time.sleep(2)
                         except Exception as e:
                             logging.error(f"보고서 항목 처리 중 오류: {e}")
+                    if sink is not None:
+                        sink.mark_page_done(page)
                     logging.info(f"페이지 {page} 완료")
                     time.sleep(3)
                 except Exception as e:
                     logging.error(f"페이지 {page} 처리 중 오류: {e}")
         except Exception as e:
             logging.error(f"KDI 크롤링 중 오류: {e}")
+        if sink is not None:
+            sink.flush()
+            logging.info(f"KDI 크롤링 완료: {sink.written}개 보고서")
+            return sink.written
         logging.info(f"KDI 크롤링 완료: {len(reports)}개 보고서")
         return pd.DataFrame(reports) if reports else pd.DataFrame()
 
@@ -87,7 +117,8 @@ class KDICrawler(ResearchInstituteCrawler):
         detail = {}
         try:
             logging.info(f"상세 정보 요청 중: {url}")
-            response = self.session.get(url, headers=self.headers, timeout=30)
+            with span('crawler.fetch.kdi'):
+                response = self.session.get(url, headers=self.headers, timeout=30)
             if response.status_code != 200:
                 logging.error(f"상세 페이지 HTTP 오류: {response.status_code}")
                 return detail
@@ -149,7 +180,8 @@ class KDICrawler(ResearchInstituteCrawler):
         selectors = self.config.get('kdi_selectors', [])
         for page in range(start_page, end_page + 1):
             url = f"https://www.kdi.re.kr/research/reportList?page={page}&category={category}"
-            response = self.session.get(url, headers=self.headers, timeout=30)
+            with span('crawler.fetch.kdi'):
+                response = self.session.get(url, headers=self.headers, timeout=30)
             html = response.text
             soup = BeautifulSoup(html, 'html.parser')
             report_items = []
@@ -6,6 +6,7 @@ import re
 import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from src.storage.report_sink import CSVSink
 
 class ResearchInstituteCrawler:
     def __init__(self):
@@ -40,32 +41,31 @@ class ResearchInstituteCrawler:
             logging.error(f"Selenium 웹드라이버 초기화 실패: {e}")
             self.driver = None
     
-    def save_to_csv(self, dataframe, filename):
-        """수집 데이터 CSV 저장"""
+    def save_to_csv(self, dataframe, filename, dedupe=False):
+        """수집 데이터 CSV 저장 (dedupe=True이면 앞 행과 link가 같은 행은 저장하지 않음)"""
         try:
             # 빈 데이터프레임 체크
             if dataframe is None or len(dataframe) == 0:
                 logging.warning(f"저장할 데이터가 없습니다: {filename}")
-                # 최소한의 헤더만 있는 파일 생성
+            
+            # CSV 저장도 스트리밍 저장소의 한 종류로 처리
+            with CSVSink(filename, flush_every=max(len(dataframe) if dataframe is not None else 0, 1),
+                         dedupe=dedupe) as sink:
                 if dataframe is not None:
-                    dataframe.to_csv(filename, index=False, encoding='utf-8-sig')
-                else:
-                    pd.DataFrame(columns=['title', 'author', 'date', 'link', 'abstract', 'pdf_link']).to_csv(
-                        filename, index=False, encoding='utf-8-sig')
-                return
+                    sink.columns = list(dataframe.columns) or None
+                    sink.write_many(dataframe.to_dict('records'))
             
-            dataframe.to_csv(filename, index=False, encoding='utf-8-sig')
-            logging.info(f"{len(dataframe)}개 항목이 {filename}에 저장되었습니다")
+            if sink.written:
+                logging.info(f"{sink.written}개 항목이 {filename}에 저장되었습니다")
         except Exception as e:
             logging.error(f"CSV 저장 오류: {e}")
     
-    def save_to_database(self, dataframe, table_name):
-        """데이터베이스에 저장"""
-        from sqlalchemy import create_engine
+    def save_to_database(self, dataframe, table_name, db_url=None):
+        """데이터베이스에 저장 (link 기준 upsert, db_url이 없으면 research_data.db)"""
+        from src.storage.database import ReportDatabase, DEFAULT_DB_URL
         
         try:
-            engine = create_engine('sqlite:///research_data.db')
-            dataframe.to_sql(table_name, engine, if_exists='append', index=False)
+            ReportDatabase(db_url or DEFAULT_DB_URL).upsert_dataframe(dataframe, table_name)
             logging.info(f"데이터가 {table_name} 테이블에 저장되었습니다")
         
         except Exception as e:
@@ -0,0 +1,203 @@
+import os
+import io
+import json
+import time
+import pstats
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_MODES = ['cprofile', 'tracemalloc']
+
+# 동시에 실행 중인 tracemalloc 프로파일 수 (마지막 프로파일이 끝날 때 추적 중지)
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+class Metrics:
+    """구간(span) 이름별 호출 수, 소요 시간, 처리 건수 누적 (스레드 안전)
+
+    프로세스 단위로 집계하므로 멀티 워커 서버에서는 워커마다 따로 집계된다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.spans = {}
+        self.gauges = {}
+
+    def record(self, name, seconds, count=None):
+        """구간 한 번의 소요 시간(초)과 처리 건수 반영"""
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'items': 0}
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            if count:
+                stats['items'] += int(count)
+
+    def set_gauge(self, name, value):
+        """마지막 값만 남기는 지표 (예: 단계별 최대 메모리)"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def reset(self):
+        with self.lock:
+            self.spans = {}
+            self.gauges = {}
+
+    def snapshot(self):
+        """구간별 집계와 처리량(건/초)"""
+        with self.lock:
+            spans = {name: dict(stats) for name, stats in self.spans.items()}
+            gauges = dict(self.gauges)
+        for stats in spans.values():
+            stats['mean_seconds'] = stats['seconds'] / stats['calls']
+            throughput = stats['items'] / stats['seconds'] if stats['items'] and stats['seconds'] else None
+            stats['items_per_second'] = throughput
+        return {'started_at': self.started_at, 'spans': spans, 'gauges': gauges}
+
+    def write_json(self, path):
+        """집계를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        snapshot = self.snapshot()
+        snapshot['written_at'] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def prometheus_text(self, prefix='policy'):
+        """Prometheus 텍스트 형식 (구간 이름은 span 레이블)"""
+        snapshot = self.snapshot()
+        metrics = [
+            ('span_calls_total', 'counter', 'Number of completed spans', 'calls'),
+            ('span_seconds_total', 'counter', 'Total time spent in spans', 'seconds'),
+            ('span_max_seconds', 'gauge', 'Slowest single span', 'max_seconds'),
+            ('span_items_total', 'counter', 'Items processed in spans', 'items'),
+        ]
+        lines = []
+        for metric, kind, description, key in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, stats in sorted(snapshot['spans'].items()):
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}{{span="{label}"}} {stats[key]}')
+        for name, value in sorted(snapshot['gauges'].items()):
+            metric = ''.join(char if char.isalnum() else '_' for char in name)
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            lines.append(f"{prefix}_{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 전역 집계
+METRICS = Metrics()
+
+
+class Span:
+    """구간 소요 시간 측정 (with 블록 안에서 span.count로 처리 건수를 나중에 지정할 수 있음)"""
+
+    __slots__ = ('name', 'count', 'metrics', 'start')
+
+    def __init__(self, name, count=None, metrics=None):
+        self.name = name
+        self.count = count
+        self.metrics = metrics or METRICS
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.name, time.perf_counter() - self.start, self.count)
+        return False
+
+
+def span(name, count=None, metrics=None):
+    """with span('search.query'): ... 형태의 측정 구간"""
+    return Span(name, count=count, metrics=metrics)
+
+
+def timed(name, count=None):
+    """함수 호출 전체를 하나의 구간으로 측정하는 데코레이터 (count가 있으면 count(반환값)을 처리 건수로 기록)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(name) as current:
+                result = func(*args, **kwargs)
+                if count is not None:
+                    current.count = count(result)
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile(name, mode=None, output_dir='profiles', metrics=None):
+    """단계 하나를 cProfile 또는 tracemalloc으로 프로파일링 (mode가 None이면 아무것도 하지 않음)
+
+    - cprofile: output_dir/<name>.prof (pstats/snakeviz로 열기)와 누적 시간 상위 함수 요약(.txt) 저장
+    - tracemalloc: 구간 최대 메모리를 지표 <name>.peak_bytes로 남기고 할당 상위 위치를 .tracemalloc.txt로 저장
+      (tracemalloc은 프로세스 전역이므로 동시에 실행되는 단계의 할당도 함께 잡힌다)
+    """
+    if mode is None:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+    metrics = metrics or METRICS
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, name)
+
+    if mode == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # 다른 스레드에서 이미 프로파일러가 동작 중인 경우
+            logging.warning(f"cProfile unavailable for '{name}': {e}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{base_path}.prof")
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(30)
+            with open(f"{base_path}.txt", 'w', encoding='utf-8') as f:
+                f.write(summary.getvalue())
+            logging.info(f"Saved profile to {base_path}.prof")
+        return
+
+    import tracemalloc
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        with _tracemalloc_lock:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+        metrics.set_gauge(f"{name}.peak_bytes", peak)
+        with open(f"{base_path}.tracemalloc.txt", 'w', encoding='utf-8') as f:
+            f.write(f"peak: {peak} bytes\n")
+            for stat in snapshot.statistics('lineno')[:30]:
+                f.write(f"{stat}\n")
+        logging.info(f"Peak traced memory for '{name}': {peak / 1024 / 1024:.1f}MB")
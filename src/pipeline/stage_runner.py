@@ -0,0 +1,217 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.pipeline.instrumentation import profile, span
+
+
+class Stage:
+    """파이프라인 단계 정의
+
+    - inputs/outputs: 단계가 읽고 쓰는 파일(또는 디렉토리) 경로
+    - depends_on: 먼저 실행되어야 하는 단계 이름
+    - params: 결과에 영향을 주는 설정값 (바뀌면 다시 실행)
+    - always_run: 입력 지문과 무관하게 항상 실행 (예: 외부 사이트 크롤링)
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), depends_on=(), params=None, always_run=False):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+        self.params = params or {}
+        self.always_run = always_run
+
+
+class StageRunner:
+    """입력 지문 기반으로 변경된 단계만 실행하는 DAG 실행기
+
+    각 단계의 입력 파일 내용 해시와 params로 지문을 만들고, 이전 실행의 지문과 같고
+    출력 파일도 그대로 남아 있으면 단계를 건너뛴다. 의존 관계가 없는 단계는 병렬로 실행한다.
+    실행한 단계의 소요 시간은 'stage.<이름>' 구간으로 기록되며, profile_mode('cprofile' | 'tracemalloc')를
+    주면 단계별 프로파일을 profile_dir에 저장한다.
+    """
+
+    def __init__(self, state_path='data/pipeline_state.json', max_workers=2, profile_mode=None,
+                 profile_dir='profiles'):
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.profile_mode = profile_mode
+        self.profile_dir = profile_dir
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.state = self._load_state()
+
+    def add_stage(self, stage):
+        """단계 등록"""
+        self.stages[stage.name] = stage
+        return stage
+
+    def _load_state(self):
+        """이전 실행 상태 로드"""
+        if not os.path.exists(self.state_path):
+            return {'stages': {}, 'digests': {}}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            state.setdefault('stages', {})
+            state.setdefault('digests', {})
+            return state
+        except Exception as e:
+            logging.error(f"Failed to load pipeline state: {e}")
+            return {'stages': {}, 'digests': {}}
+
+    def _save_state(self):
+        """실행 상태 저장 (임시 파일에 쓴 뒤 교체)"""
+        dir_path = os.path.dirname(self.state_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _file_digest(self, path):
+        """파일 내용 해시 (크기/수정시각이 같으면 캐시된 값 재사용)"""
+        stat = os.stat(path)
+        key = [stat.st_size, stat.st_mtime_ns]
+        with self.lock:
+            cached = self.state['digests'].get(path)
+        if cached and cached[:2] == key:
+            return cached[2]
+
+        hasher = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        with self.lock:
+            self.state['digests'][path] = key + [digest]
+        return digest
+
+    def fingerprint_path(self, path):
+        """경로의 내용 지문 (없으면 None, 디렉토리는 하위 파일 전체)"""
+        if not os.path.exists(path):
+            return None
+        if os.path.isfile(path):
+            return self._file_digest(path)
+
+        hasher = hashlib.sha1()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                hasher.update(os.path.relpath(file_path, path).encode('utf-8'))
+                hasher.update(self._file_digest(file_path).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def prune_digests(self):
+        """등록된 단계의 입출력 경로(디렉토리는 하위 파일)가 아니거나 이미 없는 파일의 해시 캐시 삭제"""
+        paths = {path for stage in self.stages.values() for path in stage.inputs + stage.outputs}
+        prefixes = tuple(path.rstrip(os.sep) + os.sep for path in paths)
+        with self.lock:
+            digests = self.state['digests']
+            stale = [path for path in digests
+                     if (path not in paths and not path.startswith(prefixes)) or not os.path.exists(path)]
+            for path in stale:
+                del digests[path]
+        return len(stale)
+
+    def stage_fingerprint(self, stage):
+        """입력 지문과 설정값을 합친 단계 지문"""
+        payload = {
+            'inputs': {path: self.fingerprint_path(path) for path in stage.inputs},
+            'params': stage.params,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def is_up_to_date(self, stage, fingerprint):
+        """이전 실행과 입력/설정/출력이 모두 같은지 확인"""
+        if stage.always_run:
+            return False
+        with self.lock:
+            previous = self.state['stages'].get(stage.name)
+        if not previous or previous.get('fingerprint') != fingerprint:
+            return False
+        for path, digest in previous.get('outputs', {}).items():
+            if self.fingerprint_path(path) != digest:
+                return False
+        return True
+
+    def _run_stage(self, stage, args, force):
+        """단계 하나 실행 (최신이면 건너뜀), 실행 여부 반환"""
+        fingerprint = self.stage_fingerprint(stage)
+        if not force and self.is_up_to_date(stage, fingerprint):
+            logging.info(f"Stage '{stage.name}' is up to date, skipping")
+            return False
+
+        logging.info(f"Running stage '{stage.name}'")
+        with span(f"stage.{stage.name}"), profile(f"stage.{stage.name}", self.profile_mode, self.profile_dir):
+            stage.func(args)
+
+        outputs = {path: self.fingerprint_path(path) for path in stage.outputs}
+        # 입력이 단계 실행 중에 바뀌는 경우(예: 크롤링)를 위해 실행 후 다시 계산
+        fingerprint = self.stage_fingerprint(stage)
+        with self.lock:
+            self.state['stages'][stage.name] = {
+                'fingerprint': fingerprint,
+                'outputs': outputs,
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save_state()
+        logging.info(f"Finished stage '{stage.name}'")
+        return True
+
+    def run(self, stage_names, args, force=False):
+        """선택된 단계를 의존 순서대로 실행
+
+        선택되지 않은 단계에 대한 의존은 무시한다 (이미 만들어진 산출물을 사용).
+        반환값: {단계 이름: 'ran' | 'skipped' | 'failed' | 'blocked'}
+        """
+        selected = [name for name in stage_names if name in self.stages]
+        pending = {
+            name: {dep for dep in self.stages[name].depends_on if dep in selected}
+            for name in selected
+        }
+        results = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 실패한 단계에 의존하는 단계는 실행하지 않음
+                for name, deps in list(pending.items()):
+                    if any(results.get(dep) in ('failed', 'blocked') for dep in deps):
+                        logging.warning(f"Stage '{name}' blocked by failed dependency")
+                        results[name] = 'blocked'
+                        del pending[name]
+
+                ready = [name for name, deps in pending.items() if all(dep in results for dep in deps)]
+                for name in ready:
+                    del pending[name]
+                    running[executor.submit(self._run_stage, self.stages[name], args, force)] = name
+
+                if not running:
+                    if pending:
+                        raise ValueError(f"Cyclic stage dependencies: {sorted(pending)}")
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = 'ran' if future.result() else 'skipped'
+                    except Exception as e:
+                        logging.error(f"Stage '{name}' failed: {e}", exc_info=True)
+                        results[name] = 'failed'
+
+        # 삭제/이름이 바뀐 파일(예: 지워진 분석 큐브 조각)의 해시가 상태 파일에 계속 쌓이지 않도록 정리
+        if self.prune_digests():
+            with self.lock:
+                self._save_state()
+        return results
@@ -0,0 +1,135 @@
+import re
+import zlib
+import logging
+import numpy as np
+from src.pipeline.instrumentation import span
+
+WORD = re.compile(r"\w+")
+
+# 해시 계산용 메르센 소수 (2^31 - 1): 계수와 해시값이 모두 이보다 작으므로 int64 곱셈이 넘치지 않음
+PRIME = (1 << 31) - 1
+SHINGLE_BASE = 1000003
+
+
+class MinHasher:
+    """단어 n-gram(shingle) 집합의 MinHash 서명
+
+    - 어절을 소문자 단어로 나누고 연속 shingle_size개 단어를 하나의 shingle로 해시한다
+    - num_perm개의 해시 함수 (a * x + b) mod PRIME의 최솟값이 서명이며,
+      두 서명의 값이 같은 비율이 shingle 집합의 Jaccard 유사도 추정치가 된다
+    """
+
+    def __init__(self, num_perm=128, shingle_size=5, min_tokens=50, seed=42, chunk_size=4096):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.min_tokens = min_tokens
+        self.chunk_size = chunk_size
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, size=num_perm, dtype=np.int64)
+        self.b = rng.integers(0, PRIME, size=num_perm, dtype=np.int64)
+
+    def shingles(self, words):
+        """단어 목록의 shingle 해시값 배열 (중복 제거)"""
+        # 같은 단어는 한 번만 해시
+        word_hashes = {word: zlib.crc32(word.encode('utf-8')) % PRIME for word in set(words)}
+        tokens = np.fromiter((word_hashes[word] for word in words), dtype=np.int64, count=len(words))
+        count = len(tokens) - self.shingle_size + 1
+        hashes = np.zeros(count, dtype=np.int64)
+        for offset in range(self.shingle_size):
+            hashes = (hashes * SHINGLE_BASE + tokens[offset:offset + count]) % PRIME
+        return np.unique(hashes)
+
+    def signature(self, text):
+        """서명 배열 (단어 수가 min_tokens보다 적어 비교할 수 없는 문서는 None)"""
+        words = WORD.findall(text.lower()) if isinstance(text, str) else []
+        if len(words) < max(self.min_tokens, self.shingle_size):
+            return None
+        shingles = self.shingles(words)
+        signature = np.full(self.num_perm, PRIME, dtype=np.int64)
+        # 해시 함수 수 × shingle 수 행렬이 커지지 않도록 나눠서 최솟값 갱신
+        for start in range(0, len(shingles), self.chunk_size):
+            chunk = shingles[start:start + self.chunk_size]
+            values = (self.a[:, None] * chunk[None, :] + self.b[:, None]) % PRIME
+            np.minimum(signature, values.min(axis=1), out=signature)
+        return signature
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH 밴딩으로 거의 같은 문서 묶음 찾기
+
+    - 서명을 bands개 구간으로 나누고 한 구간이라도 같은 문서 쌍만 후보로 본다
+      (구간당 num_perm / bands개 값이 모두 같아야 하므로 유사도가 낮은 쌍은 거의 후보가 되지 않음)
+    - 후보 쌍은 서명 일치 비율(추정 Jaccard)이 threshold 이상일 때만 같은 묶음으로 합친다
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, shingle_size=5, min_tokens=50, seed=42):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size, min_tokens=min_tokens, seed=seed)
+
+    def clusters(self, texts):
+        """중복 묶음 목록 (묶음마다 문서 위치 목록, 문서가 둘 이상인 묶음만)"""
+        with span('process.dedup', count=len(texts)):
+            signatures = [self.hasher.signature(text) for text in texts]
+            positions = [i for i, signature in enumerate(signatures) if signature is not None]
+            if len(positions) < 2:
+                return []
+            matrix = np.vstack([signatures[i] for i in positions])
+
+            parent = list(range(len(positions)))
+
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            for band in range(self.bands):
+                buckets = {}
+                for row, values in enumerate(matrix[:, band * self.rows:(band + 1) * self.rows]):
+                    buckets.setdefault(values.tobytes(), []).append(row)
+                for members in buckets.values():
+                    for i, first in enumerate(members[:-1]):
+                        others = [other for other in members[i + 1:] if find(other) != find(first)]
+                        if not others:
+                            continue
+                        similarity = (matrix[others] == matrix[first]).mean(axis=1)
+                        for other, value in zip(others, similarity):
+                            if value >= self.threshold:
+                                parent[find(other)] = find(first)
+
+            groups = {}
+            for row in range(len(positions)):
+                groups.setdefault(find(row), []).append(positions[row])
+            return [members for members in groups.values() if len(members) > 1]
+
+
+def mark_near_duplicates(data, text_column='pdf_text', key_column='link', threshold=0.8, detector=None):
+    """거의 같은 보고서에 정본 키를 표시한 데이터프레임 반환
+
+    duplicate_of 칼럼: 중복 게시본이면 정본의 key_column 값, 정본이나 중복이 없는 보고서는 None.
+    묶음의 정본은 추출 텍스트가 가장 긴 보고서 (같으면 앞쪽 행).
+    """
+    data = data.copy()
+    data['duplicate_of'] = None
+    if text_column not in data.columns or len(data) < 2:
+        return data
+    detector = detector or NearDuplicateDetector(threshold=threshold)
+    texts = data[text_column].tolist()
+    keys = data[key_column].tolist() if key_column in data.columns else list(range(len(data)))
+
+    duplicate_of = [None] * len(data)
+    clusters = detector.clusters(texts)
+    for members in clusters:
+        canonical = max(members, key=lambda i: (len(texts[i]), -i))
+        for i in members:
+            if i != canonical:
+                duplicate_of[i] = keys[canonical]
+    data['duplicate_of'] = duplicate_of
+
+    duplicates = sum(len(members) - 1 for members in clusters)
+    logging.info(f"Found {len(clusters)} near-duplicate clusters ({duplicates} duplicate reports)")
+    return data
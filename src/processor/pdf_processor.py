@@ -1,7 +1,7 @@
 import os
 import PyPDF2
 import logging
-from tika import parser
+from src.pipeline.instrumentation import span
 
 class PDFProcessor:
     def __init__(self, pdf_dir='downloads'):
@@ -17,7 +17,8 @@ class PDFProcessor:
         import requests
         
         try:
-            response = requests.get(url)
+            with span('pdf.download'):
+                response = requests.get(url)
             filepath = os.path.join(self.pdf_dir, filename)
             
             with open(filepath, 'wb') as f:
@@ -33,8 +34,9 @@ class PDFProcessor:
     def extract_text_pypdf2(self, filepath):
         """PyPDF2를 사용한 텍스트 추출 (기본)"""
         try:
-            with open(filepath, 'rb') as file:
+            with open(filepath, 'rb') as file, span('pdf.extract.pypdf2') as pages:
                 reader = PyPDF2.PdfReader(file)
+                pages.count = len(reader.pages)
                 text = ""
                 
                 for page_num in range(len(reader.pages)):
@@ -50,7 +52,10 @@ class PDFProcessor:
     def extract_text_tika(self, filepath):
         """Apache Tika를 사용한 텍스트 추출 (향상된 추출)"""
         try:
-            raw = parser.from_file(filepath)
+            # Tika(JVM 서버)는 PyPDF2 추출이 부족할 때만 로드
+            from tika import parser
+            with span('pdf.extract.tika'):
+                raw = parser.from_file(filepath)
             return raw['content'] if 'content' in raw else ""
         
         except Exception as e:
@@ -0,0 +1,125 @@
+import re
+import threading
+from collections import OrderedDict
+
+# sklearn TfidfVectorizer 기본 토큰화와 동일 (소문자 변환 + 2글자 이상 단어)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+# 단어 단위 분리 (1글자 단어 포함)
+WORD_PATTERN = re.compile(r"(?u)\w+")
+# 형태소 분석기가 버리는 영문/숫자 토큰 (GDP, 2023 등)
+ASCII_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+
+def default_analyzer(text):
+    """기본 토큰 분석기 (어절 단위)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CharNgramAnalyzer:
+    """어절 내부 문자 n-gram 분석기
+
+    "경제성장률은" → 경제, 제성, 성장, 장률, 률은, 경제성, ... 와 같이 어절을 쪼개므로
+    조사/어미가 붙은 어절도 "경제성장" 쿼리와 일치한다.
+    """
+
+    def __init__(self, ngram_range=(2, 3)):
+        self.ngram_range = ngram_range
+
+    def __call__(self, text):
+        min_n, max_n = self.ngram_range
+        tokens = []
+        for word in WORD_PATTERN.findall(text.lower()):
+            if len(word) <= min_n:
+                tokens.append(word)
+                continue
+            for n in range(min_n, min(max_n, len(word)) + 1):
+                tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+        return tokens
+
+
+class NounAnalyzer:
+    """형태소 분석 기반 명사 분석기 (TextAnalyzer.extract_nouns 재사용)
+
+    형태소 분석기(JVM)는 처음 호출될 때 생성하며, 피클에는 포함하지 않는다.
+    """
+
+    def __init__(self, min_length=2):
+        self.min_length = min_length
+        self._text_analyzer = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_text_analyzer'] = None
+        return state
+
+    def __call__(self, text):
+        if self._text_analyzer is None:
+            from src.analyzer.text_analyzer import TextAnalyzer
+            self._text_analyzer = TextAnalyzer()
+        text = text.lower()
+        nouns = [noun for noun in self._text_analyzer.extract_nouns(text) if len(noun) >= self.min_length]
+        return nouns + ASCII_PATTERN.findall(text)
+
+
+class CachedAnalyzer:
+    """쿼리 분석 결과를 LRU로 캐시하는 래퍼
+
+    같은 쿼리를 반복 검색할 때 형태소 분석(JVM 호출) 비용을 피한다.
+    """
+
+    def __init__(self, analyzer, maxsize=1024):
+        self.analyzer = analyzer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            tokens = self._cache.get(text)
+            if tokens is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return tokens
+
+        tokens = tuple(self.analyzer(text))
+
+        with self._lock:
+            self.misses += 1
+            self._cache[text] = tokens
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+ANALYZERS = {
+    'word': lambda: default_analyzer,
+    'char_ngram': CharNgramAnalyzer,
+    'noun': NounAnalyzer,
+}
+
+
+def get_analyzer(analyzer):
+    """이름('word', 'char_ngram', 'noun') 또는 호출 가능한 객체로 분석기 반환"""
+    if callable(analyzer):
+        return analyzer
+    if analyzer not in ANALYZERS:
+        raise ValueError(f"Unknown analyzer: {analyzer}")
+    return ANALYZERS[analyzer]()
@@ -0,0 +1,312 @@
+import os
+import mmap
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+
+# 파일(blob)로 내보내고 결과 표시/스니펫에 필요한 행만 읽는 대용량 텍스트 칼럼
+TEXT_COLUMNS = ('text', 'pdf_text', 'abstract')
+
+
+def _is_missing(value):
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+def _remove_temporary(path, owner_pid):
+    # fork된 워커 프로세스가 종료될 때 부모가 만든 임시 파일을 지우지 않도록 만든 프로세스에서만 삭제
+    if os.getpid() == owner_pid and os.path.exists(path):
+        os.remove(path)
+
+
+class MemoryBuffer:
+    """짧은 문자열(제목, 링크 등)을 이어 붙여 두는 메모리 버퍼"""
+
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, chunks):
+        """바이트 조각을 이어 쓰고 조각별 시작 위치 반환"""
+        lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+        starts = len(self.data) + np.cumsum(lengths) - lengths
+        self.data += b''.join(chunks)
+        return starts
+
+    def read(self, start, length):
+        return bytes(self.data[start:start + length])
+
+
+class TextBlob:
+    """대용량 텍스트를 이어 쓰는 파일 (읽기는 mmap)
+
+    읽은 페이지는 운영체제 페이지 캐시에 남으므로 --preload로 fork된 웹 워커들이 같은 메모리를 공유한다.
+    path가 없으면 임시 파일을 만들고 객체가 사라질 때 삭제한다.
+    read_only=True(저장된 인덱스의 blob)이면 쓰지 않고, base를 주면 base 뒤에 이어지는 위치로
+    새 파일에 쓴다 (저장된 파일은 save 전까지 바뀌지 않음).
+    """
+
+    def __init__(self, path=None, read_only=False, base=None):
+        self.temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='documents_', suffix='.blob')
+            os.close(fd)
+            weakref.finalize(self, _remove_temporary, path, os.getpid())
+        self.path = path
+        self.read_only = read_only
+        self.base = base
+        self.base_size = base.size if base is not None else 0
+        self.size = self.base_size + (os.path.getsize(path) if os.path.exists(path) else 0)
+        self._map = None
+
+    def __getstate__(self):
+        # 저장된 인덱스는 경로만 기록하고 불러온 쪽에서 다시 연다
+        return {'path': self.path, 'size': self.size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, temporary=False, read_only=True, base=None, base_size=0, _map=None)
+
+    def write(self, chunks):
+        """바이트 조각을 파일 끝에 이어 쓰고 조각별 시작 위치 반환"""
+        if self.read_only:
+            raise ValueError(f"Document blob {self.path} is read-only")
+        lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+        starts = self.size + np.cumsum(lengths) - lengths
+        with open(self.path, 'ab') as f:
+            f.write(b''.join(chunks))
+        self.size += int(lengths.sum())
+        # 파일 크기가 바뀌었으므로 다음 읽기 때 다시 매핑
+        self._map = None
+        return starts
+
+    def read(self, start, length):
+        if start < self.base_size:
+            return self.base.read(start, length)
+        if self._map is None:
+            if self.size == self.base_size:
+                return b''
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start -= self.base_size
+        return self._map[start:start + length]
+
+    def close(self):
+        self._map = None
+        if self.temporary:
+            _remove_temporary(self.path, os.getpid())
+        if self.base is not None:
+            self.base.close()
+
+
+class PackedStrings:
+    """문자열 칼럼 (버퍼 안 UTF-8 바이트 위치와 길이, 결측값은 길이 -1)"""
+
+    __slots__ = ('buffer', 'offsets', 'lengths')
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.offsets = np.zeros(0, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        own = self.offsets.nbytes + self.lengths.nbytes
+        return own + (len(self.buffer.data) if isinstance(self.buffer, MemoryBuffer) else 0)
+
+    def _write(self, values):
+        """문자열을 버퍼 끝에 쓰고 (시작 위치, 길이) 배열 반환"""
+        chunks = []
+        lengths = []
+        for value in values:
+            if _is_missing(value):
+                chunks.append(b'')
+                lengths.append(-1)
+            else:
+                chunk = (value if isinstance(value, str) else str(value)).encode('utf-8')
+                chunks.append(chunk)
+                lengths.append(len(chunk))
+        return self.buffer.write(chunks), np.asarray(lengths, dtype=np.int64)
+
+    def extend(self, values):
+        offsets, lengths = self._write(values)
+        self.offsets = np.concatenate([self.offsets, offsets])
+        self.lengths = np.concatenate([self.lengths, lengths])
+
+    def set(self, rows, values):
+        """행 값 교체 (새 문자열은 버퍼 끝에 쓰고 이전 바이트는 저장 때 정리)"""
+        offsets, lengths = self._write(values)
+        self.offsets[rows] = offsets
+        self.lengths[rows] = lengths
+
+    def get(self, row):
+        length = self.lengths[row]
+        if length < 0:
+            return None
+        return self.buffer.read(int(self.offsets[row]), int(length)).decode('utf-8')
+
+    def take(self, rows):
+        self.offsets = self.offsets[rows]
+        self.lengths = self.lengths[rows]
+
+    def copy_to(self, buffer):
+        """살아 있는 행의 문자열만 새 버퍼로 옮긴 사본 (삭제/교체된 문서의 바이트 정리)"""
+        packed = PackedStrings(buffer)
+        packed.extend([self.get(row) for row in range(len(self.offsets))])
+        return packed
+
+
+class DocumentStore:
+    """검색 결과 표시용 문서 저장소 (행 번호 = 검색 엔진 문서 번호)
+
+    - 숫자 칼럼은 numpy 배열, 문자열 메타데이터는 칼럼별 UTF-8 버퍼 하나와 오프셋 배열로 보관한다
+    - text_columns(본문, PDF 원문, 초록)는 blob 파일로 내보내고 결과나 스니펫에 필요한 행만 mmap으로 읽는다
+    - 문서 추가(append)와 병합 후 재정렬(take)은 오프셋 배열만 바꾸며, 지워진 바이트는 저장(save) 때 정리한다
+    """
+
+    def __init__(self, text_columns=TEXT_COLUMNS):
+        self.text_columns = set(text_columns)
+        self.columns = []
+        self.data = {}
+        self.num_docs = 0
+        self.blob = None
+
+    def __len__(self):
+        return self.num_docs
+
+    @property
+    def nbytes(self):
+        """메모리에 올라와 있는 크기 (blob 파일 제외)"""
+        return int(sum(column.nbytes for column in self.data.values()))
+
+    def _writable_blob(self):
+        """텍스트를 쓸 blob (저장된 blob을 연 상태면 그 뒤에 이어지는 임시 파일로 바꿔 원본은 그대로 둠)"""
+        if self.blob is None:
+            self.blob = TextBlob()
+        elif self.blob.read_only:
+            self.blob = TextBlob(base=self.blob)
+            for name, column in self.data.items():
+                if isinstance(column, PackedStrings) and name in self.text_columns:
+                    column.buffer = self.blob
+        return self.blob
+
+    def _new_column(self, name, series):
+        if name in self.text_columns:
+            column = PackedStrings(self._writable_blob())
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            return np.full(self.num_docs, np.nan) if self.num_docs else np.zeros(0, dtype=series.dtype)
+        elif all(isinstance(value, str) for value in series if not _is_missing(value)):
+            column = PackedStrings(MemoryBuffer())
+        else:
+            return np.full(self.num_docs, None, dtype=object)
+        column.extend([None] * self.num_docs)
+        return column
+
+    def append(self, documents):
+        """데이터프레임 행 추가 (documents의 행 순서 = 새 문서 번호 순서)"""
+        count = len(documents)
+        if self.blob is not None and self.blob.read_only:
+            self._writable_blob()
+        for name in documents.columns:
+            if name not in self.data:
+                self.columns.append(name)
+                self.data[name] = self._new_column(name, documents[name])
+        for name in self.columns:
+            column = self.data[name]
+            series = documents[name] if name in documents.columns else pd.Series([None] * count, dtype=object)
+            if isinstance(column, PackedStrings):
+                column.extend(series.tolist())
+            else:
+                self.data[name] = np.concatenate([column, series.to_numpy()])
+        self.num_docs += count
+        return self
+
+    def update(self, rows, documents):
+        """기존 행의 칼럼 값 교체 (documents의 행 순서 = rows 순서, documents에 없는 칼럼은 그대로)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if self.blob is not None and self.blob.read_only:
+            self._writable_blob()
+        for name in documents.columns:
+            if name not in self.data:
+                self.columns.append(name)
+                self.data[name] = self._new_column(name, documents[name])
+            column = self.data[name]
+            if isinstance(column, PackedStrings):
+                column.set(rows, documents[name].tolist())
+            else:
+                values = documents[name].to_numpy()
+                # append와 같은 규칙으로 자료형 확장 (예: 정수 칼럼에 결측값)
+                column = column.astype(np.concatenate([column[:0], values[:0]]).dtype)
+                column[rows] = values
+                self.data[name] = column
+        return self
+
+    def take(self, rows):
+        """행 선택/재정렬 (세그먼트 병합 후 문서 번호에 맞춤)"""
+        for name, column in self.data.items():
+            if isinstance(column, PackedStrings):
+                column.take(rows)
+            else:
+                self.data[name] = column[rows]
+        self.num_docs = len(rows)
+        return self
+
+    def values(self, name, rows):
+        """칼럼 값 목록 (결측값은 None, numpy 값은 파이썬 기본형)"""
+        column = self.data.get(name)
+        rows = np.asarray(rows, dtype=np.int64)
+        if column is None:
+            return [None] * len(rows)
+        if isinstance(column, PackedStrings):
+            return [column.get(row) for row in rows.tolist()]
+        return [None if _is_missing(value) else value for value in column[rows].tolist()]
+
+    def column(self, name):
+        """칼럼 전체 값 배열 (대용량 텍스트 칼럼은 파일 전체를 읽으므로 색인 동기화 등에만 사용)"""
+        return np.asarray(self.values(name, np.arange(self.num_docs)), dtype=object)
+
+    def text(self, name, row):
+        """텍스트 한 건 (결측값은 빈 문자열)"""
+        column = self.data.get(name)
+        if not isinstance(column, PackedStrings):
+            return ''
+        return column.get(int(row)) or ''
+
+    def frame(self, columns=None):
+        """선택한 칼럼의 데이터프레임 (없는 칼럼은 제외)"""
+        columns = [name for name in (columns or self.columns) if name in self.data]
+        return pd.DataFrame({name: self.column(name) for name in columns}, columns=columns)
+
+    def save(self, blob_path):
+        """텍스트 칼럼을 blob_path로 정리해 쓰고 그 파일을 다시 엶 (메타데이터는 인덱스 파일에 함께 pickle)"""
+        tmp_path = f"{blob_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        blob = TextBlob(tmp_path)
+        compacted = {}
+        for name, column in self.data.items():
+            if isinstance(column, PackedStrings):
+                buffer = blob if name in self.text_columns else MemoryBuffer()
+                compacted[name] = column.copy_to(buffer)
+        os.replace(tmp_path, blob_path)
+        self.close()
+        self.data.update(compacted)
+        self.open(blob_path)
+        return blob_path
+
+    def open(self, blob_path):
+        """저장된 blob 파일 연결 (인덱스 파일을 불러온 뒤 호출, 저장 당시와 크기가 다르면 ValueError)"""
+        expected = self.blob.size if self.blob is not None else None
+        self.blob = TextBlob(blob_path, read_only=True)
+        if expected is not None and self.blob.size != expected:
+            raise ValueError(f"Document blob {blob_path} has {self.blob.size} bytes, expected {expected}")
+        for name, column in self.data.items():
+            if isinstance(column, PackedStrings) and name in self.text_columns:
+                column.buffer = self.blob
+        return self
+
+    def close(self):
+        """임시 blob 파일 정리"""
+        if self.blob is not None:
+            self.blob.close()
+            self.blob = None
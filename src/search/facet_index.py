@@ -0,0 +1,150 @@
+import re
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# 패싯 칼럼과 다중 값 구분자 정규식 (keywords는 분석 단계/크롤러가 쓰는 "금리, 물가" 형식과
+# 예전 "경제성장#전망#GDP" 형식 모두 허용, 각 값의 앞뒤 공백은 facet_value에서 제거)
+FACET_COLUMNS = {'source': None, 'main_topic': None, 'keywords': r'[,#]'}
+
+
+def facet_value(value):
+    """패싯 값 정규화 (결측값은 None, 정수형 실수는 정수 문자열)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+class FacetIndex:
+    """패싯(출처, 주제, 키워드)별 문서 집합 인덱스
+
+    - 패싯마다 문서 × 값 희소 소속 행렬을 인덱싱 시점에 만들어 두고
+      값별 문서 번호 목록(CSC 열)으로 필터 마스크를, 행렬-벡터 곱으로 값별 문서 수를 계산한다
+    - 행 순서는 검색 엔진의 문서 번호와 같으며, 문서 추가(append)와 병합(take)을 따라간다
+    """
+
+    def __init__(self, columns=None):
+        self.columns = dict(FACET_COLUMNS if columns is None else columns)
+        self.values = {name: [] for name in self.columns}
+        self.value_ids = {name: {} for name in self.columns}
+        self.membership = {name: sp.csr_matrix((0, 0), dtype=np.int32) for name in self.columns}
+        self._postings = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_postings'] = {}
+        return state
+
+    @property
+    def num_docs(self):
+        return next(iter(self.membership.values())).shape[0] if self.membership else 0
+
+    def _rows(self, name, series):
+        """칼럼 값을 문서 × 값 소속 행렬로 변환 (새 값은 어휘에 추가)"""
+        separator = re.compile(self.columns[name]) if self.columns[name] else None
+        value_ids = self.value_ids[name]
+        indptr = [0]
+        indices = []
+        for raw in series:
+            if isinstance(raw, (list, tuple, np.ndarray)):
+                parts = list(raw)
+            elif separator is not None and isinstance(raw, str):
+                parts = separator.split(raw)
+            else:
+                parts = [raw]
+            ids = set()
+            for part in parts:
+                value = facet_value(part)
+                if value is None:
+                    continue
+                if value not in value_ids:
+                    value_ids[value] = len(self.values[name])
+                    self.values[name].append(value)
+                ids.add(value_ids[value])
+            indices.extend(sorted(ids))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        return sp.csr_matrix((data, indices, indptr), shape=(len(series), len(self.values[name])))
+
+    def append(self, documents):
+        """문서 행 추가 (documents의 행 순서 = 새 문서 번호 순서)"""
+        for name in self.columns:
+            series = documents[name] if name in documents.columns else pd.Series([None] * len(documents))
+            rows = self._rows(name, series)
+            current = self.membership[name]
+            width = len(self.values[name])
+            current = sp.csr_matrix((current.data, current.indices, current.indptr), shape=(current.shape[0], width))
+            self.membership[name] = sp.vstack([current, rows], format='csr')
+        self._postings = {}
+        return self
+
+    def update(self, rows, documents):
+        """기존 문서 행의 패싯 값 교체 (documents의 행 순서 = rows 순서)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        for name in self.columns:
+            if name not in documents.columns:
+                continue
+            updated = self._rows(name, documents[name])
+            current = self.membership[name]
+            width = len(self.values[name])
+            current = sp.csr_matrix((current.data, current.indices, current.indptr), shape=(current.shape[0], width))
+            # 바뀐 행은 뒤에 붙인 새 행을 가리키도록 재배열
+            order = np.arange(current.shape[0])
+            order[rows] = current.shape[0] + np.arange(len(rows))
+            self.membership[name] = sp.vstack([current, updated], format='csr')[order]
+        self._postings = {}
+        return self
+
+    def take(self, rows):
+        """행 선택/재정렬 (세그먼트 병합 후 문서 번호에 맞춤)"""
+        for name in self.columns:
+            self.membership[name] = self.membership[name][rows]
+        self._postings = {}
+        return self
+
+    def _posting(self, name):
+        """값별 문서 번호 목록 (CSC)"""
+        if name not in self._postings:
+            self._postings[name] = self.membership[name].tocsc()
+        return self._postings[name]
+
+    def mask(self, filters):
+        """필터 조건에 맞는 문서 마스크 (패싯 안에서는 OR, 패싯 사이에는 AND) - 조건이 없으면 None"""
+        result = None
+        for name, selected in (filters or {}).items():
+            if name not in self.columns or selected in (None, '', []):
+                continue
+            if isinstance(selected, str):
+                selected = [selected]
+            facet_mask = np.zeros(self.num_docs, dtype=bool)
+            posting = self._posting(name)
+            for value in selected:
+                value_id = self.value_ids[name].get(facet_value(value))
+                if value_id is not None:
+                    facet_mask[posting.indices[posting.indptr[value_id]:posting.indptr[value_id + 1]]] = True
+            result = facet_mask if result is None else result & facet_mask
+        return result
+
+    def counts(self, doc_mask, top=20):
+        """마스크에 포함된 문서의 패싯 값별 문서 수 (많은 순, 0건 제외)"""
+        weights = np.asarray(doc_mask, dtype=np.int32)
+        result = {}
+        for name in self.columns:
+            membership = self.membership[name]
+            if membership.shape[1] == 0:
+                result[name] = []
+                continue
+            counts = membership.T @ weights
+            nonzero = np.flatnonzero(counts)
+            order = nonzero[np.lexsort((nonzero, -counts[nonzero]))][:top]
+            result[name] = [(self.values[name][i], int(counts[i])) for i in order]
+        return result
+
+    def all_values(self, name, live=None, top=None):
+        """패싯 값 목록 (live 마스크가 있으면 살아있는 문서 기준 문서 수 순)"""
+        if live is None:
+            return list(self.values[name])[:top]
+        return [value for value, _ in self.counts(live, top=top or len(self.values[name]))[name]]
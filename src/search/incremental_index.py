@@ -0,0 +1,330 @@
+import threading
+import numpy as np
+import scipy.sparse as sp
+from src.search.analyzers import CachedAnalyzer, default_analyzer
+
+
+class IndexSegment:
+    """한 번에 추가된 문서 묶음의 단어 빈도 행렬"""
+
+    def __init__(self, doc_ids, counts):
+        self.doc_ids = doc_ids          # 전역 문서 번호 (행 순서)
+        self.counts = counts            # CSR (문서 수 × 생성 시점 어휘 수)
+        self.weighted = None            # 정규화된 TF-IDF 행렬 (단어 × 문서 CSR, 지연 계산)
+        self.idf_version = -1
+        self.lengths = np.asarray(counts.sum(axis=1)).ravel()  # 문서 길이 (토큰 수)
+        self.bm25_weights = None        # BM25 단어 빈도 포화 가중치 (단어 × 문서 CSR, 지연 계산)
+        self.norm_key = None
+
+    def __getstate__(self):
+        # 파생 행렬은 저장하지 않고 로드 후 다시 계산
+        state = self.__dict__.copy()
+        state.update(weighted=None, idf_version=-1, bm25_weights=None, norm_key=None)
+        state.pop('postings', None)
+        state.pop('length_norm', None)
+        return state
+
+
+class IncrementalTfidfIndex:
+    """세그먼트 단위로 문서를 추가/삭제할 수 있는 TF-IDF 인덱스
+
+    - 새 문서는 토큰화 후 단어 빈도 행렬 세그먼트로 추가되고, 기존 문서는 다시 토큰화하지 않는다
+    - 문서 빈도(df)는 추가/삭제 시 갱신되며, 각 세그먼트의 가중치 행렬은 IDF가 바뀐 뒤 첫 조회 때
+      단어 빈도 행렬에서 다시 계산하므로 검색 점수는 전체 재구축과 같다
+    - 점수에는 살아 있는 문서 전체의 빈도 상위 max_features개 단어만 쓴다 (같은 빈도는 단어 순).
+      단어 빈도 행렬에는 모든 단어를 남겨 두므로 문서를 추가/삭제해도 재구축과 같은 단어가 선택된다
+    - 삭제는 툼스톤으로 처리하고, 세그먼트 수가 max_segments를 넘으면 병합하면서 삭제된 문서와
+      더 이상 쓰이지 않는 단어를 제거한다
+    """
+
+    def __init__(self, analyzer=default_analyzer, max_features=10000, max_segments=8, query_cache_size=1024):
+        self.analyzer = analyzer
+        # 쿼리 분석은 같은 문자열이 반복되므로 LRU 캐시 사용
+        self.query_analyzer = CachedAnalyzer(analyzer, maxsize=query_cache_size)
+        self.max_features = max_features
+        self.max_segments = max_segments
+
+        self.vocabulary = {}
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.term_totals = np.zeros(0, dtype=np.int64)   # 살아 있는 문서 전체의 단어별 빈도
+        self.links = []
+        self.link_to_id = {}
+        self.live = np.zeros(0, dtype=bool)
+        self.doc_segment = np.zeros(0, dtype=np.int64)
+        self.doc_row = np.zeros(0, dtype=np.int64)
+        self.segments = []
+        self.total_length = 0
+
+        self.version = 0
+        self._idf = None
+        self._idf_version = -1
+        self._active = None
+        self._active_version = -1
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        if 'term_totals' not in state:
+            # 단어별 빈도를 기록하지 않던 인덱스
+            self.term_totals = np.zeros(len(self.vocabulary), dtype=np.int64)
+            for segment in self.segments:
+                rows = segment.counts[self.live[segment.doc_ids]]
+                self.term_totals[:rows.shape[1]] += np.asarray(rows.sum(axis=0)).ravel().astype(np.int64)
+            self._active = None
+            self._active_version = -1
+
+    @property
+    def num_docs(self):
+        """툼스톤을 포함한 전체 문서 번호 수"""
+        return len(self.links)
+
+    @property
+    def num_live(self):
+        """검색 가능한 문서 수"""
+        return int(self.live.sum())
+
+    def _count(self, texts, grow=True):
+        """텍스트 목록을 단어 빈도 CSR 행렬로 변환 (grow=True면 새 단어를 어휘에 추가, 아니면 쿼리로 취급)"""
+        analyzer = self.analyzer if grow else self.query_analyzer
+        indptr = [0]
+        indices = []
+        values = []
+        for text in texts:
+            counts = {}
+            for token in analyzer(text):
+                term_id = self.vocabulary.get(token)
+                if term_id is None:
+                    if not grow:
+                        continue
+                    term_id = len(self.vocabulary)
+                    self.vocabulary[token] = term_id
+                counts[term_id] = counts.get(term_id, 0) + 1
+            indices.extend(counts.keys())
+            values.extend(counts.values())
+            indptr.append(len(indices))
+
+        matrix = sp.csr_matrix(
+            (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self.vocabulary))
+        )
+        matrix.sort_indices()
+        return matrix
+
+    def _df_delta(self, counts):
+        """행렬에 포함된 단어별 문서 빈도"""
+        return np.bincount(counts.indices, minlength=len(self.vocabulary)).astype(np.int64)
+
+    def add(self, texts, links=None):
+        """문서 추가 (같은 링크가 이미 있으면 기존 문서를 교체), 새 문서 번호 반환"""
+        with self._lock:
+            texts = list(texts)
+            links = list(links) if links is not None else [None] * len(texts)
+            self.delete([link for link in links if link is not None])
+
+            counts = self._count(texts)
+            start = self.num_docs
+            doc_ids = np.arange(start, start + len(texts), dtype=np.int64)
+
+            grown = np.zeros(len(self.vocabulary) - len(self.doc_freq), dtype=np.int64)
+            self.doc_freq = np.concatenate([self.doc_freq, grown])
+            self.doc_freq += self._df_delta(counts)
+            self.term_totals = np.concatenate([self.term_totals, grown])
+            self.term_totals += np.asarray(counts.sum(axis=0)).ravel().astype(np.int64)
+
+            segment = IndexSegment(doc_ids, counts)
+            self.segments.append(segment)
+            self.total_length += int(segment.lengths.sum())
+            self.doc_segment = np.concatenate([self.doc_segment, np.full(len(texts), len(self.segments) - 1)])
+            self.doc_row = np.concatenate([self.doc_row, np.arange(len(texts), dtype=np.int64)])
+            self.live = np.concatenate([self.live, np.ones(len(texts), dtype=bool)])
+            for doc_id, link in zip(doc_ids, links):
+                self.links.append(link)
+                if link is not None:
+                    self.link_to_id[link] = int(doc_id)
+
+            self.version += 1
+            return doc_ids
+
+    def delete(self, links):
+        """링크에 해당하는 문서를 툼스톤 처리, 삭제된 문서 번호 반환"""
+        with self._lock:
+            deleted = []
+            for link in links:
+                doc_id = self.link_to_id.pop(link, None)
+                if doc_id is None or not self.live[doc_id]:
+                    continue
+                segment = self.segments[self.doc_segment[doc_id]]
+                row = segment.counts[self.doc_row[doc_id]]
+                self.doc_freq[row.indices] -= 1
+                self.term_totals[row.indices] -= row.data.astype(np.int64)
+                self.total_length -= int(segment.lengths[self.doc_row[doc_id]])
+                self.live[doc_id] = False
+                deleted.append(doc_id)
+            if deleted:
+                self.version += 1
+            return deleted
+
+    def active_terms(self):
+        """점수에 쓰는 단어 마스크 (전체 빈도 상위 max_features개, 같은 빈도는 단어 순으로 선택)"""
+        with self._lock:
+            if self._active_version != self.version:
+                active = self.term_totals > 0
+                if self.max_features is not None and active.sum() > self.max_features:
+                    terms = np.array(list(self.vocabulary), dtype=object)
+                    order = np.lexsort((terms, -self.term_totals))[:self.max_features]
+                    active = np.zeros(len(self.vocabulary), dtype=bool)
+                    active[order] = True
+                self._active = active
+                self._active_version = self.version
+            return self._active
+
+    @property
+    def num_features(self):
+        """점수에 쓰는 단어 수"""
+        return int(self.active_terms().sum())
+
+    def idf(self):
+        """현재 문서 빈도 기준 smooth IDF (sklearn과 동일한 식, 점수에 쓰지 않는 단어는 0)"""
+        with self._lock:
+            if self._idf_version != self.version:
+                n = self.num_live
+                self._idf = (np.log((1 + n) / (1 + self.doc_freq)) + 1) * self.active_terms()
+                self._idf_version = self.version
+            return self._idf
+
+    def _weight(self, counts, idf):
+        """단어 빈도 행렬을 l2 정규화된 TF-IDF 행렬로 변환"""
+        weighted = counts @ sp.diags(idf[:counts.shape[1]])
+        weighted = sp.csr_matrix(weighted)
+        # 점수에 쓰지 않는 단어(IDF 0)의 항목 제거
+        weighted.eliminate_zeros()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norms) @ weighted)
+
+    def segment_matrices(self):
+        """(세그먼트, 단어 × 문서 가중치 행렬) 목록 - IDF가 바뀐 세그먼트는 다시 계산
+
+        쿼리 × 단어 행렬과 바로 곱할 수 있도록 전치한 CSR로 보관한다 (검색마다 전치 변환하지 않음).
+        """
+        with self._lock:
+            idf = self.idf()
+            for segment in self.segments:
+                if segment.idf_version != self._idf_version:
+                    segment.weighted = sp.csr_matrix(self._weight(segment.counts, idf).T)
+                    segment.idf_version = self._idf_version
+            return [(segment, segment.weighted) for segment in self.segments]
+
+    def transform(self, texts):
+        """쿼리 텍스트를 l2 정규화된 TF-IDF 행렬로 변환 (어휘에 없는 단어는 무시)"""
+        with self._lock:
+            return self._weight(self._count(texts, grow=False), self.idf())
+
+    def scores(self, query_matrix):
+        """쿼리별 전체 문서 코사인 유사도 (쿼리 수 × 전체 문서 번호 수), 삭제된 문서는 -1"""
+        with self._lock:
+            result = np.zeros((query_matrix.shape[0], self.num_docs))
+            for segment, weighted in self.segment_matrices():
+                width = weighted.shape[0]
+                block = query_matrix[:, :width] @ weighted
+                result[:, segment.doc_ids] = block.toarray()
+            result[:, ~self.live] = -1.0
+            return result
+
+    def bm25_scores(self, texts, k1=1.5, b=0.75):
+        """쿼리별 BM25 점수 (쿼리 수 × 전체 문서 번호 수), 삭제된 문서는 -1
+
+        세그먼트마다 단어 × 문서 가중치 tf * (k1 + 1) / (tf + k1 * (1 - b + b * 문서 길이 / 평균 길이))를
+        미리 계산해 두고 (문서 수/길이가 바뀐 뒤 첫 조회 때 다시 계산), IDF를 곱한 쿼리 단어 빈도 행렬과의
+        희소 행렬곱 한 번으로 전체 쿼리의 점수를 계산한다.
+        """
+        with self._lock:
+            query_counts = self._count(texts, grow=False)
+            n = self.num_live
+            result = np.zeros((query_counts.shape[0], self.num_docs))
+            if n == 0:
+                return result
+
+            idf = np.log(1 + (n - self.doc_freq + 0.5) / (self.doc_freq + 0.5)) * self.active_terms()
+            query_weights = sp.csr_matrix(query_counts @ sp.diags(idf))
+            avgdl = self.total_length / n if self.total_length else 1.0
+            norm_key = (self.version, k1, b)
+
+            for segment in self.segments:
+                if segment.norm_key != norm_key:
+                    counts = segment.counts
+                    length_norm = k1 * (1 - b + b * segment.lengths / avgdl)
+                    rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+                    tf = counts.data
+                    weights = sp.csr_matrix(
+                        (tf * (k1 + 1) / (tf + length_norm[rows]), counts.indices, counts.indptr), shape=counts.shape)
+                    # 쿼리 × 단어 행렬과 바로 곱할 수 있도록 단어 × 문서 CSR로 보관
+                    segment.bm25_weights = sp.csr_matrix(weights.T)
+                    segment.norm_key = norm_key
+                width = segment.bm25_weights.shape[0]
+                block = query_weights[:, :width] @ segment.bm25_weights
+                result[:, segment.doc_ids] = block.toarray()
+
+            result[:, ~self.live] = -1.0
+            return result
+
+    def weighted_matrix(self):
+        """전체 문서의 TF-IDF 행렬 (문서 번호 순서, 삭제된 문서는 빈 행)"""
+        with self._lock:
+            width = len(self.vocabulary)
+            blocks = []
+            for segment, weighted in self.segment_matrices():
+                blocks.append(self._pad(sp.csr_matrix(weighted.T), width))
+            if not blocks:
+                return sp.csr_matrix((0, width))
+            # 세그먼트 순서 = 문서 번호 순서
+            matrix = sp.vstack(blocks, format='csr')
+            return sp.csr_matrix(sp.diags(self.live.astype(np.float64)) @ matrix)
+
+    def _pad(self, matrix, width):
+        """열 수를 현재 어휘 크기로 확장"""
+        return sp.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
+
+    def needs_merge(self):
+        """세그먼트가 너무 많은지 확인"""
+        return len(self.segments) > self.max_segments
+
+    def merge(self):
+        """모든 세그먼트를 하나로 병합하고 삭제된 문서와 쓰이지 않는 단어를 정리
+
+        반환값: 병합 후 문서 순서대로의 이전 문서 번호 배열 (외부 메타데이터 재정렬용)
+        """
+        with self._lock:
+            width = len(self.vocabulary)
+            if self.segments:
+                counts = sp.vstack([self._pad(segment.counts, width) for segment in self.segments], format='csr')
+            else:
+                counts = sp.csr_matrix((0, width))
+            keep = np.flatnonzero(self.live)
+            counts = counts[keep]
+
+            # 어휘 정리: 살아 있는 문서에 없는 단어만 제거 (점수용 상위 단어 선택은 active_terms)
+            used = np.flatnonzero(self.term_totals > 0)
+            id_to_term = {term_id: term for term, term_id in self.vocabulary.items()}
+            self.vocabulary = {id_to_term[old_id]: new_id for new_id, old_id in enumerate(used)}
+            counts = sp.csr_matrix(counts[:, used])
+            counts.sort_indices()
+
+            self.links = [self.links[doc_id] for doc_id in keep]
+            self.link_to_id = {link: i for i, link in enumerate(self.links) if link is not None}
+            self.live = np.ones(len(keep), dtype=bool)
+            self.doc_segment = np.zeros(len(keep), dtype=np.int64)
+            self.doc_row = np.arange(len(keep), dtype=np.int64)
+            self.segments = [IndexSegment(np.arange(len(keep), dtype=np.int64), counts)]
+            self.total_length = int(self.segments[0].lengths.sum())
+            self.doc_freq = self._df_delta(counts)
+            self.term_totals = self.term_totals[used]
+
+            self.version += 1
+            return keep
@@ -0,0 +1,182 @@
+import re
+import numpy as np
+from src.search.incremental_index import IncrementalTfidfIndex
+from src.search.analyzers import default_analyzer
+
+WORD_SPAN = re.compile(r"\S+")
+WHITESPACE = re.compile(r"\s+")
+
+
+def split_passages(text, passage_size=200, overlap=50):
+    """텍스트를 단어 수 기준 고정 길이 구간으로 분할, (시작, 끝) 문자 위치 목록 반환"""
+    spans = [match.span() for match in WORD_SPAN.finditer(text)]
+    if not spans:
+        return [(0, 0)]
+    step = max(passage_size - overlap, 1)
+    passages = []
+    for start in range(0, len(spans), step):
+        words = spans[start:start + passage_size]
+        passages.append((words[0][0], words[-1][1]))
+        if start + passage_size >= len(spans):
+            break
+    return passages
+
+
+class PassageIndex:
+    """긴 문서를 구간(passage) 단위로 색인하고 문서 단위 점수로 집계하는 인덱스
+
+    - 구간은 별도 IncrementalTfidfIndex에 (문서 키, 구간 번호)를 키로 저장한다
+    - 구간 원문은 데이터프레임 행으로 만들지 않고, 문서 텍스트 하나와 구간별 문자 위치 배열로 보관한다
+      (store_texts=False이면 텍스트는 보관하지 않고 snippet 호출 시 문서 저장소에서 받은 원문을 쓴다)
+    - 문서 점수는 구간 점수의 최댓값(max) 또는 합(sum)으로 집계하고, 최고 점수 구간을 스니펫으로 쓴다
+    """
+
+    # 이전에 저장된 인덱스는 문서 텍스트를 함께 보관
+    store_texts = True
+
+    def __init__(self, analyzer=default_analyzer, passage_size=200, overlap=50, max_segments=8, store_texts=True):
+        self.passage_size = passage_size
+        self.overlap = overlap
+        self.store_texts = store_texts
+        self.index = IncrementalTfidfIndex(analyzer=analyzer, max_features=None, max_segments=max_segments)
+
+        self.doc_texts = {}                             # 문서 키 -> 원문
+        self.passage_counts = {}                        # 문서 키 -> 구간 수
+        self.slot_of = {}                               # 문서 키 -> 슬롯 번호
+        self.slot_keys = []                             # 슬롯 번호 -> 문서 키
+        self.passage_slot = np.zeros(0, dtype=np.int64)  # 구간 번호 -> 슬롯 번호
+        self.passage_start = np.zeros(0, dtype=np.int64)
+        self.passage_end = np.zeros(0, dtype=np.int64)
+
+        self._doc_map = None
+        self._doc_map_key = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_doc_map=None, _doc_map_key=None)
+        return state
+
+    @property
+    def num_passages(self):
+        return self.index.num_live
+
+    def add(self, texts, doc_keys):
+        """문서 추가 (같은 키의 기존 구간은 교체)"""
+        self.delete(doc_keys)
+
+        passage_texts = []
+        passage_keys = []
+        slots = []
+        starts = []
+        ends = []
+        for text, doc_key in zip(texts, doc_keys):
+            slot = self.slot_of.get(doc_key)
+            if slot is None:
+                slot = len(self.slot_keys)
+                self.slot_of[doc_key] = slot
+                self.slot_keys.append(doc_key)
+            spans = split_passages(text, self.passage_size, self.overlap)
+            if self.store_texts:
+                self.doc_texts[doc_key] = text
+            self.passage_counts[doc_key] = len(spans)
+            for i, (start, end) in enumerate(spans):
+                passage_texts.append(text[start:end])
+                passage_keys.append((doc_key, i))
+                slots.append(slot)
+                starts.append(start)
+                ends.append(end)
+
+        self.index.add(passage_texts, passage_keys)
+        self.passage_slot = np.concatenate([self.passage_slot, np.asarray(slots, dtype=np.int64)])
+        self.passage_start = np.concatenate([self.passage_start, np.asarray(starts, dtype=np.int64)])
+        self.passage_end = np.concatenate([self.passage_end, np.asarray(ends, dtype=np.int64)])
+
+        if self.index.needs_merge():
+            self.merge()
+
+    def delete(self, doc_keys):
+        """문서의 모든 구간 삭제"""
+        passage_keys = []
+        for doc_key in doc_keys:
+            count = self.passage_counts.pop(doc_key, 0)
+            self.doc_texts.pop(doc_key, None)
+            passage_keys.extend((doc_key, i) for i in range(count))
+        if passage_keys:
+            self.index.delete(passage_keys)
+
+    def merge(self):
+        """구간 인덱스 병합 및 위치 배열 재정렬"""
+        keep = self.index.merge()
+        self.passage_slot = self.passage_slot[keep]
+        self.passage_start = self.passage_start[keep]
+        self.passage_end = self.passage_end[keep]
+
+    def _passage_docs(self, key_to_doc_id, doc_version):
+        """구간 번호 -> 상위 문서 번호 배열 (상위 인덱스가 바뀔 때만 다시 계산)"""
+        cache_key = (doc_version, self.index.version)
+        if self._doc_map_key != cache_key:
+            slot_doc = np.array([key_to_doc_id.get(key, -1) for key in self.slot_keys], dtype=np.int64)
+            self._doc_map = slot_doc[self.passage_slot] if len(slot_doc) else self.passage_slot.copy()
+            self._doc_map_key = cache_key
+        return self._doc_map
+
+    def doc_scores(self, queries, num_docs, key_to_doc_id, doc_version, ranking='tfidf', aggregation='max'):
+        """쿼리별 문서 점수와 문서별 최고 점수 구간 번호
+
+        반환값: (쿼리 수 × num_docs 점수 행렬, 같은 크기의 최고 구간 번호 행렬 - 없으면 -1)
+        구간 점수는 쿼리 전체를 한 번에 계산하고, 문서별 집계도 쿼리 반복 없이 0보다 큰 항목만으로 계산한다.
+        """
+        if ranking == 'bm25':
+            passage_scores = self.index.bm25_scores(queries)
+        elif ranking == 'tfidf':
+            passage_scores = self.index.scores(self.index.transform(queries))
+        else:
+            raise ValueError(f"Unknown ranking: {ranking}")
+
+        passage_docs = self._passage_docs(key_to_doc_id, doc_version)
+        valid = self.index.live & (passage_docs >= 0)
+        # 문서 번호(같으면 구간 번호) 순으로 정렬해 문서별 구간이 연속되도록 함
+        passage_ids = np.flatnonzero(valid)
+        passage_ids = passage_ids[np.argsort(passage_docs[passage_ids], kind='stable')]
+        docs = passage_docs[passage_ids]
+
+        scores = np.zeros((len(queries), num_docs))
+        best = np.full((len(queries), num_docs), -1, dtype=np.int64)
+        if aggregation not in ('max', 'sum'):
+            raise ValueError(f"Unknown aggregation: {aggregation}")
+        if len(passage_ids) == 0:
+            return scores, best
+
+        # 문서마다 연속된 구간 묶음의 시작 위치, 일치하는 구간이 없는 문서의 대표 구간은 첫 구간
+        starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        unique_docs = docs[starts]
+        doc_slot = np.cumsum(np.r_[False, docs[1:] != docs[:-1]])
+        best[:, unique_docs] = passage_ids[starts]
+
+        # 점수가 0보다 큰 (쿼리, 구간) 항목만 모아 전체 쿼리를 한 번에 (쿼리, 문서) 단위로 집계
+        values = passage_scores[:, passage_ids]
+        rows, positions = np.nonzero(values > 0)
+        hits = values[rows, positions]
+        cells = rows * len(unique_docs) + doc_slot[positions]
+        if aggregation == 'sum':
+            totals = np.bincount(cells, weights=hits, minlength=len(queries) * len(unique_docs))
+            scores[:, unique_docs] = totals.reshape(len(queries), len(unique_docs))
+        # (쿼리, 문서)마다 점수 내림차순, 같은 점수는 구간 번호 순으로 정렬한 첫 항목 = 최고 점수 구간
+        order = np.lexsort((positions, -hits, cells))
+        cells, first = np.unique(cells[order], return_index=True)
+        top = order[first]
+        query_rows, slots = np.divmod(cells, len(unique_docs))
+        if aggregation == 'max':
+            scores[query_rows, unique_docs[slots]] = hits[top]
+        best[query_rows, unique_docs[slots]] = passage_ids[positions[top]]
+        return scores, best
+
+    def snippet(self, passage_id, max_chars=300, text=None):
+        """구간 원문 (공백 정리, 최대 max_chars자, text는 구간이 속한 문서의 원문)"""
+        if passage_id < 0:
+            return ''
+        if text is None:
+            doc_key = self.slot_keys[self.passage_slot[passage_id]]
+            text = self.doc_texts.get(doc_key, '')
+        passage = WHITESPACE.sub(' ', text[self.passage_start[passage_id]:self.passage_end[passage_id]]).strip()
+        return passage if len(passage) <= max_chars else passage[:max_chars].rstrip() + '...'
@@ -0,0 +1,110 @@
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """캐시 키용 쿼리 정규화 (유니코드 NFC, 소문자, 공백 정리)"""
+    query = unicodedata.normalize('NFC', str(query))
+    return WHITESPACE.sub(' ', query).strip().lower()
+
+
+class QueryCache:
+    """인덱스 버전에 묶인 LRU + TTL 검색 결과 캐시
+
+    - 키: (정규화된 쿼리, top_n, 필터)
+    - 인덱스 버전이 바뀌면 저장된 결과를 모두 버린다
+    - ttl초가 지난 항목은 조회 시 만료 처리한다 (ttl=None이면 만료 없음)
+    """
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_entries'] = OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def make_key(self, query, top_n, **filters):
+        """캐시 키 생성 (값이 없는 필터는 제외, top_n=None은 전체 결과)"""
+        filter_items = tuple(sorted((name, str(value)) for name, value in filters.items() if value))
+        return (normalize_query(query), None if top_n is None else int(top_n), filter_items)
+
+    def _check_version(self, version):
+        """인덱스 버전이 바뀌었으면 캐시 비우기 (lock 안에서 호출)"""
+        if self.version != version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key, version):
+        """캐시된 결과 반환 (없거나 만료되었으면 None)"""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version):
+        """결과 저장 (가장 오래 사용되지 않은 항목부터 제거)"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """캐시 적중률 등 지표"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'index_version': self.version,
+            }
@@ -0,0 +1,118 @@
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+
+class RandomProjectionLSH:
+    """랜덤 초평면 기반 근사 최근접 이웃(LSH) 인덱스
+
+    - 임베딩을 num_bits개의 랜덤 초평면 부호로 해시하고, 같은 버킷에 들어간 문서만 후보로 본다
+    - num_tables개의 해시 테이블을 두어 한 테이블에서 놓친 이웃을 다른 테이블에서 찾는다
+    """
+
+    def __init__(self, num_bits=12, num_tables=8, seed=42):
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.seed = seed
+        self.planes = None
+        self.tables = []
+        self.signatures = None
+
+    def _hash(self, vectors):
+        """벡터별 테이블 해시값 (벡터 수 × 테이블 수)"""
+        bits = (np.einsum('nd,tdb->ntb', vectors, self.planes) > 0).astype(np.int64)
+        return bits @ (1 << np.arange(self.num_bits, dtype=np.int64))
+
+    def fit(self, vectors):
+        rng = np.random.default_rng(self.seed)
+        self.planes = rng.standard_normal((self.num_tables, vectors.shape[1], self.num_bits)).astype(np.float32)
+        self.signatures = self._hash(vectors)
+        self.tables = []
+        for t in range(self.num_tables):
+            # 해시값으로 정렬한 뒤 같은 해시값 구간을 버킷으로 사용
+            order = np.argsort(self.signatures[:, t], kind='stable')
+            values, starts = np.unique(self.signatures[order, t], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.tables.append({value: order[start:end] for value, start, end in zip(values.tolist(), starts, ends)})
+        return self
+
+    def candidates(self, row):
+        """학습된 벡터 row와 버킷을 공유하는 후보 번호"""
+        buckets = [self.tables[t][self.signatures[row, t]] for t in range(self.num_tables)]
+        return np.unique(np.concatenate(buckets))
+
+
+class RelatedIndex:
+    """관련 보고서 인덱스 (TruncatedSVD 임베딩 + LSH 후보 + 상위 k개 이웃 표)
+
+    인덱스 구축 시 모든 문서의 이웃 표를 미리 계산하므로 조회는 표를 읽기만 한다.
+    문서 키(링크)로 저장하므로 세그먼트 병합으로 문서 번호가 바뀌어도 유효하다.
+    """
+
+    def __init__(self, n_components=100, top_k=10, num_bits=12, num_tables=8, seed=42):
+        self.n_components = n_components
+        self.top_k = top_k
+        self.num_bits = num_bits
+        self.num_tables = num_tables
+        self.seed = seed
+        self.keys = []
+        self.key_to_row = {}
+        self.neighbors = np.zeros((0, top_k), dtype=np.int32)
+        self.neighbor_scores = np.zeros((0, top_k), dtype=np.float32)
+        self.explained_variance = 0.0
+        self.exact_fallbacks = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def embed(self, tfidf_matrix):
+        """TF-IDF 행렬을 l2 정규화된 저차원 임베딩으로 변환"""
+        n_components = min(self.n_components, tfidf_matrix.shape[0] - 1, tfidf_matrix.shape[1] - 1)
+        if n_components < 1:
+            return None
+        svd = TruncatedSVD(n_components=n_components, random_state=self.seed)
+        embeddings = svd.fit_transform(tfidf_matrix).astype(np.float32)
+        self.explained_variance = float(svd.explained_variance_ratio_.sum())
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def build(self, tfidf_matrix, keys):
+        """문서별 상위 top_k개 관련 문서 표 생성 (tfidf_matrix의 행과 keys는 같은 순서)"""
+        self.keys = list(keys)
+        self.key_to_row = {key: row for row, key in enumerate(self.keys)}
+        n = len(self.keys)
+        self.neighbors = np.full((n, self.top_k), -1, dtype=np.int32)
+        self.neighbor_scores = np.zeros((n, self.top_k), dtype=np.float32)
+        self.exact_fallbacks = 0
+
+        embeddings = self.embed(tfidf_matrix) if n > 1 else None
+        if embeddings is None:
+            return self
+
+        lsh = RandomProjectionLSH(self.num_bits, self.num_tables, self.seed).fit(embeddings)
+        for row in range(n):
+            candidates = lsh.candidates(row)
+            candidates = candidates[candidates != row]
+            if len(candidates) < self.top_k:
+                # 버킷이 너무 작으면 (작은 말뭉치 등) 전체 문서와 비교
+                candidates = np.delete(np.arange(n), row)
+                self.exact_fallbacks += 1
+            similarities = embeddings[candidates] @ embeddings[row]
+            k = min(self.top_k, len(candidates))
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top], kind='stable')]
+            # 유사도가 없는 문서는 관련 보고서로 보지 않음
+            top = top[similarities[top] > 1e-6]
+            k = len(top)
+            self.neighbors[row, :k] = candidates[top]
+            self.neighbor_scores[row, :k] = similarities[top]
+        return self
+
+    def related(self, key, top_k=None):
+        """문서 키의 관련 문서 (키, 유사도) 목록 - 표에 없는 문서는 빈 목록"""
+        row = self.key_to_row.get(key)
+        if row is None:
+            return []
+        top_k = min(top_k or self.top_k, self.top_k)
+        return [(self.keys[neighbor], float(score))
+                for neighbor, score in zip(self.neighbors[row, :top_k], self.neighbor_scores[row, :top_k])
+                if neighbor >= 0]
@@ -1,75 +1,328 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import pickle
 import os
+from src.storage.artifact_store import load_artifact
+from src.search.incremental_index import IncrementalTfidfIndex
+from src.search.analyzers import get_analyzer
+from src.search.query_cache import QueryCache
+from src.search.passage_index import PassageIndex
+from src.search.related_index import RelatedIndex
+from src.search.facet_index import FacetIndex
+from src.search.document_store import DocumentStore, TEXT_COLUMNS
+from src.pipeline.instrumentation import span, timed
+
+# 일괄 검색에서 한 번에 계산하는 (쿼리 수 × 문서/구간 수) 점수 행렬 크기 상한 (float64 약 32MB)
+SCORE_BLOCK_CELLS = 1 << 22
+
+def _comparable(value):
+    """동기화 비교용 값 (결측값은 None, 목록은 튜플, 정수형 실수는 정수)"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_comparable(item) for item in value)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
 
 class SearchEngine:
-    def __init__(self, data_path=None):
-        self.vectorizer = TfidfVectorizer(max_features=10000)
-        self.tfidf_matrix = None
+    def __init__(self, data_path=None, max_features=10000, max_segments=8, analyzer='word',
+                 cache_size=256, cache_ttl=300, ranking='tfidf',
+                 passages=False, passage_size=200, passage_overlap=50, aggregation='max', facets=None):
+        # analyzer: 'word'(어절), 'char_ngram'(어절 내 문자 n-gram), 'noun'(형태소 명사) 또는 호출 가능한 객체
+        self.analyzer = analyzer
+        # ranking: 'tfidf'(코사인 유사도) 또는 'bm25' - 쿼리마다 바꿀 수 있음
+        self.ranking = ranking
+        self.max_features = max_features
+        self.max_segments = max_segments
+        self.index = None
+        # 문서 메타데이터 저장소 (본문 등 대용량 텍스트는 blob 파일에 두고 필요한 행만 읽음)
         self.documents = None
+        self.text_column = 'text'
+        
+        # 구간 인덱스 설정: 긴 문서를 passage_size 단어 구간으로 나눠 색인하고 max/sum으로 집계
+        self.passages = passages
+        self.passage_size = passage_size
+        self.passage_overlap = passage_overlap
+        self.aggregation = aggregation
+        self.passage_index = None
+        self._next_row_key = 0
+        
+        # 관련 보고서 이웃 표 (build_related로 생성)
+        self.related_index = None
+        
+        # 패싯 인덱스 - facets: {칼럼: 다중 값 구분자 정규식} (None이면 source/main_topic/keywords)
+        self.facet_columns = facets
+        self.facet_index = None
+        
+        # 검색 결과 캐시 (인덱스가 바뀌면 자동 무효화)
+        self.query_cache = QueryCache(maxsize=cache_size, ttl=cache_ttl)
+        self.index_generation = 0
+        self._date_cache = None
         
         if data_path and os.path.exists(data_path):
             self.load_data(data_path)
     
-    def load_data(self, data_path):
-        """데이터 로드"""
+    @property
+    def index_version(self):
+        """인덱스 버전 (인덱스 교체 세대, 문서 추가/삭제/병합 횟수)"""
+        return (self.index_generation, self.index.version if self.index is not None else 0)
+    
+    @property
+    def tfidf_matrix(self):
+        """전체 문서의 TF-IDF 행렬 (문서 번호 순서)"""
+        return self.index.weighted_matrix() if self.index is not None else None
+    
+    def _new_index(self):
+        return IncrementalTfidfIndex(analyzer=get_analyzer(self.analyzer),
+                                     max_features=self.max_features, max_segments=self.max_segments)
+    
+    def _new_passage_index(self):
+        # 스니펫용 원문은 문서 저장소에서 읽으므로 구간 인덱스에는 보관하지 않음
+        return PassageIndex(analyzer=get_analyzer(self.analyzer), passage_size=self.passage_size,
+                            overlap=self.passage_overlap, max_segments=self.max_segments, store_texts=False)
+    
+    def _new_store(self, documents):
+        """데이터프레임으로 새 문서 저장소 생성 (이전 저장소의 임시 blob 파일은 정리)"""
+        if isinstance(self.documents, DocumentStore):
+            self.documents.close()
+        return DocumentStore(text_columns=set(TEXT_COLUMNS) | {self.text_column}).append(documents)
+    
+    @staticmethod
+    def blob_path(index_path):
+        """인덱스 파일 옆의 문서 텍스트 blob 경로 (index/search_index.pkl -> index/search_index.blob)"""
+        return os.path.splitext(index_path)[0] + '.blob'
+    
+    def _reset(self):
+        """인덱스와 문서를 모두 비움 (불러오기에 실패한 엔진이 일부만 채워진 채 남지 않도록)"""
+        if isinstance(self.documents, DocumentStore):
+            self.documents.close()
+        self.index = None
+        self.documents = None
+        self.passage_index = None
+        self.related_index = None
+        self.facet_index = None
+        self.index_generation += 1
+    
+    def load_data(self, data_path, columns=None):
+        """데이터 로드 (csv/parquet은 columns로 필요한 칼럼만 선택, 실패하면 빈 엔진으로 되돌림)"""
         try:
-            if data_path.endswith('.csv'):
-                print(f"CSV 파일 로드 시도: {data_path}")
-                self.documents = pd.read_csv(data_path)
+            if data_path.endswith('.csv') or data_path.endswith('.parquet'):
+                print(f"데이터 파일 로드 시도: {data_path}")
+                self.documents = self._new_store(load_artifact(data_path, columns=columns))
                 print(f"로드된 문서 수: {len(self.documents)}")
             elif data_path.endswith('.pkl'):
                 print(f"PKL 파일 로드 시도: {data_path}")
                 with open(data_path, 'rb') as f:
                     data = pickle.load(f)
-                    self.documents = data.get('documents')
-                    self.tfidf_matrix = data.get('tfidf_matrix')
-                    self.vectorizer = data.get('vectorizer', self.vectorizer)
+                    documents = data.get('documents')
+                    self.index = data.get('index')
+                    self.index_generation += 1
+                    self.text_column = data.get('text_column', self.text_column)
+                    self.passage_index = data.get('passage_index')
+                    self.passages = self.passage_index is not None
+                    self._next_row_key = data.get('next_row_key', 0)
+                    self.related_index = data.get('related_index')
+                    self.facet_index = data.get('facet_index')
+                # 이전 형식(vectorizer/tfidf_matrix) 인덱스는 문서 텍스트로 다시 구축
+                if (self.index is None and isinstance(documents, pd.DataFrame)
+                        and self.text_column in documents.columns):
+                    print("이전 형식의 인덱스입니다. 문서 텍스트로 인덱스를 다시 구축합니다.")
+                    self.index_documents(documents, text_column=self.text_column)
+                elif isinstance(documents, pd.DataFrame):
+                    # 데이터프레임으로 문서를 저장한 인덱스
+                    self.documents = self._new_store(documents)
+                elif documents is not None:
+                    self.documents = documents.open(self.blob_path(data_path))
+                if self.index is not None and self.documents is None:
+                    raise ValueError(f"Index file {data_path} has no documents")
+                if self.facet_index is None and self.documents is not None:
+                    facet_index = FacetIndex(self.facet_columns)
+                    self.facet_index = facet_index.append(self.documents.frame(list(facet_index.columns)))
                 print(f"PKL에서 로드된 문서 수: {len(self.documents) if self.documents is not None else 0}")
         except Exception as e:
             print(f"데이터 로드 오류: {e}")
             import traceback
             traceback.print_exc()
+            self._reset()
+    
+    def _prepare(self, documents, text_column):
+        """링크 중복 제거 및 인덱싱할 텍스트/문서 키 목록 준비
+
+        문서 키는 링크이며, 링크가 없는 행에는 엔진 안에서만 쓰는 고유 키를 부여한다.
+        """
+        if 'link' in documents.columns:
+            # 링크가 같은 행은 마지막 행만 유지 (링크 없는 행은 모두 유지)
+            duplicated = documents['link'].notna() & documents['link'].duplicated(keep='last')
+            documents = documents[~duplicated]
+            links = [link if isinstance(link, str) and link else None for link in documents['link']]
+        else:
+            links = [None] * len(documents)
+        keys = []
+        for link in links:
+            if link is None:
+                link = f"__row_{self._next_row_key}"
+                self._next_row_key += 1
+            keys.append(link)
+        documents = documents.reset_index(drop=True)
+        texts = documents[text_column].fillna('').astype(str).tolist()
+        return documents, texts, keys
     
     def index_documents(self, documents, text_column='text', title_column='title'):
-        """문서 인덱싱"""
-        self.documents = documents
-        
-        # 텍스트 전처리 - 빈 값은 빈 문자열로 변환
-        processed_texts = documents[text_column].fillna('').astype(str).tolist()
+        """문서 인덱싱 (전체 재구축)"""
+        self.text_column = text_column
+        documents, processed_texts, links = self._prepare(documents, text_column)
+        self.documents = self._new_store(documents)
         
         # 디버깅 정보
         print(f"인덱싱할 문서 수: {len(documents)}")
-        print(f"첫 번째 문서 텍스트 샘플: {processed_texts[0][:100]}...")
+        if processed_texts:
+            print(f"첫 번째 문서 텍스트 샘플: {processed_texts[0][:100]}...")
         
-        # TF-IDF 행렬 생성
-        self.tfidf_matrix = self.vectorizer.fit_transform(processed_texts)
+        # TF-IDF 인덱스 생성 (점수에는 빈도 상위 max_features개 단어만 사용)
+        self.index = self._new_index()
+        self.index_generation += 1
+        self.facet_index = FacetIndex(self.facet_columns).append(documents)
+        with span('search.index', count=len(processed_texts)):
+            self.index.add(processed_texts, links)
+            self._merge()
+        self.related_index = None
         
-        print(f"TF-IDF 행렬 크기: {self.tfidf_matrix.shape}")
-        print(f"추출된 특성 수: {len(self.vectorizer.get_feature_names_out())}")
+        if self.passages:
+            self.passage_index = self._new_passage_index()
+            with span('search.passage_index', count=len(processed_texts)):
+                self.passage_index.add(processed_texts, links)
+            print(f"색인된 구간 수: {self.passage_index.num_passages}")
+        
+        print(f"TF-IDF 행렬 크기: {(self.index.num_docs, len(self.index.vocabulary))}")
+        print(f"추출된 특성 수: {self.index.num_features}")
         print(f"인덱싱된 문서 수: {len(documents)}")
     
+    def add_documents(self, documents, text_column=None):
+        """문서 증분 추가 - 같은 링크의 기존 문서는 교체, 새 문서만 토큰화"""
+        text_column = text_column or self.text_column
+        if self.index is None:
+            self.index_documents(documents, text_column=text_column)
+            return
+        
+        documents, texts, links = self._prepare(documents, text_column)
+        with span('search.index', count=len(texts)):
+            self.index.add(texts, links)
+        if self.passage_index is not None:
+            with span('search.passage_index', count=len(texts)):
+                self.passage_index.add(texts, links)
+        if self.facet_index is None:
+            facet_index = FacetIndex(self.facet_columns)
+            self.facet_index = facet_index.append(self.documents.frame(list(facet_index.columns)))
+        self.documents.append(documents)
+        self.facet_index.append(documents)
+        
+        if self.index.needs_merge():
+            self._merge()
+        print(f"{len(documents)}개 문서 추가 (세그먼트 {len(self.index.segments)}개)")
+    
+    def delete_documents(self, links):
+        """링크 기준 문서 삭제"""
+        if self.index is None:
+            return 0
+        if isinstance(links, str):
+            links = [links]
+        deleted = self.index.delete(links)
+        if self.passage_index is not None:
+            self.passage_index.delete(links)
+        return len(deleted)
+    
+    def sync_documents(self, documents, text_column=None):
+        """새 데이터와 인덱스를 링크 기준으로 비교하여 추가/변경/삭제된 문서만 반영
+
+        텍스트가 바뀐 문서는 다시 색인하고, 텍스트는 같고 메타데이터(출처, 주제, 키워드 등)만 바뀐 문서는
+        다시 토큰화하지 않고 문서 저장소와 패싯 행만 갱신한다.
+        """
+        text_column = text_column or self.text_column
+        if (self.index is None or 'link' not in documents.columns
+                or documents['link'].isna().any() or self.documents is None
+                or text_column not in self.documents.columns):
+            # 링크로 추적할 수 없으면 전체 재구축
+            self.index_documents(documents, text_column=text_column)
+            return
+        
+        live_ids = np.flatnonzero(self.index.live)
+        indexed_texts = dict(zip(self.documents.values('link', live_ids),
+                                 (text or '' for text in self.documents.values(text_column, live_ids))))
+        new_texts = documents[text_column].fillna('').astype(str)
+        changed = np.array([link not in indexed_texts or indexed_texts[link] != text
+                            for link, text in zip(documents['link'], new_texts)], dtype=bool)
+        removed = set(indexed_texts) - set(documents['link'])
+        
+        # 텍스트가 같은 문서는 메타데이터 비교
+        meta_columns = [name for name in documents.columns if name not in ('link', text_column)]
+        indexed_meta = dict(zip(self.documents.values('link', live_ids),
+                                zip(*[map(_comparable, self.documents.values(name, live_ids))
+                                      for name in meta_columns])))
+        new_meta = zip(*[map(_comparable, documents[name].tolist()) for name in meta_columns])
+        meta_changed = np.array([not text_changed and indexed_meta.get(link) != row
+                                 for link, text_changed, row in zip(documents['link'], changed, new_meta)],
+                                dtype=bool) if meta_columns else np.zeros(len(documents), dtype=bool)
+        
+        if removed:
+            self.delete_documents(list(removed))
+        if changed.any():
+            self.add_documents(documents[changed], text_column=text_column)
+        if meta_changed.any():
+            self._update_metadata(documents[meta_changed])
+        print(f"인덱스 동기화: 추가/변경 {int(changed.sum())}개, 메타데이터 변경 {int(meta_changed.sum())}개, "
+              f"삭제 {len(removed)}개")
+    
+    def _update_metadata(self, documents):
+        """텍스트는 그대로이고 메타데이터만 바뀐 문서의 저장소/패싯 행 갱신"""
+        documents = documents.drop_duplicates('link', keep='last').reset_index(drop=True)
+        rows = [self.index.link_to_id[link] for link in documents['link']]
+        self.documents.update(rows, documents)
+        if self.facet_index is None:
+            facet_index = FacetIndex(self.facet_columns)
+            self.facet_index = facet_index.append(self.documents.frame(list(facet_index.columns)))
+        else:
+            self.facet_index.update(rows, documents)
+        # 캐시된 결과의 메타데이터/패싯 수가 바뀌었으므로 캐시 무효화
+        self.index_generation += 1
+    
+    def _merge(self):
+        """세그먼트 병합 및 삭제 문서 정리 (문서 메타데이터도 같은 순서로 재정렬)"""
+        keep = self.index.merge()
+        self.documents.take(keep)
+        if self.facet_index is not None:
+            self.facet_index.take(keep)
+    
+    def merge_segments(self):
+        """세그먼트 강제 병합"""
+        if self.index is not None:
+            self._merge()
+    
     def save_index(self, filepath):
-        """인덱스 저장"""
-        if self.tfidf_matrix is None:
+        """인덱스 저장 (문서 텍스트는 같은 이름의 .blob 파일에 저장)"""
+        if self.index is None:
             print("저장할 인덱스가 없습니다. 먼저 문서를 인덱싱하세요.")
             return
-            
+        
         data = {
             'documents': self.documents,
-            'tfidf_matrix': self.tfidf_matrix,
-            'vectorizer': self.vectorizer
+            'index': self.index,
+            'text_column': self.text_column,
+            'passage_index': self.passage_index,
+            'next_row_key': self._next_row_key,
+            'related_index': self.related_index,
+            'facet_index': self.facet_index
         }
         
         try:
             # 디렉토리 확인 및 생성
             dir_path = os.path.dirname(filepath)
-            if not os.path.exists(dir_path):
+            if dir_path and not os.path.exists(dir_path):
                 os.makedirs(dir_path)
-                
+            
+            self.documents.save(self.blob_path(filepath))
             with open(filepath, 'wb') as f:
                 pickle.dump(data, f)
             
@@ -77,52 +330,275 @@ class SearchEngine:
         except Exception as e:
             print(f"인덱스 저장 오류: {e}")
     
-    def search(self, query, top_n=10):
-        """쿼리 검색"""
-        if self.tfidf_matrix is None:
-            print("인덱싱된 문서가 없습니다. 먼저 문서를 인덱싱하세요.")
+    @timed('search.query')
+    def search(self, query, top_n=10, start_date=None, end_date=None, date_column='date', ranking=None,
+               facets=None):
+        """쿼리 검색 (같은 쿼리/결과 수/필터는 인덱스가 바뀌기 전까지 캐시된 결과 반환)
+
+        facets: {'source': 'KDI', 'keywords': ['물가', '금리']} 형식의 패싯 필터 (상위 결과 선택 전에 적용)
+        """
+        ranking = ranking or self.ranking
+        facets = self._normalize_facets(facets)
+        key = self.query_cache.make_key(query, top_n, start_date=start_date, end_date=end_date,
+                                        date_column=date_column if (start_date or end_date) else None,
+                                        ranking=ranking, facets=sorted(facets.items()))
+        version = self.index_version
+        cached = self.query_cache.get(key, version)
+        if cached is not None:
+            return [dict(result) for result in cached]
+        
+        results = self._search(query, top_n, ranking, doc_mask=self._facet_mask(facets))
+        if results is None:
+            return []
+        
+        # 날짜 필터링
+        if start_date or end_date:
+            results = self.filter_by_date(results, start_date, end_date, date_column=date_column)
+        
+        self.query_cache.put(key, results, version)
+        return [dict(result) for result in results]
+    
+    def cache_stats(self):
+        """검색 결과 캐시 지표 (적중률 등)"""
+        return self.query_cache.stats()
+    
+    def score_documents(self, queries, ranking=None):
+        """쿼리별 전체 문서 점수 행렬 (삭제된 문서는 -1)"""
+        return self._score(queries, ranking)[0]
+    
+    def _score(self, queries, ranking=None):
+        """쿼리별 문서 점수와 (구간 인덱스 사용 시) 문서별 최고 점수 구간 번호"""
+        ranking = ranking or self.ranking
+        if self.passage_index is not None:
+            scores, best = self.passage_index.doc_scores(
+                queries, self.index.num_docs, self.index.link_to_id, self.index_version,
+                ranking=ranking, aggregation=self.aggregation)
+            scores[:, ~self.index.live] = -1.0
+            return scores, best
+        if ranking == 'bm25':
+            return self.index.bm25_scores(queries), None
+        if ranking == 'tfidf':
+            return self.index.scores(self.index.transform(queries)), None
+        raise ValueError(f"Unknown ranking: {ranking}")
+    
+    def _normalize_facets(self, facets):
+        """패싯 필터 정리 (값이 없는 패싯 제외, 값 목록은 정렬된 튜플)"""
+        normalized = {}
+        for name, selected in (facets or {}).items():
+            if isinstance(selected, str):
+                selected = [selected]
+            selected = tuple(sorted(str(value) for value in (selected or []) if str(value).strip()))
+            if selected:
+                normalized[name] = selected
+        return normalized
+    
+    def _facet_mask(self, facets):
+        """패싯 필터에 맞는 문서 마스크 (필터가 없으면 None)"""
+        if not facets or self.facet_index is None:
+            return None
+        return self.facet_index.mask(facets)
+    
+    def facet_values(self, name, top=None):
+        """검색 화면 선택 목록용 패싯 값 (문서 수가 많은 순)"""
+        if self.facet_index is None or name not in self.facet_index.columns:
             return []
+        return self.facet_index.all_values(name, live=self.index.live, top=top)
+    
+    def facet_counts(self, query=None, facets=None, ranking=None, top=20):
+        """쿼리와 일치하는 (쿼리가 없으면 전체) 문서의 패싯 값별 문서 수"""
+        if self.facet_index is None or self.index is None:
+            return {}
+        ranking = ranking or self.ranking
+        facets = self._normalize_facets(facets)
+        key = self.query_cache.make_key(query or '', top, kind='facet_counts', ranking=ranking,
+                                        facets=sorted(facets.items()))
+        version = self.index_version
+        cached = self.query_cache.get(key, version)
+        if cached is not None:
+            return cached
         
-        # 쿼리 디버깅 출력
-        print(f"검색 쿼리: '{query}'")
-        print(f"검색할 문서 수: {self.tfidf_matrix.shape[0]}")
+        if query:
+            matched = self._score([query], ranking)[0][0] > 0
+        else:
+            matched = self.index.live.copy()
+        mask = self._facet_mask(facets)
+        if mask is not None:
+            matched &= mask
+        counts = self.facet_index.counts(matched, top=top)
+        self.query_cache.put(key, counts, version)
+        return counts
+    
+    def _search(self, query, top_n, ranking=None, doc_mask=None):
+        """캐시를 거치지 않는 검색 (오류 시 None)"""
+        if self.index is None or self.index.num_live == 0:
+            print("인덱싱된 문서가 없습니다. 먼저 문서를 인덱싱하세요.")
+            return None
         
         try:
-            # 쿼리 벡터화
-            query_vector = self.vectorizer.transform([query])
+            # 쿼리 점수 계산 (TF-IDF 코사인 유사도 또는 BM25, 구간 인덱스 사용 시 구간 점수 집계)
+            scores, best_passages = self._score([query], ranking)
+            similarities = scores[0]
             
-            # 코사인 유사도 계산
-            similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+            # 점수가 0보다 큰 문서 중 상위 top_n개만 부분 정렬 (점수 내림차순, 같은 점수는 문서 번호 순)
+            allowed = self.index.live & (similarities > 0)
+            if doc_mask is not None:
+                allowed &= doc_mask
+            candidates = np.flatnonzero(allowed)
+            if len(candidates) > top_n > 0:
+                candidates = candidates[np.argpartition(-similarities[candidates], top_n - 1)[:top_n]]
+            top_indices = candidates[np.lexsort((candidates, -similarities[candidates]))][:top_n]
             
-            # 디버깅: 유사도 값 분포
-            print(f"유사도 값 범위: {similarities.min():.4f} ~ {similarities.max():.4f}")
-            print(f"평균 유사도: {similarities.mean():.4f}")
+            # 결과 반환 (문서 메타데이터는 저장소에서 결과 행만 읽음)
+            results = self._to_results(top_indices, similarities[top_indices], self._result_columns())
             
-            # 유사도 기준 정렬
-            top_indices = similarities.argsort()[-top_n:][::-1]
+            # 일치한 구간 스니펫
+            if best_passages is not None:
+                self._add_snippets(results, best_passages[0])
             
-            # 결과 반환
-            results = []
-            for idx in top_indices:
-                result = {
-                    'index': idx,
-                    'score': similarities[idx]
-                }
-                
-                # 문서 메타데이터 추가
-                for col in self.documents.columns:
-                    result[col] = self.documents.iloc[idx][col]
-                
-                results.append(result)
-            
-            print(f"검색 결과 수: {len(results)}")
             return results
             
         except Exception as e:
             print(f"검색 오류: {e}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    @timed('search.batch', count=len)
+    def search_batch(self, queries, top_n=10, offset=0, start_date=None, end_date=None,
+                     date_column='date', ranking=None, columns=None, facets=None, facet_counts=False):
+        """여러 쿼리를 한 번에 검색 (페이지 단위)
+
+        - 쿼리를 희소 행렬로 변환해 세그먼트별 행렬곱으로 점수를 계산하되, 점수 행렬이 SCORE_BLOCK_CELLS를
+          넘지 않도록 쿼리를 나눠 계산한다 (쿼리가 많아도 메모리 사용량이 문서 수에 비례하는 상한 안에 머묾)
+        - 쿼리별로 점수가 0보다 큰 문서만 대상으로 상위 offset + top_n개만 부분 정렬한다
+        - 결과는 문서 저장소에서 페이지에 들어갈 행의 요청 칼럼만 읽어 만든다
+
+        반환값: 쿼리별 {'query', 'total'(일치 문서 수), 'results'} 목록
+        (facet_counts=True이면 일치 문서의 패싯 값별 문서 수 'facets' 포함)
+        """
+        if isinstance(queries, str):
+            queries = [queries]
+        queries = [str(query) for query in queries]
+        if not queries:
+            return []
+        if self.index is None or self.index.num_live == 0:
+            return [{'query': query, 'total': 0, 'results': []} for query in queries]
+        
+        # 날짜 범위 밖/패싯 밖 문서 제외 (정렬 전에 적용하므로 페이지 크기가 유지됨)
+        date_mask = self._date_mask(start_date, end_date, date_column) if start_date or end_date else None
+        facet_mask = self._facet_mask(self._normalize_facets(facets))
+        
+        columns = self._result_columns(columns)
+        
+        k = offset + top_n
+        batch = []
+        chunk_size = self._query_chunk_size()
+        for chunk_start in range(0, len(queries), chunk_size):
+            chunk = queries[chunk_start:chunk_start + chunk_size]
+            scores, best_passages = self._score(chunk, ranking)
+            if date_mask is not None:
+                scores[:, ~date_mask] = -1.0
+            if facet_mask is not None:
+                scores[:, ~facet_mask] = -1.0
+            batch.extend(self._page_results(chunk, scores, best_passages, offset, k, columns, facet_counts))
+        return batch
+    
+    def _query_chunk_size(self):
+        """점수 행렬이 SCORE_BLOCK_CELLS를 넘지 않는 쿼리 수
+
+        구간 인덱스는 구간 점수와 집계 중의 사본, 문서 점수/최고 구간 행렬까지 센다.
+        """
+        width = self.index.num_docs
+        if self.passage_index is not None:
+            width = 3 * self.passage_index.index.num_docs + 3 * self.index.num_docs
+        return max(1, SCORE_BLOCK_CELLS // max(width, 1))
+    
+    def _page_results(self, queries, scores, best_passages, offset, k, columns, facet_counts):
+        """쿼리별 점수 행에서 상위 offset ~ k번째 결과 페이지 생성"""
+        batch = []
+        for qi, query in enumerate(queries):
+            row = scores[qi]
+            matched = np.flatnonzero(row > 0)
+            if len(matched) > k:
+                matched = matched[np.argpartition(-row[matched], k - 1)[:k]]
+            # 점수 내림차순, 같은 점수는 문서 번호 순
+            order = matched[np.lexsort((matched, -row[matched]))][offset:k]
+            
+            results = self._to_results(order, row[order], columns)
+            if best_passages is not None:
+                self._add_snippets(results, best_passages[qi])
+            entry = {'query': query, 'total': int(np.count_nonzero(row > 0)), 'results': results}
+            if facet_counts and self.facet_index is not None:
+                entry['facets'] = self.facet_index.counts(row > 0)
+            batch.append(entry)
+        return batch
+    
+    def _result_columns(self, columns=None):
+        """결과에 넣을 칼럼 (지정하지 않으면 색인 본문과 PDF 원문을 뺀 전체 칼럼)"""
+        if columns is None:
+            columns = [col for col in self.documents.columns if col not in (self.text_column, 'pdf_text')]
+        return [col for col in columns if col in self.documents.columns]
+    
+    def _to_results(self, indices, scores, columns):
+        """문서 번호/점수 배열을 결과 딕셔너리 목록으로 변환 (결측값은 None)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        results = [{'index': idx, 'score': score}
+                   for idx, score in zip(indices.tolist(), np.asarray(scores).tolist())]
+        for col in columns:
+            for result, value in zip(results, self.documents.values(col, indices)):
+                result[col] = value
+        return results
+    
+    def _add_snippets(self, results, best_passages):
+        """결과별 최고 점수 구간 스니펫 (원문은 문서 저장소에서 결과 행만 읽음)"""
+        stored = self.text_column in self.documents.columns
+        for result in results:
+            text = self.documents.text(self.text_column, result['index']) if stored else None
+            result['snippet'] = self.passage_index.snippet(best_passages[result['index']], text=text)
+    
+    @timed('search.related_build')
+    def build_related(self, n_components=100, top_k=10):
+        """현재 인덱스의 TF-IDF 행렬로 관련 보고서 이웃 표 생성 (SVD 임베딩 + LSH)"""
+        if self.index is None:
+            return None
+        live_ids = np.flatnonzero(self.index.live)
+        matrix = self.index.weighted_matrix()[live_ids]
+        keys = [self.index.links[doc_id] for doc_id in live_ids]
+        self.related_index = RelatedIndex(n_components=n_components, top_k=top_k).build(matrix, keys)
+        print(f"관련 보고서 표 생성: {len(keys)}개 문서, 문서당 최대 {top_k}개")
+        return self.related_index
+    
+    def related_documents(self, link, top_n=5, columns=None):
+        """미리 계산된 이웃 표에서 관련 보고서 조회 (삭제된 문서 제외)"""
+        if self.related_index is None or self.index is None:
             return []
+        indices = []
+        scores = []
+        for key, score in self.related_index.related(link):
+            doc_id = self.index.link_to_id.get(key)
+            if doc_id is not None and self.index.live[doc_id]:
+                indices.append(doc_id)
+                scores.append(score)
+        return self._to_results(indices[:top_n], scores[:top_n], self._result_columns(columns))
+    
+    def _date_mask(self, start_date, end_date, date_column='date'):
+        """날짜 범위에 포함되는 문서 마스크 (날짜 변환은 인덱스 버전별로 한 번만 수행)"""
+        cache_key = (self.index_version, date_column)
+        if self._date_cache is None or self._date_cache[0] != cache_key:
+            if date_column in self.documents.columns:
+                dates = pd.to_datetime(pd.Series(self.documents.column(date_column)), errors='coerce')
+            else:
+                dates = pd.Series(pd.NaT, index=range(len(self.documents)))
+            self._date_cache = (cache_key, dates)
+        dates = self._date_cache[1]
+        
+        # 날짜를 변환할 수 없는 문서는 filter_by_date와 같이 제외
+        mask = dates.notna()
+        if start_date:
+            mask &= dates >= pd.to_datetime(start_date)
+        if end_date:
+            mask &= dates <= pd.to_datetime(end_date)
+        return mask.to_numpy()
     
     def keyword_search(self, keywords, top_n=10):
         """키워드 기반 검색"""
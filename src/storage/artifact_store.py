@@ -0,0 +1,94 @@
+import os
+import shutil
+import logging
+import pandas as pd
+
+# 지원하는 저장 형식 (앞쪽이 기본값)
+ARTIFACT_FORMATS = ['parquet', 'csv']
+
+# 웹앱/검색 결과 표시에 필요한 메타데이터 칼럼
+METADATA_COLUMNS = ['title', 'author', 'date', 'link', 'abstract', 'pdf_link', 'source', 'keywords']
+
+
+def artifact_path(name, fmt='parquet', data_dir='data'):
+    """단계 산출물 경로 (예: data/all_reports_analyzed.parquet)"""
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unsupported artifact format: {fmt}")
+    return os.path.join(data_dir, f"{name}.{fmt}")
+
+
+def find_artifact(name, data_dir='data'):
+    """존재하는 산출물 경로 반환 (여러 형식이 있으면 가장 최근에 기록된 것)"""
+    candidates = [artifact_path(name, fmt, data_dir) for fmt in ARTIFACT_FORMATS]
+    candidates = [path for path in candidates if os.path.exists(path)]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def _available_columns(path):
+    """Parquet 파일/데이터셋의 칼럼 목록 (데이터는 읽지 않음)"""
+    import pyarrow.dataset as ds
+    return ds.dataset(path, format='parquet').schema.names
+
+
+def load_artifact(path, columns=None):
+    """산출물 로드 - columns가 주어지면 해당 칼럼만 읽음 (없는 칼럼은 무시)
+
+    path가 확장자 없는 이름이면 data 디렉토리에서 find_artifact()로 찾는다.
+    """
+    if not os.path.splitext(path)[1]:
+        resolved = find_artifact(os.path.basename(path), os.path.dirname(path) or 'data')
+        if resolved is None:
+            raise FileNotFoundError(f"Artifact not found: {path}")
+        path = resolved
+
+    if path.endswith('.parquet'):
+        if columns is not None:
+            available = set(_available_columns(path))
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(path, columns=columns)
+
+    if path.endswith('.csv'):
+        if columns is not None:
+            wanted = set(columns)
+            return pd.read_csv(path, usecols=lambda col: col in wanted)
+        return pd.read_csv(path)
+
+    if path.endswith('.xlsx'):
+        frame = pd.read_excel(path)
+        return frame[[col for col in columns if col in frame.columns]] if columns is not None else frame
+
+    raise ValueError("Unsupported file format")
+
+
+def _normalize_for_parquet(dataframe):
+    """Parquet은 칼럼 타입이 하나여야 하므로 object 칼럼의 비문자열 값을 문자열로 변환"""
+    frame = dataframe.copy()
+    for col in frame.columns:
+        if frame[col].dtype == object:
+            frame[col] = frame[col].map(
+                lambda v: v if v is None or isinstance(v, str) or (isinstance(v, float) and v != v) else str(v))
+    return frame
+
+
+def save_artifact(dataframe, path):
+    """산출물 저장 (확장자로 형식 결정, 임시 파일에 쓴 뒤 교체)"""
+    dir_path = os.path.dirname(path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    if path.endswith('.parquet'):
+        _normalize_for_parquet(dataframe).to_parquet(tmp_path, index=False, compression='zstd')
+    elif path.endswith('.csv'):
+        dataframe.to_csv(tmp_path, index=False)
+    else:
+        raise ValueError("Unsupported file format")
+
+    # ParquetSink가 남긴 데이터셋 디렉토리가 있으면 단일 파일로 교체
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    logging.info(f"Saved {len(dataframe)} rows to {path}")
+    return path
@@ -0,0 +1,251 @@
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event, inspect, text, MetaData, Table, Column, Index, Text, Float, Integer
+from sqlalchemy.pool import StaticPool
+
+DEFAULT_DB_URL = 'sqlite:///research_data.db'
+
+# 인덱스를 생성할 칼럼 (link는 기본키, 이전 방식(to_sql)으로 만든 테이블은 고유 인덱스)
+INDEXED_COLUMNS = ['date', 'source']
+
+# 링크가 같은 행 중 마지막으로 들어간 행만 남기는 문 (방언별 행 식별자 사용)
+DEDUPLICATE_SQL = {
+    'sqlite': 'DELETE FROM "{table}" WHERE link IS NOT NULL AND rowid NOT IN '
+              '(SELECT MAX(rowid) FROM "{table}" WHERE link IS NOT NULL GROUP BY link)',
+    'postgresql': 'DELETE FROM "{table}" a USING "{table}" b WHERE a.link = b.link AND a.ctid < b.ctid',
+}
+
+# 프로세스 전체에서 공유하는 엔진 (URL별 하나)
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record):
+    """SQLite 연결마다 WAL 모드 및 동기화 수준 설정"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+
+def get_engine(db_url=DEFAULT_DB_URL):
+    """URL별로 하나만 생성되는 커넥션 풀 엔진 반환"""
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            if db_url.startswith('sqlite'):
+                kwargs = {'connect_args': {'check_same_thread': False}}
+                if db_url in ('sqlite://', 'sqlite:///:memory:'):
+                    # 메모리 DB는 모든 연결이 같은 DB를 보도록 단일 연결 사용
+                    kwargs['poolclass'] = StaticPool
+                engine = create_engine(db_url, **kwargs)
+                event.listen(engine, 'connect', _enable_sqlite_wal)
+            else:
+                engine = create_engine(db_url, pool_size=5, max_overflow=10, pool_pre_ping=True)
+            _engines[db_url] = engine
+        return engine
+
+
+class ReportDatabase:
+    """보고서 데이터의 일괄 저장/조회 계층
+
+    - 엔진은 get_engine()으로 URL당 하나만 만들어 재사용한다
+    - 저장은 batch_size 단위 트랜잭션 안에서 executemany로 수행한다
+    - link 칼럼을 키로 upsert하므로 같은 보고서를 여러 번 저장해도 중복되지 않는다
+    """
+
+    def __init__(self, db_url=DEFAULT_DB_URL, batch_size=500):
+        self.db_url = db_url
+        self.batch_size = batch_size
+        self.engine = get_engine(db_url)
+        self.metadata = MetaData()
+        self.tables = {}
+        # link에 기본키/고유 인덱스를 만들 수 없어 삭제 후 삽입으로 저장하는 테이블
+        self.no_upsert = set()
+
+    def _column_type(self, series):
+        """pandas dtype에 맞는 SQL 타입"""
+        if pd.api.types.is_bool_dtype(series):
+            return Integer
+        if pd.api.types.is_integer_dtype(series):
+            return Integer
+        if pd.api.types.is_float_dtype(series):
+            return Float
+        return Text
+
+    def _get_table(self, table_name, dataframe=None):
+        """테이블 객체 반환 (없으면 데이터프레임 스키마로 생성, 새 칼럼은 추가)"""
+        table = self.tables.get(table_name)
+        inspector = inspect(self.engine)
+
+        if table is None and inspector.has_table(table_name):
+            table = Table(table_name, self.metadata, autoload_with=self.engine)
+            table = self._ensure_indexes(table)
+            self.tables[table_name] = table
+
+        if dataframe is None:
+            return table
+
+        if table is None:
+            columns = [Column('link', Text, primary_key=True)]
+            for col in dataframe.columns:
+                if col != 'link':
+                    columns.append(Column(col, self._column_type(dataframe[col])))
+            table = Table(table_name, self.metadata, *columns)
+            for col in INDEXED_COLUMNS:
+                if col in dataframe.columns:
+                    Index(f"ix_{table_name}_{col}", table.c[col])
+            table.create(self.engine)
+            self.tables[table_name] = table
+            logging.info(f"테이블 생성: {table_name}")
+            return table
+
+        # 기존 테이블에 없는 칼럼 추가
+        missing = [col for col in dataframe.columns if col not in table.c]
+        if missing:
+            with self.engine.begin() as conn:
+                for col in missing:
+                    col_type = self._column_type(dataframe[col])
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{table_name}" ADD COLUMN "{col}" {col_type().compile(dialect=self.engine.dialect)}')
+            self.metadata.remove(table)
+            table = Table(table_name, self.metadata, autoload_with=self.engine)
+            table = self._ensure_indexes(table)
+            self.tables[table_name] = table
+            logging.info(f"{table_name} 테이블에 칼럼 추가: {missing}")
+        return table
+
+    def _ensure_indexes(self, table):
+        """기존 테이블에 upsert용 link 고유 인덱스와 조회용 칼럼 인덱스가 없으면 생성
+
+        이전 방식(to_sql)으로 만든 테이블에는 기본키가 없으므로 같은 링크의 중복 행을 지운 뒤
+        고유 인덱스를 만들고, 만들 수 없으면 그 테이블은 삭제 후 삽입 방식으로 저장한다.
+        """
+        name = table.name
+        inspector = inspect(self.engine)
+        indexes = inspector.get_indexes(name)
+        indexed = {tuple(index['column_names']) for index in indexes}
+        created = False
+
+        if 'link' in table.c:
+            unique = {tuple(index['column_names']) for index in indexes if index.get('unique')}
+            unique |= {tuple(constraint['column_names']) for constraint in inspector.get_unique_constraints(name)}
+            primary_key = tuple(inspector.get_pk_constraint(name).get('constrained_columns') or ())
+            if primary_key != ('link',) and ('link',) not in unique:
+                dedupe = DEDUPLICATE_SQL.get(self.engine.dialect.name)
+                try:
+                    if dedupe is None:
+                        raise NotImplementedError(f"no duplicate removal for {self.engine.dialect.name}")
+                    with self.engine.begin() as conn:
+                        removed = conn.exec_driver_sql(dedupe.format(table=name)).rowcount
+                        conn.execute(text(f'CREATE UNIQUE INDEX "ux_{name}_link" ON "{name}" (link)'))
+                    created = True
+                    self.no_upsert.discard(name)
+                    logging.info(f"{name} 테이블에 link 고유 인덱스 생성 (중복 행 {removed}개 삭제)")
+                except Exception as e:
+                    self.no_upsert.add(name)
+                    logging.warning(f"{name} 테이블에 link 고유 인덱스를 만들 수 없어 삭제 후 삽입으로 저장합니다: {e}")
+
+        for col in INDEXED_COLUMNS:
+            if col in table.c and (col,) not in indexed:
+                with self.engine.begin() as conn:
+                    conn.execute(text(f'CREATE INDEX IF NOT EXISTS "ix_{name}_{col}" ON "{name}" ("{col}")'))
+                created = True
+                logging.info(f"{name} 테이블에 인덱스 생성: ix_{name}_{col}")
+
+        if not created:
+            return table
+        # 새 인덱스를 반영한 테이블 객체
+        self.metadata.remove(table)
+        return Table(name, self.metadata, autoload_with=self.engine)
+
+    def _to_records(self, dataframe):
+        """DB에 넣을 수 있는 딕셔너리 목록으로 변환"""
+        frame = dataframe.copy()
+        for col in frame.columns:
+            if frame[col].dtype == object:
+                frame[col] = frame[col].map(lambda v: ', '.join(map(str, v)) if isinstance(v, (list, tuple)) else v)
+        frame = frame.astype(object).where(pd.notna(frame), None)
+        records = frame.to_dict('records')
+        for record in records:
+            for key, value in record.items():
+                if isinstance(value, np.generic):
+                    record[key] = value.item()
+        return records
+
+    def _upsert_statement(self, table, columns):
+        """방언별 upsert 문 생성 (지원하지 않으면 None)"""
+        dialect = self.engine.dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            return None
+
+        stmt = insert(table)
+        update_cols = {col: stmt.excluded[col] for col in columns if col != 'link'}
+        if not update_cols:
+            return stmt.on_conflict_do_nothing(index_elements=['link'])
+        return stmt.on_conflict_do_update(index_elements=['link'], set_=update_cols)
+
+    def upsert_dataframe(self, dataframe, table_name):
+        """link 기준 일괄 upsert"""
+        if dataframe is None or len(dataframe) == 0:
+            logging.warning(f"저장할 데이터가 없습니다: {table_name}")
+            return 0
+        if 'link' not in dataframe.columns:
+            raise ValueError("upsert에는 'link' 칼럼이 필요합니다")
+
+        # 링크 없는 행은 키가 없으므로 제외하고, 같은 링크는 마지막 행만 유지
+        frame = dataframe[dataframe['link'].notna()].drop_duplicates('link', keep='last')
+        table = self._get_table(table_name, frame)
+        records = self._to_records(frame)
+        stmt = None if table_name in self.no_upsert else self._upsert_statement(table, list(frame.columns))
+
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            with self.engine.begin() as conn:
+                if stmt is not None:
+                    conn.execute(stmt, batch)
+                else:
+                    links = [record['link'] for record in batch]
+                    conn.execute(table.delete().where(table.c.link.in_(links)))
+                    conn.execute(table.insert(), batch)
+
+        logging.info(f"{len(records)}개 항목을 {table_name} 테이블에 저장했습니다")
+        return len(records)
+
+    def delete_links(self, table_name, links):
+        """링크 목록에 해당하는 행 삭제"""
+        table = self._get_table(table_name)
+        if table is None:
+            return 0
+        links = list(links)
+        deleted = 0
+        with self.engine.begin() as conn:
+            for start in range(0, len(links), self.batch_size):
+                result = conn.execute(table.delete().where(table.c.link.in_(links[start:start + self.batch_size])))
+                deleted += result.rowcount
+        return deleted
+
+    def existing_links(self, table_name):
+        """테이블에 저장된 링크 집합"""
+        table = self._get_table(table_name)
+        if table is None:
+            return set()
+        with self.engine.connect() as conn:
+            return {row[0] for row in conn.execute(table.select().with_only_columns(table.c.link))}
+
+    def load_dataframe(self, table_name, columns=None):
+        """테이블을 데이터프레임으로 로드 (columns로 필요한 칼럼만 선택)"""
+        table = self._get_table(table_name)
+        if table is None:
+            return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+        stmt = table.select()
+        if columns:
+            stmt = stmt.with_only_columns(*[table.c[col] for col in columns])
+        with self.engine.connect() as conn:
+            return pd.read_sql(stmt, conn)
@@ -0,0 +1,216 @@
+import os
+import json
+import glob
+import shutil
+import logging
+import pandas as pd
+
+# 크롤러가 생성하는 기본 칼럼 (빈 결과에도 헤더를 유지하기 위해 사용)
+REPORT_COLUMNS = ['title', 'author', 'date', 'link', 'abstract', 'pdf_link']
+
+
+class ReportSink:
+    """크롤링 결과를 한 건씩 받아 주기적으로 기록하는 스트리밍 저장소
+
+    - write()로 받은 보고서는 버퍼에 모였다가 flush_every 건마다 파일에 추가된다
+    - mark_page_done()이 호출되면 버퍼를 비우고 체크포인트(완료한 페이지 목록)를 남긴다
+    - resume=True로 열면 완료하지 못한 페이지(실패했거나 아직 방문하지 않은 페이지)만 이어서
+      크롤링할 수 있고, 이미 저장된 링크는 다시 기록하지 않는다
+    - dedupe=False이면 링크가 같은 행도 그대로 기록한다
+    """
+
+    def __init__(self, path, flush_every=20, resume=False, checkpoint_path=None, dedupe=True):
+        self.path = path
+        self.flush_every = flush_every
+        self.dedupe = dedupe
+        self.checkpoint_path = checkpoint_path or f"{path}.checkpoint.json"
+        self.buffer = []
+        self.written = 0
+        self.columns = None
+
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        if resume:
+            self.checkpoint = self._load_checkpoint()
+            self.seen_links = self._existing_links()
+            self.written = len(self.seen_links)
+        else:
+            self._reset()
+            self.checkpoint = {}
+            self.seen_links = set()
+        self.done_pages = set(self.checkpoint.get('done_pages', []))
+        last_page = self.checkpoint.pop('last_page', None)
+        if last_page is not None and 'done_pages' not in self.checkpoint:
+            # 이전 형식의 체크포인트 (마지막 완료 페이지까지 모두 완료한 것으로 봄)
+            self.done_pages.update(range(1, last_page + 1))
+
+    def _load_checkpoint(self):
+        """체크포인트 로드"""
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"체크포인트 로드 오류: {e}")
+            return {}
+
+    def _save_checkpoint(self):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _reset(self):
+        """기존 출력 및 체크포인트 삭제"""
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def pending_pages(self, start_page, end_page):
+        """체크포인트를 반영한 크롤링할 페이지 목록 (완료한 페이지 제외)"""
+        return [page for page in range(start_page, end_page + 1) if page not in self.done_pages]
+
+    def write(self, record):
+        """보고서 한 건 기록"""
+        link = record.get('link')
+        if self.dedupe and isinstance(link, str) and link:
+            if link in self.seen_links:
+                return False
+            self.seen_links.add(link)
+
+        if self.columns is None:
+            self.columns = list(record.keys())
+
+        self.buffer.append(record)
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+        return True
+
+    def write_many(self, records):
+        """여러 보고서 기록"""
+        for record in records:
+            self.write(record)
+
+    def mark_page_done(self, page):
+        """페이지 완료 처리 - 버퍼를 비우고 체크포인트 갱신"""
+        self.flush()
+        self.done_pages.add(page)
+        self.checkpoint['done_pages'] = sorted(self.done_pages)
+        self.checkpoint['written'] = self.written
+        self._save_checkpoint()
+
+    def flush(self):
+        """버퍼 내용을 파일에 추가"""
+        if not self.buffer:
+            return
+        self._write_rows(self.buffer)
+        self.written += len(self.buffer)
+        logging.info(f"{len(self.buffer)}개 항목을 {self.path}에 추가했습니다 (누적 {self.written}개)")
+        self.buffer = []
+
+    def close(self):
+        """남은 버퍼 기록"""
+        self.flush()
+        if self.written == 0:
+            self._write_empty()
+
+    def _existing_links(self):
+        """이미 저장된 보고서 링크 목록"""
+        raise NotImplementedError
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def _write_empty(self):
+        """저장된 항목이 없을 때의 처리 (기본: 아무것도 하지 않음)"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class CSVSink(ReportSink):
+    """CSV 파일에 행을 추가하는 저장소"""
+
+    def _existing_links(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return set()
+        try:
+            existing = pd.read_csv(self.path, encoding='utf-8-sig')
+        except Exception as e:
+            logging.error(f"기존 CSV 로드 오류: {e}")
+            return set()
+        self.columns = list(existing.columns)
+        if 'link' not in existing.columns:
+            return set()
+        return set(existing['link'].dropna().astype(str))
+
+    def _write_rows(self, rows):
+        frame = pd.DataFrame(rows).reindex(columns=self.columns)
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        # BOM은 파일 처음에만 기록
+        frame.to_csv(self.path, mode='w' if is_new else 'a', header=is_new, index=False,
+                     encoding='utf-8-sig' if is_new else 'utf-8')
+
+    def _write_empty(self):
+        # 최소한의 헤더만 있는 파일 생성
+        if not os.path.exists(self.path):
+            pd.DataFrame(columns=self.columns or REPORT_COLUMNS).to_csv(
+                self.path, index=False, encoding='utf-8-sig')
+
+
+class ParquetSink(ReportSink):
+    """flush 단위로 part 파일을 추가하는 Parquet 데이터셋 저장소
+
+    path는 디렉토리이며 pd.read_parquet(path)로 전체를 읽을 수 있다.
+    """
+
+    def _part_files(self):
+        return sorted(glob.glob(os.path.join(self.path, 'part-*.parquet')))
+
+    def _existing_links(self):
+        links = set()
+        for part in self._part_files():
+            try:
+                links.update(pd.read_parquet(part, columns=['link'])['link'].dropna().astype(str))
+            except Exception as e:
+                logging.error(f"기존 Parquet 로드 오류: {part}: {e}")
+        return links
+
+    def _write_rows(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.path, exist_ok=True)
+        part_path = os.path.join(self.path, f"part-{len(self._part_files()):05d}.parquet")
+        # part 파일마다 스키마가 달라지지 않도록 모든 칼럼을 문자열로 고정
+        schema = pa.schema([(col, pa.string()) for col in self.columns])
+        data = {col: [_to_text(row.get(col)) for row in rows] for col in self.columns}
+        pq.write_table(pa.table(data, schema=schema), part_path)
+
+
+def _to_text(value):
+    """Parquet 문자열 칼럼에 넣을 값으로 변환"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return ', '.join(map(str, value))
+    return str(value)
+
+
+def open_sink(path, **kwargs):
+    """파일 경로 확장자에 맞는 저장소 생성"""
+    if path.endswith('.parquet'):
+        return ParquetSink(path, **kwargs)
+    return CSVSink(path, **kwargs)
@@ -1,15 +1,16 @@
 import pandas as pd
 from src.search.search_engine import SearchEngine
+from src.storage.artifact_store import METADATA_COLUMNS, load_artifact
 
 print("=== 검색 엔진 테스트 ===")
 
 # 검색 엔진 초기화
 search_engine = SearchEngine()
 
-# CSV 파일 로드
+# 분석 결과 로드 (parquet/csv 중 최신 파일)
 try:
-    data = pd.read_csv('data/all_reports_analyzed.csv')
-    print(f"CSV 파일 로드 성공: {len(data)}개 항목")
+    data = load_artifact('data/all_reports_analyzed', columns=METADATA_COLUMNS + ['text'])
+    print(f"데이터 로드 성공: {len(data)}개 항목")
 
     # 데이터 미리보기
     print("\n=== 데이터 미리보기 ===")
@@ -33,3 +34,20 @@ except Exception as e:
     print(f"오류 발생: {e}")
     import traceback
     traceback.print_exc()
+
+# 패싯 테스트 (분석 단계가 저장하는 "키워드1, 키워드2" 형식의 keywords 칼럼)
+print("\n=== 패싯 테스트 ===")
+facet_engine = SearchEngine()
+facet_engine.index_documents(pd.DataFrame({
+    'title': ["금리 전망", "물가 분석", "부동산 정책"],
+    'link': ["http://example.com/1", "http://example.com/2", "http://example.com/3"],
+    'source': ["KDI", "BOK", "KDI"],
+    'keywords': [', '.join(["금리", "물가"]), ', '.join(["물가", "인플레이션"]), "부동산#주택가격"],
+    'text': ["금리와 물가 전망", "물가 상승과 인플레이션", "부동산 정책과 주택가격"],
+}), text_column='text')
+keyword_counts = dict(facet_engine.facet_counts()['keywords'])
+print(f"키워드 패싯 값: {keyword_counts}")
+assert keyword_counts == {'물가': 2, '금리': 1, '인플레이션': 1, '부동산': 1, '주택가격': 1}, keyword_counts
+assert len(facet_engine.search("물가", facets={'keywords': ['물가']})) == 2
+assert facet_engine.facet_counts("물가")['keywords'][0] == ('물가', 2)
+print("패싯 테스트 통과")
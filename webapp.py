@@ -1,100 +1,266 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Blueprint, Response, abort, current_app, render_template, request, jsonify
 import pandas as pd
 import os
+import json
+import time
+import random
+import logging
+import argparse
 from src.search.search_engine import SearchEngine
+from src.search.facet_index import FACET_COLUMNS
+from src.storage.artifact_store import METADATA_COLUMNS, load_artifact
+from src.pipeline.instrumentation import METRICS
 
-app = Flask(__name__)
-
-# 검색 엔진 초기화
-search_engine = SearchEngine()
-
-# 검색 엔진 초기화 및 데이터 직접 로드
-print("\n=== 검색 엔진 초기화 ===")
-try:
-    # CSV 파일에서 직접 데이터 로드
-    data = pd.read_csv('data/all_reports_analyzed.csv')
-    print(f"CSV 파일 로드 성공: {len(data)}개 항목")
-    
-    # 인덱스 직접 생성
-    search_engine.index_documents(data, text_column='text', title_column='title')
-    print("검색 인덱스 생성 완료")
-    
-except Exception as e:
-    print(f"데이터 로드 오류: {e}")
-    print("기본 데이터 생성 중...")
-    
-    # 기본 테스트 데이터 직접 생성
-    test_data = {
-        'title': ["경제성장 전망", "물가상승 분석", "부동산 정책 효과"],
-        'author': ["KDI 경제연구부", "한국은행 조사부", "KDI 부동산연구팀"],
-        'date': ["2023-01-01", "2022-06-15", "2021-12-10"],
-        'link': ["http://example.com", "http://example.com/bok", "http://example.com/property"],
-        'abstract': ["한국 경제성장률 전망 보고서", "인플레이션 영향 분석", "부동산 정책 효과 분석"],
-        'keywords': ["경제성장#전망#GDP", "물가#인플레이션#통화정책", "부동산#정책#주택가격"],
-        'pdf_link': ["http://example.com/test.pdf", "http://example.com/bok.pdf", "http://example.com/property.pdf"],
-        'source': ["KDI", "BOK", "KDI"],
-        'text': [
-            "경제성장 전망 보고서 내용입니다. 한국 경제는 올해 3% 성장할 것으로 예상됩니다.",
-            "물가 상승의 원인과 대응책에 관한 연구. 통화정책 조정이 필요합니다.",
-            "부동산 정책의 시장 안정화 효과에 대한 분석. 주택 가격 변동성 연구."
-        ]
-    }
-    # 데이터프레임 생성 및 인덱싱
-    test_df = pd.DataFrame(test_data)
-    search_engine.index_documents(test_df, text_column='text', title_column='title')
-    print("기본 데이터로 검색 엔진 초기화 완료")
-
-@app.route('/search', methods=['GET', 'POST'])
+logger = logging.getLogger('webapp')
+
+bp = Blueprint('search', __name__)
+
+# 기본 설정 (환경 변수 FLASK_<이름>으로 덮어쓸 수 있음, 예: FLASK_SEARCH_LOG_SAMPLE_RATE=0.1)
+DEFAULT_CONFIG = {
+    'SEARCH_INDEX_PATH': 'index/search_index.pkl',      # main.py --build_index로 저장한 인덱스
+    'SEARCH_DATA_PATH': 'data/all_reports_analyzed',    # 인덱스가 없을 때 직접 인덱싱할 데이터
+    'SEARCH_LOG_SAMPLE_RATE': 0.01,                     # 요청 로그를 남길 비율 (0~1)
+    'SEARCH_METRICS_ENDPOINT': False,                   # /metrics (Prometheus 텍스트 형식) 노출 여부
+}
+
+# 검색 API (JSON, 여러 쿼리 일괄 검색 + 페이지 단위)
+API_MAX_PER_PAGE = 100
+API_MAX_QUERIES = 500
+
+# 데이터 파일이 없을 때 사용하는 기본 테스트 데이터
+SAMPLE_DATA = {
+    'title': ["경제성장 전망", "물가상승 분석", "부동산 정책 효과"],
+    'author': ["KDI 경제연구부", "한국은행 조사부", "KDI 부동산연구팀"],
+    'date': ["2023-01-01", "2022-06-15", "2021-12-10"],
+    'link': ["http://example.com", "http://example.com/bok", "http://example.com/property"],
+    'abstract': ["한국 경제성장률 전망 보고서", "인플레이션 영향 분석", "부동산 정책 효과 분석"],
+    'keywords': ["경제성장#전망#GDP", "물가#인플레이션#통화정책", "부동산#정책#주택가격"],
+    'pdf_link': ["http://example.com/test.pdf", "http://example.com/bok.pdf", "http://example.com/property.pdf"],
+    'source': ["KDI", "BOK", "KDI"],
+    'text': [
+        "경제성장 전망 보고서 내용입니다. 한국 경제는 올해 3% 성장할 것으로 예상됩니다.",
+        "물가 상승의 원인과 대응책에 관한 연구. 통화정책 조정이 필요합니다.",
+        "부동산 정책의 시장 안정화 효과에 대한 분석. 주택 가격 변동성 연구."
+    ]
+}
+
+
+def load_search_engine(index_path=None, data_path=None):
+    """검색 엔진 준비 (저장된 인덱스 → 분석 데이터 인덱싱 → 기본 테스트 데이터 순서로 시도)"""
+    if index_path and os.path.exists(index_path):
+        search_engine = SearchEngine(index_path)
+        if search_engine.index is not None and search_engine.documents is not None:
+            if search_engine.related_index is None:
+                search_engine.build_related()
+            logger.info("Search index loaded from %s (%d documents)", index_path, search_engine.index.num_live)
+            return search_engine
+
+    search_engine = SearchEngine()
+    try:
+        # 분석 결과에서 필요한 칼럼만 로드
+        data = load_artifact(data_path, columns=METADATA_COLUMNS + ['main_topic', 'text'])
+        search_engine.index_documents(data, text_column='text', title_column='title')
+        logger.info("Search index built from %s (%d documents)", data_path, len(data))
+    except Exception as e:
+        logger.warning("Data load failed (%s), using sample data", e)
+        search_engine.index_documents(pd.DataFrame(SAMPLE_DATA), text_column='text', title_column='title')
+    search_engine.build_related()
+    return search_engine
+
+
+def create_app(config=None, search_engine=None):
+    """앱 팩토리
+
+    멀티 워커 서버에서는 마스터 프로세스에서 앱(과 인덱스)을 한 번 만들고 워커가 공유하도록
+    preload 옵션과 함께 사용한다: gunicorn -w 4 --preload "webapp:create_app()"
+    """
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.from_prefixed_env()
+    if config:
+        app.config.update(config)
+
+    if search_engine is None:
+        search_engine = load_search_engine(app.config['SEARCH_INDEX_PATH'], app.config['SEARCH_DATA_PATH'])
+    app.extensions['search_engine'] = search_engine
+
+    app.register_blueprint(bp)
+    return app
+
+
+def get_engine():
+    return current_app.extensions['search_engine']
+
+
+def log_sampled(event, **fields):
+    """요청 로그를 설정된 비율로만 남김 (JSON 한 줄)"""
+    rate = float(current_app.config['SEARCH_LOG_SAMPLE_RATE'])
+    if rate > 0 and random.random() < rate:
+        logger.info(json.dumps({'event': event, 'sample_rate': rate, **fields}, ensure_ascii=False, default=str))
+
+
+def request_facets(values):
+    """요청 값에서 패싯 필터 추출 (키워드는 쉼표 구분 또는 반복 파라미터)"""
+    facets = {}
+    for name in FACET_COLUMNS:
+        selected = values.getlist(name) if hasattr(values, 'getlist') else values.get(name)
+        if isinstance(selected, str):
+            selected = [selected]
+        selected = [part.strip() for value in (selected or []) for part in str(value).split(',')]
+        facets[name] = [value for value in selected if value]
+    return facets
+
+@bp.route('/search', methods=['GET', 'POST'])
 def search():
+    search_engine = get_engine()
     if request.method == 'POST':
+        start = time.perf_counter()
         query = request.form.get('query', '')
-        print(f"\n=== 검색 시도 ===")
-        print(f"검색어: '{query}'")
-        
-        top_n = int(request.form.get('top_n', 10))
-        print(f"결과 수 제한: {top_n}")
-        
+        try:
+            top_n = min(max(int(request.form.get('top_n', 10)), 1), API_MAX_PER_PAGE)
+        except ValueError:
+            abort(400)
         start_date = request.form.get('start_date')
         end_date = request.form.get('end_date')
-        print(f"날짜 범위: {start_date or '전체'} ~ {end_date or '현재'}")
-        
-        # 검색 수행
+
+        # 검색 수행 (날짜 필터 포함 결과를 캐시)
         try:
-            results = search_engine.search(query, top_n)
-            print(f"검색 결과: {len(results)}개")
-            if len(results) > 0:
-                print(f"첫 번째 결과: {results[0]['title']}")
-            
-            # 날짜 필터링
-            if start_date or end_date:
-                filtered_results = search_engine.filter_by_date(results, start_date, end_date)
-                print(f"필터링 후 결과: {len(filtered_results)}개")
-                results = filtered_results
-            
-            return render_template('results.html', results=results, query=query)
-        except Exception as e:
-            print(f"검색 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            ranking = request.form.get('ranking') or None
+            facets = request_facets(request.form)
+            results = search_engine.search(query, top_n, start_date=start_date, end_date=end_date, ranking=ranking,
+                                           facets=facets)
+            facet_counts = search_engine.facet_counts(query, facets=facets, ranking=ranking, top=10)
+            log_sampled('search', query=query, top_n=top_n, ranking=ranking, results=len(results),
+                        elapsed_ms=round((time.perf_counter() - start) * 1000, 3))
+            return render_template('results.html', results=results, query=query, facet_counts=facet_counts)
+        except Exception:
+            logger.exception("Search failed for query %r", query)
             return render_template('results.html', results=[], query=query)
-    
-    return render_template('search.html')
 
-# 데이터 로드
-@app.route('/load_data', methods=['POST'])
+    facet_options = {name: search_engine.facet_values(name, top=100) for name in FACET_COLUMNS}
+    return render_template('search.html', facet_options=facet_options)
+
+# 데이터 로드 (요청을 받은 워커의 엔진만 바뀜)
+@bp.route('/load_data', methods=['POST'])
 def load_data():
     data_path = request.form.get('data_path')
-    
-    if os.path.exists(data_path):
-        search_engine.load_data(data_path)
+
+    if data_path and os.path.exists(data_path):
+        get_engine().load_data(data_path)
         return jsonify({'status': 'success', 'message': f'Data loaded from {data_path}'})
     else:
         return jsonify({'status': 'error', 'message': 'File not found'})
 
+@bp.route('/api/search', methods=['GET', 'POST'])
+def api_search():
+    """GET: ?q=...&q=...&page=1&per_page=10 / POST: {"queries": [...], "page": 1, "per_page": 10, ...}"""
+    start = time.perf_counter()
+    params = request.get_json(silent=True) if request.method == 'POST' else None
+    if isinstance(params, list):
+        params = {'queries': params}
+    params = params or {}
+    args = request.args
+
+    queries = params.get('queries') or params.get('q') or args.getlist('q')
+    if isinstance(queries, str):
+        queries = [queries]
+    queries = [str(query) for query in queries if str(query).strip()]
+    if not queries:
+        return jsonify({'status': 'error', 'message': 'No query given'}), 400
+    if len(queries) > API_MAX_QUERIES:
+        return jsonify({'status': 'error', 'message': f'Too many queries (max {API_MAX_QUERIES})'}), 400
+
+    try:
+        page = max(int(params.get('page', args.get('page', 1))), 1)
+        per_page = min(max(int(params.get('per_page', args.get('per_page', 10))), 1), API_MAX_PER_PAGE)
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'page and per_page must be integers'}), 400
+
+    facets = params.get('facets') or request_facets(args)
+    if not isinstance(facets, dict):
+        return jsonify({'status': 'error', 'message': 'facets must be an object, e.g. {"source": ["KDI"]}'}), 400
+
+    fields = params.get('fields') or args.get('fields')
+    if isinstance(fields, str):
+        fields = [field for field in fields.split(',') if field]
+
+    try:
+        batch = get_engine().search_batch(
+            queries, top_n=per_page, offset=(page - 1) * per_page,
+            start_date=params.get('start_date') or args.get('start_date'),
+            end_date=params.get('end_date') or args.get('end_date'),
+            ranking=params.get('ranking') or args.get('ranking'),
+            columns=fields or METADATA_COLUMNS + ['main_topic'], facets=facets,
+            facet_counts=str(params.get('facet_counts', args.get('facet_counts', ''))).lower() in ('1', 'true'))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    log_sampled('api_search', queries=len(queries), page=page, per_page=per_page,
+                elapsed_ms=round((time.perf_counter() - start) * 1000, 3))
+    return jsonify({'status': 'success', 'page': page, 'per_page': per_page, 'results': batch})
+
+# 관련 보고서 (인덱스 구축 시 미리 계산된 이웃 표 조회)
+@bp.route('/related')
+def related():
+    link = request.args.get('link', '')
+    try:
+        top_n = min(max(int(request.args.get('top_n', 5)), 1), API_MAX_PER_PAGE)
+    except ValueError:
+        abort(400)
+    results = get_engine().related_documents(link, top_n)
+    title = request.args.get('title') or link
+    return render_template('results.html', results=results, query=title,
+                           heading=f'"{title}" 관련 보고서 ({len(results)}건)')
+
+@bp.route('/api/related')
+def api_related():
+    link = request.args.get('link')
+    if not link:
+        return jsonify({'status': 'error', 'message': 'No link given'}), 400
+    try:
+        top_n = min(max(int(request.args.get('top_n', 5)), 1), API_MAX_PER_PAGE)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'top_n must be an integer'}), 400
+    results = get_engine().related_documents(link, top_n, columns=METADATA_COLUMNS)
+    return jsonify({'status': 'success', 'link': link, 'results': results})
+
+# 검색 캐시 지표
+@bp.route('/cache_stats')
+def cache_stats():
+    return jsonify(get_engine().cache_stats())
+
+# 구간별 소요 시간 지표 (Prometheus 텍스트 형식, 워커 프로세스별 집계)
+@bp.route('/metrics')
+def metrics():
+    if not current_app.config['SEARCH_METRICS_ENDPOINT']:
+        abort(404)
+    return Response(METRICS.prometheus_text(), mimetype='text/plain; version=0.0.4')
+
 # 메인 페이지
-@app.route('/')
+@bp.route('/')
 def index():
     return render_template('index.html')
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='국책연구기관 자료 검색 웹 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--production', action='store_true',
+                        help='디버그 모드 없이 실행 (실제 서비스는 gunicorn 등 WSGI 서버 사용 권장)')
+    parser.add_argument('--index_path', default=DEFAULT_CONFIG['SEARCH_INDEX_PATH'])
+    parser.add_argument('--log_sample_rate', type=float, default=None, help='요청 로그 샘플링 비율 (0~1)')
+    parser.add_argument('--metrics', action='store_true', help='/metrics 엔드포인트 활성화')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = {'SEARCH_INDEX_PATH': args.index_path}
+    if args.metrics:
+        config['SEARCH_METRICS_ENDPOINT'] = True
+    if args.log_sample_rate is not None:
+        config['SEARCH_LOG_SAMPLE_RATE'] = args.log_sample_rate
+    elif not args.production:
+        # 개발 모드에서는 모든 요청을 기록
+        config['SEARCH_LOG_SAMPLE_RATE'] = 1.0
+
+    app = create_app(config)
+    app.run(host=args.host, port=args.port, debug=not args.production)